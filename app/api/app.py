@@ -2,28 +2,73 @@ from fastapi import FastAPI
 from contextlib import asynccontextmanager
 from loguru import logger
 
-from app.core.database import init_db, close_db
+from app.core.database import init_db, warm_up_db, close_db, connection_names
 from app.api.middleware.idempotency import IdempotencyMiddleware
 from app.api.middleware.request_context import RequestContextMiddleware
-from app.core.observability import setup_logging, setup_tracing
+from app.api.middleware.rate_limit import RateLimitMiddleware
+from app.api.middleware.probe_fast_path import install_probe_fast_path
+from app.core.observability import setup_logging, setup_tracing, shutdown_tracing
+from app.infrastructure.metrics import cleanup_dead_workers, mark_worker_dead, instrument_connection
+from app.infrastructure.diagnostics import loop_monitor
+from app.infrastructure.health import health_checker
+from app.di import container
+from app.core.config import settings
+from tortoise import Tortoise
 
 from . import health_check_endpoint
 from . import metrics_endpoint
 from . import ready_check_endpoint
 from . import signup_endpoint
 from . import get_user_endpoint
+from . import get_signup_stats_endpoint
+from . import debug_profile_endpoint
+from . import debug_memory_endpoint
+from . import debug_read_model_endpoint
+from .warmup import warm_up_request_path
 
 
 # handles init and close db
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("Starting application...")
+    dead_workers = cleanup_dead_workers()
+    if dead_workers:
+        logger.info(f"Cleaned up metrics of dead workers: {dead_workers}")
     await init_db()
+    await warm_up_db()
     logger.info("Database initialized")
+    if settings.enable_db_instrumentation:
+        for name in connection_names():
+            instrument_connection(Tortoise.get_connection(name))
+    if settings.enable_loop_monitor:
+        await loop_monitor.start()
+    # the warm-up runs in the background; /ready reports not ready until it's done
+    await health_checker.start(
+        warm_up=warm_up_request_path if settings.startup_warm_up else None
+    )
+    # lookups go to the database until the first build is done
+    if settings.enable_user_id_filter:
+        container.user_id_filter.start()
+    if settings.enable_email_filter:
+        container.email_filter.start()
+    if settings.read_model_drift_check_interval_seconds > 0:
+        container.read_model_drift_checker.start(
+            settings.read_model_drift_check_interval_seconds,
+            repair=settings.read_model_drift_repair,
+        )
     yield
     logger.info("Shutting down application...")
+    await health_checker.stop()
+    await loop_monitor.stop()
+    await container.read_model_drift_checker.stop()
+    await container.user_id_filter.stop()
+    await container.email_filter.stop()
+    # an interrupted rebuild resumes from its checkpoint
+    await container.read_model_rebuilder.cancel()
     await close_db()
     logger.info("Database connections closed")
+    shutdown_tracing()
+    mark_worker_dead()
 
 
 
@@ -39,13 +84,22 @@ def create_app():
     # endpoints
     app.include_router(router=signup_endpoint.router)
     app.include_router(router=get_user_endpoint.router)
+    app.include_router(router=get_signup_stats_endpoint.router)
     app.include_router(router=health_check_endpoint.router)
     app.include_router(router=ready_check_endpoint.router)
     app.include_router(router=metrics_endpoint.router)
+    app.include_router(router=debug_profile_endpoint.router)
+    app.include_router(router=debug_memory_endpoint.router)
+    app.include_router(router=debug_read_model_endpoint.router)
     # middlewares
+    if settings.enable_rate_limit:
+        app.add_middleware(RateLimitMiddleware)
     app.add_middleware(IdempotencyMiddleware)
     app.add_middleware(RequestContextMiddleware)
 
     setup_tracing(app)
+    # outermost: probes bypass the middlewares above and the tracing
+    if settings.enable_probe_fast_path:
+        install_probe_fast_path(app)
     
     return app
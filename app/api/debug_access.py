@@ -0,0 +1,17 @@
+import hmac
+from fastapi import Header, HTTPException, status
+from app.core.config import settings
+
+
+async def verify_debug_token(x_debug_token: str | None = Header(default=None)):
+    """
+    Protect /debug endpoints.
+    
+    Disabled (404) unless DEBUG_TOKEN is configured; requests must send it
+    in the `X-Debug-Token` header.
+    """
+    if not settings.debug_token:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    
+    if not x_debug_token or not hmac.compare_digest(x_debug_token, settings.debug_token):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid debug token")
@@ -0,0 +1,60 @@
+import asyncio
+from typing import Literal
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from app.api.debug_access import verify_debug_token
+from app.infrastructure.diagnostics import MemoryProfilerError, memory_profiler
+
+router = APIRouter(
+    prefix="/debug/memory", tags=["debug"], dependencies=[Depends(verify_debug_token)]
+)
+
+GroupBy = Literal["lineno", "filename", "traceback", "module"]
+
+
+@router.get("")
+async def memory_status():
+    """Tracing state, traced/peak memory and the stored snapshots."""
+    return memory_profiler.status()
+
+
+@router.post("/start")
+async def start_tracing(frames: int = Query(1, ge=1, le=50)):
+    """
+    Start tracemalloc.
+    
+    Tracing slows down allocations; keep `frames` low and stop it when done.
+    """
+    return memory_profiler.start(frames)
+
+
+@router.post("/stop")
+async def stop_tracing():
+    """Stop tracemalloc and drop the stored snapshots."""
+    return memory_profiler.stop()
+
+
+@router.post("/snapshots")
+async def take_snapshot(limit: int = Query(20, ge=1, le=500), group_by: GroupBy = "lineno"):
+    """Take and store a snapshot, return its top allocation sites and export the gauges."""
+    try:
+        return await asyncio.to_thread(memory_profiler.take_snapshot, limit, group_by)
+    except MemoryProfilerError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+
+@router.get("/top")
+async def top_allocations(limit: int = Query(20, ge=1, le=500), group_by: GroupBy = "lineno"):
+    """Top allocation sites right now, without storing a snapshot."""
+    try:
+        return await asyncio.to_thread(memory_profiler.top, None, limit, group_by)
+    except MemoryProfilerError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+
+@router.get("/diff")
+async def diff_snapshots(base: int, target: int, limit: int = Query(20, ge=1, le=500)):
+    """Allocation growth between two stored snapshots, grouped by module."""
+    try:
+        return await asyncio.to_thread(memory_profiler.diff, base, target, limit)
+    except KeyError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=e.args[0])
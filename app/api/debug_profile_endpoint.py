@@ -0,0 +1,46 @@
+import asyncio
+from typing import Literal
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import JSONResponse, PlainTextResponse
+from app.api.debug_access import verify_debug_token
+from app.infrastructure.diagnostics import (
+    ProfilerBusyError,
+    profiler,
+    to_collapsed,
+    to_speedscope,
+)
+
+router = APIRouter(prefix="/debug", tags=["debug"], dependencies=[Depends(verify_debug_token)])
+
+
+@router.get("/profile")
+async def profile(
+    seconds: float = Query(10.0, gt=0, description="Profile duration (capped by PROFILER_MAX_SECONDS)"),
+    hz: int = Query(100, gt=0, description="Samples per second (capped by PROFILER_MAX_HZ)"),
+    format: Literal["collapsed", "speedscope"] = "collapsed",
+    tasks: bool = Query(True, description="Also sample suspended asyncio task stacks"),
+):
+    """
+    Sample the stacks of this process for `seconds` and return a flame graph profile.
+    
+    - `collapsed`: one `frame;frame;frame count` line per stack (flamegraph.pl, speedscope)
+    - `speedscope`: speedscope JSON, open it at https://www.speedscope.app
+    
+    Sampling runs in a worker thread, only one profile runs at a time and the
+    profiler's own overhead is reported in the `X-Profiler-Overhead-Percent` header.
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        result = await asyncio.to_thread(profiler.run, seconds, hz, loop if tasks else None)
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    
+    headers = {
+        "X-Profiler-Samples": str(result["samples"]),
+        "X-Profiler-Effective-Hz": f"{result['effective_hz']:.1f}",
+        "X-Profiler-Overhead-Percent": f"{result['overhead_percent']:.2f}",
+    }
+    
+    if format == "speedscope":
+        return JSONResponse(content=to_speedscope(result), headers=headers)
+    return PlainTextResponse(content=to_collapsed(result), headers=headers)
@@ -0,0 +1,70 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from app.api.debug_access import verify_debug_token
+from app.core.config import settings
+from app.di import container
+from app.infrastructure.read_model import RebuildAlreadyRunningError
+
+router = APIRouter(
+    prefix="/debug/read-model", tags=["debug"], dependencies=[Depends(verify_debug_token)]
+)
+
+
+@router.get("/rebuild")
+async def rebuild_status():
+    """State, rows and rows/sec of the current (or last) read model rebuild."""
+    return container.read_model_rebuilder.status()
+
+
+@router.post("/rebuild", status_code=status.HTTP_202_ACCEPTED)
+async def start_rebuild(
+    chunk_size: int = Query(settings.read_model_rebuild_chunk_size, ge=1, le=50_000),
+    workers: int = Query(settings.read_model_rebuild_workers, ge=1, le=64),
+    max_rows_per_second: float | None = Query(settings.read_model_rebuild_max_rows_per_second, gt=0),
+    reset: bool = Query(False, description="Ignore the checkpoint and start over"),
+):
+    """
+    Rebuild users_read_model from users in the background.
+    
+    Resumes from the checkpoint of an interrupted rebuild unless `reset`
+    is set. Poll GET /debug/read-model/rebuild for progress.
+    """
+    try:
+        return await container.read_model_rebuilder.start(
+            chunk_size=chunk_size,
+            workers=workers,
+            max_rows_per_second=max_rows_per_second,
+            reset=reset,
+        )
+    except RebuildAlreadyRunningError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+
+@router.delete("/rebuild")
+async def cancel_rebuild():
+    """Cancel the running rebuild; the next one resumes from its checkpoint."""
+    return await container.read_model_rebuilder.cancel()
+
+
+@router.post("/drift")
+async def check_drift(repair: bool = Query(settings.read_model_drift_repair)):
+    """
+    Compare users and users_read_model and repair the differing rows.
+    
+    Also updates the `read_model_divergent_rows` gauge.
+    """
+    return await container.read_model_drift_checker.check(repair=repair)
+
+
+@router.get("/lookup-filters")
+async def lookup_filters_status():
+    """Size, fill and staleness of this worker's user id and email filters."""
+    return {
+        "user_id": container.user_id_filter.status(),
+        "email": container.email_filter.status(),
+    }
+
+
+@router.get("/drift")
+async def last_drift_report():
+    """Report of the last drift check (null if none ran yet)."""
+    return container.read_model_drift_checker.last_report
@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta, timezone
+from typing import Literal
+from fastapi import APIRouter, HTTPException, Query, status, Depends
+from app.schemas.stats import SignupStatsResponse
+from app.di import providers
+from app.bp import GetSignupStatsUseCase
+from app.bp.get_signup_stats_usecase import BUCKET_SIZES
+from app.api.routing import StageTimingRoute
+
+
+router = APIRouter(prefix="/stats", tags=["stats"], route_class=StageTimingRoute)
+
+DEFAULT_RANGES = {
+    "hour": timedelta(hours=48),
+    "day": timedelta(days=30),
+}
+MAX_BUCKETS = 1000
+
+
+def as_utc(moment: datetime | None) -> datetime | None:
+    """Naive datetimes in the query are taken as UTC."""
+    if moment is not None and moment.tzinfo is None:
+        return moment.replace(tzinfo=timezone.utc)
+    return moment
+
+
+@router.get(
+    "/signups",
+    response_model=SignupStatsResponse,
+)
+async def get_signup_stats(
+    granularity: Literal["hour", "day"] = "day",
+    start: datetime | None = Query(None, description="Inclusive, defaults to 48 hours / 30 days before end"),
+    end: datetime | None = Query(None, description="Exclusive, defaults to the end of the current hour / day"),
+    get_signup_stats_use_case_module: GetSignupStatsUseCase = Depends(
+        providers.get_get_signup_stats_use_case_module
+    )):
+    """
+    Signups per hour or day (UTC) and the total user count.
+    
+    Served from counters updated on every signup, never from COUNT(*) over users.
+    """
+    start, end = as_utc(start), as_utc(end)
+    end = end or datetime.now(timezone.utc) + BUCKET_SIZES[granularity]
+    start = start or end - DEFAULT_RANGES[granularity]
+    if start >= end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start must be before end",
+        )
+    if (end - start) / BUCKET_SIZES[granularity] > MAX_BUCKETS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Range too large: at most {MAX_BUCKETS} {granularity} buckets",
+        )
+    
+    return await get_signup_stats_use_case_module.run(granularity, start, end)
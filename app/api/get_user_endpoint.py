@@ -4,9 +4,10 @@ from app.di import providers
 from loguru import logger
 from uuid import UUID
 from app.bp import GetUserUseCase
+from app.api.routing import StageTimingRoute
 
 
-router = APIRouter(prefix="", tags=["users"])
+router = APIRouter(prefix="", tags=["users"], route_class=StageTimingRoute)
 
 
 @router.get(
@@ -1,14 +1,18 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 from app.infrastructure.metrics import get_metrics_data
 
 router = APIRouter(prefix="", tags=["observability"])
 
 
 @router.get("/metrics")
-async def metrics():
+async def metrics(request: Request):
     """
     Expose Prometheus metrics.
     
-    Returns metrics in Prometheus text format for scraping.
+    Returns metrics in Prometheus text format for scraping, or OpenMetrics
+    (with trace exemplars) when requested. Honours Accept-Encoding: gzip.
     """
-    return get_metrics_data()
\ No newline at end of file
+    return get_metrics_data(
+        accept=request.headers.get("accept"),
+        accept_encoding=request.headers.get("accept-encoding"),
+    )
\ No newline at end of file
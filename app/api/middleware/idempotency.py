@@ -4,7 +4,7 @@ from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
 from loguru import logger
 from app.bp.domain import IdempotencyKey
-from app.infrastructure.metrics import idempotency_hits_total
+from app.infrastructure.metrics import idempotency_hits_total, track_stage
 from datetime import datetime, timezone
 
 
@@ -30,7 +30,8 @@ class IdempotencyMiddleware(BaseHTTPMiddleware):
         
         request._receive = receive
         
-        existing = await IdempotencyKey.get_or_none(key=idempotency_key)
+        with track_stage("idempotency_lookup"):
+            existing = await IdempotencyKey.get_or_none(key=idempotency_key)
         
         if existing:
             # check expiration
@@ -83,14 +84,15 @@ class IdempotencyMiddleware(BaseHTTPMiddleware):
             try:
                 response_data = json.loads(response_body)
                 
-                await IdempotencyKey.create_with_expiration(
-                    key=idempotency_key,
-                    endpoint=request.url.path,
-                    request_hash=request_hash,
-                    response_status=response.status_code,
-                    response_body=response_data,
-                    ttl_hours=24,
-                )
+                with track_stage("idempotency_store"):
+                    await IdempotencyKey.create_with_expiration(
+                        key=idempotency_key,
+                        endpoint=request.url.path,
+                        request_hash=request_hash,
+                        response_status=response.status_code,
+                        response_body=response_data,
+                        ttl_hours=24,
+                    )
                 
                 logger.info(f"Stored idempotency key: {idempotency_key}")
                 
@@ -0,0 +1,80 @@
+import time
+from typing import Iterable
+
+from fastapi import FastAPI
+from fastapi.middleware.asyncexitstack import AsyncExitStackMiddleware
+from fastapi.routing import APIRoute
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.infrastructure.metrics import probe_requests_total, probe_request_duration_seconds
+
+
+PROBE_PATHS = ("/health", "/ready", "/metrics")
+
+
+class ProbeFastPathMiddleware:
+    """
+    ASGI dispatcher in front of the whole middleware stack.
+    
+    GET requests to the probe paths go straight to their route handlers,
+    skipping the request context and idempotency middlewares, tracing and
+    error handling, so probes neither log, create spans nor add HTTP series,
+    and stay fast while the rest of the app is saturated. Everything else is
+    passed on to the regular stack.
+    """
+    
+    def __init__(
+        self,
+        app: ASGIApp,
+        routes: dict[str, ASGIApp],
+        record_metrics: bool = settings.probe_fast_path_metrics,
+    ):
+        self.app = app
+        self.routes = routes
+        self.record_metrics = record_metrics
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        route = None
+        if scope["type"] == "http" and scope["method"] == "GET":
+            route = self.routes.get(scope["path"])
+        if route is None:
+            await self.app(scope, receive, send)
+            return
+        
+        if not self.record_metrics:
+            await route(scope, receive, send)
+            return
+        
+        status = 500
+        
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+        
+        start = time.perf_counter()
+        try:
+            await route(scope, receive, send_with_status)
+        finally:
+            path = scope["path"]
+            probe_requests_total.labels(path=path, status=status).inc()
+            probe_request_duration_seconds.labels(path=path).observe(time.perf_counter() - start)
+
+
+def install_probe_fast_path(app: FastAPI, paths: Iterable[str] = PROBE_PATHS) -> None:
+    """
+    Put ProbeFastPathMiddleware in front of the app's middleware stack.
+    
+    Wraps build_middleware_stack like the OpenTelemetry instrumentation does;
+    call it after setup_tracing so the fast path is the outermost layer.
+    """
+    # route handlers expect the exit stack FastAPI normally sets up in its stack
+    routes = {
+        route.path: AsyncExitStackMiddleware(route.app)
+        for route in app.router.routes
+        if isinstance(route, APIRoute) and route.path in paths and "GET" in route.methods
+    }
+    build_middleware_stack = app.build_middleware_stack
+    app.build_middleware_stack = lambda: ProbeFastPathMiddleware(build_middleware_stack(), routes)
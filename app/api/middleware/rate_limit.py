@@ -0,0 +1,72 @@
+import json
+import math
+from fastapi import Request, Response
+from starlette.middleware.base import BaseHTTPMiddleware
+from loguru import logger
+from app.core.config import settings
+from app.infrastructure.rate_limit import RateLimiter, build_rate_limit_backend, normalize_email
+
+
+class RateLimitMiddleware(BaseHTTPMiddleware):
+    """
+    Token bucket rate limiting by client IP and normalized email.
+    
+    Runs before body validation and password hashing, so bursts are rejected
+    with a cheap 429 + Retry-After before they cost bcrypt CPU or database
+    writes. It sits inside IdempotencyMiddleware: retries replayed from the
+    idempotency store are not charged. The email is read from the raw JSON
+    body; invalid bodies are only limited by IP.
+    """
+    
+    LIMITED_ROUTES = {("POST", "/signup")}
+    
+    def __init__(self, app, limiter: RateLimiter | None = None):
+        super().__init__(app)
+        self.limiter = limiter or RateLimiter(
+            build_rate_limit_backend(
+                settings.rate_limit_backend,
+                redis_url=settings.rate_limit_redis_url,
+                shards=settings.rate_limit_shards,
+                max_keys=settings.rate_limit_max_keys,
+            ),
+            rules={
+                "ip": (settings.rate_limit_ip_per_minute / 60, settings.rate_limit_ip_burst),
+                "email": (settings.rate_limit_email_per_minute / 60, settings.rate_limit_email_burst),
+            },
+        )
+    
+    async def dispatch(self, request: Request, call_next):
+        if (request.method, request.url.path) not in self.LIMITED_ROUTES:
+            return await call_next(request)
+        
+        keys = {"ip": self.client_ip(request), "email": self.email(await request.body())}
+        retry_after = await self.limiter.check(request.url.path, keys)
+        if retry_after > 0:
+            logger.warning(f"Rate limited: {request.method} {request.url.path} ip={keys['ip']}")
+            return Response(
+                content=json.dumps({
+                    "error": "Too many requests",
+                    "detail": f"Retry after {math.ceil(retry_after)} seconds",
+                }),
+                status_code=429,
+                media_type="application/json",
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
+        
+        return await call_next(request)
+    
+    @staticmethod
+    def client_ip(request: Request) -> str | None:
+        if settings.rate_limit_trust_forwarded_for:
+            forwarded_for = request.headers.get("X-Forwarded-For")
+            if forwarded_for:
+                return forwarded_for.split(",", 1)[0].strip()
+        return request.client.host if request.client else None
+    
+    @staticmethod
+    def email(body: bytes) -> str | None:
+        try:
+            email = json.loads(body).get("email")
+        except (ValueError, AttributeError):
+            return None
+        return normalize_email(email) if isinstance(email, str) else None
@@ -3,12 +3,31 @@ import time
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
 from loguru import logger
-from app.infrastructure.metrics import http_requests_total, http_request_duration_seconds
+from app.infrastructure.metrics import (
+    http_requests_total,
+    http_request_duration_seconds,
+    begin_request_stages,
+    begin_request_queries,
+    finish_request_queries,
+)
+from app.core.config import settings
+from app.core.observability import get_current_trace_id, request_id_var
+from app.api import traffic_capture
 
 
 class RequestContextMiddleware(BaseHTTPMiddleware):
     """Middleware to handle X-Request-Id, X-Correlation-Id headers and metrics."""
     
+    @staticmethod
+    def endpoint_label(request: Request) -> str:
+        """
+        Route template for metric labels ("/users/{user_id}"), so path
+        parameters don't create a series per value. Set by the router, hence
+        only available after call_next.
+        """
+        route = request.scope.get("route")
+        return route.path_format if route is not None else "unmatched"
+    
     async def dispatch(self, request: Request, call_next):
         request_id = request.headers.get("X-Request-Id", str(uuid.uuid4()))
         correlation_id = request.headers.get("X-Correlation-Id", str(uuid.uuid4()))
@@ -16,6 +35,11 @@ class RequestContextMiddleware(BaseHTTPMiddleware):
         # Use request state to access headers from Idempotency middleware
         request.state.request_id = request_id
         request.state.correlation_id = correlation_id
+        request_id_var.set(request_id)
+        
+        # per-stage breakdown, filled in by the downstream middlewares and use cases
+        stages = begin_request_stages()
+        queries = begin_request_queries()
         
         with logger.contextualize(
             request_id=request_id,
@@ -25,27 +49,46 @@ class RequestContextMiddleware(BaseHTTPMiddleware):
         ):
             logger.info(f"Request started: {request.method} {request.url.path}")
             
+            # sampled traffic capture (TRAFFIC_CAPTURE_PATH)
+            recorder = traffic_capture.traffic_recorder
+            if recorder is not None and not recorder.should_sample():
+                recorder = None
+            body = await request.body() if recorder is not None else None
+            
             start_time = time.time()
             
             try:
                 response = await call_next(request)
                 duration = time.time() - start_time
+                endpoint = self.endpoint_label(request)
+                
+                if recorder is not None:
+                    recorder.record(request, body, start_time, response.status_code, duration, endpoint)
                 
                 response.headers["X-Request-Id"] = request_id
                 response.headers["X-Correlation-Id"] = correlation_id
                 
+                finish_request_queries(queries, endpoint=endpoint)
+                
+                if settings.debug:
+                    response.headers["Server-Timing"] = (
+                        f"{stages.server_timing(total=duration)}, "
+                        f'db;dur={queries.total_time * 1000:.2f};desc="{queries.count} queries"'
+                    )
+                
                 # metrics
                 http_requests_total.labels(
                     method=request.method,
-                    endpoint=request.url.path,
+                    endpoint=endpoint,
                     status=response.status_code,
                 ).inc()
                 
-                # metrics
+                # metrics, with the trace id as exemplar to jump from a bucket to a trace
+                trace_id = get_current_trace_id()
                 http_request_duration_seconds.labels(
                     method=request.method,
-                    endpoint=request.url.path,
-                ).observe(duration)
+                    endpoint=endpoint,
+                ).observe(duration, exemplar={"trace_id": trace_id} if trace_id else None)
                 
                 logger.info(
                     f"Request completed: {request.method} {request.url.path} "
@@ -63,7 +106,7 @@ class RequestContextMiddleware(BaseHTTPMiddleware):
                 
                 http_requests_total.labels(
                     method=request.method,
-                    endpoint=request.url.path,
+                    endpoint=self.endpoint_label(request),
                     status=500,
                 ).inc()
                 
@@ -15,6 +15,9 @@ async def ready_check():
     - System resources (CPU, memory, disk)
     - All critical dependencies
     
+    Answered from a snapshot refreshed in the background; fails when the
+    snapshot is older than HEALTH_SNAPSHOT_MAX_AGE_SECONDS.
+    
     Returns 200 if ready, 503 if not ready.
     Used by load balancers to route traffic only to ready instances.
     """
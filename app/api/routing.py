@@ -0,0 +1,46 @@
+import asyncio
+from functools import wraps
+from typing import Callable
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+from starlette.concurrency import run_in_threadpool
+
+from app.infrastructure.metrics import start_stage, stop_stage
+
+
+class StageTimingRoute(APIRoute):
+    """
+    Route that splits the handler time into request stages.
+    
+    - validation: body parsing, dependency resolution and pydantic validation
+    - serialization: response model validation and JSON rendering
+    
+    Plain `def` endpoints still run in the threadpool, as FastAPI does.
+    """
+    
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        is_coroutine = asyncio.iscoroutinefunction(endpoint)
+        
+        @wraps(endpoint)
+        async def timed_endpoint(*args, **values):
+            stop_stage("validation")
+            try:
+                if is_coroutine:
+                    return await endpoint(*args, **values)
+                return await run_in_threadpool(endpoint, *args, **values)
+            finally:
+                start_stage("serialization")
+        
+        super().__init__(path, timed_endpoint, **kwargs)
+    
+    def get_route_handler(self) -> Callable:
+        route_handler = super().get_route_handler()
+        
+        async def timed_route_handler(request: Request) -> Response:
+            start_stage("validation")
+            response = await route_handler(request)
+            stop_stage("serialization")
+            return response
+        
+        return timed_route_handler
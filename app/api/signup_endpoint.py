@@ -3,8 +3,9 @@ from app.schemas.user import SignupRequest, SignupResponse
 from loguru import logger
 from app.di import providers
 from app.bp import SignupUseCase
+from app.api.routing import StageTimingRoute
 
-router = APIRouter(prefix="", tags=["users"])
+router = APIRouter(prefix="", tags=["users"], route_class=StageTimingRoute)
 
 
 @router.post(
@@ -0,0 +1,112 @@
+"""Sampled capture of live traffic for replay (see benchmarks/traffic_replay.py)."""
+
+import json
+import os
+import random
+
+from fastapi import Request
+from loguru import logger
+
+from app.core.config import settings
+from app.schemas.user import SignupRequest
+
+
+# Headers replayed as captured; everything else (auth, cookies, debug tokens) is dropped
+CAPTURED_HEADERS = ("content-type", "accept", "accept-encoding", "idempotency-key")
+
+# Passwords are replaced by a placeholder that passes validation exactly when
+# the original did, so a replay takes the same path (hashing vs 422)
+SECRET_FIELDS = ("password",)
+VALID_PASSWORD_PLACEHOLDER = "Redacted-Passw0rd"
+INVALID_PASSWORD_PLACEHOLDER = "redacted"
+
+
+def redact_password(value) -> str:
+    try:
+        SignupRequest.validate_password(str(value))
+    except ValueError:
+        return INVALID_PASSWORD_PLACEHOLDER
+    return VALID_PASSWORD_PLACEHOLDER
+
+
+def redact_body(body: bytes, max_bytes: int) -> str | None:
+    """
+    Decode a request body for capture with secrets redacted.
+    
+    JSON objects get their SECRET_FIELDS replaced; bodies that aren't JSON
+    objects are dropped (they may hold secrets we can't find), as are bodies
+    over `max_bytes`.
+    """
+    if not body or len(body) > max_bytes:
+        return None
+    try:
+        data = json.loads(body)
+    except ValueError:
+        return None
+    if not isinstance(data, dict):
+        return None
+    for field in SECRET_FIELDS:
+        if field in data:
+            data[field] = redact_password(data[field])
+    return json.dumps(data, separators=(",", ":"))
+
+
+class TrafficRecorder:
+    """
+    Appends sampled requests to a JSON Lines file.
+    
+    One compact line per request: wall-clock start `t`, method `m`, path `p`,
+    query `q`, route template `r`, selected headers `h`, redacted body `b`,
+    status `s` and duration in ms `d`. Each line is a single O_APPEND write,
+    so several workers can share one file.
+    """
+    
+    def __init__(self, path: str, sample_ratio: float = 0.01, max_body_bytes: int = 16384):
+        self.path = path
+        self.sample_ratio = sample_ratio
+        self.max_body_bytes = max_body_bytes
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+    
+    def should_sample(self) -> bool:
+        return random.random() < self.sample_ratio
+    
+    def record(
+        self,
+        request: Request,
+        body: bytes | None,
+        started_at: float,
+        status: int,
+        duration: float,
+        route: str,
+    ) -> None:
+        entry = {
+            "t": round(started_at, 6),
+            "m": request.method,
+            "p": request.url.path,
+            "q": request.url.query or None,
+            "r": route,
+            "h": {name: request.headers[name] for name in CAPTURED_HEADERS if name in request.headers},
+            "b": redact_body(body, self.max_body_bytes) if body else None,
+            "s": status,
+            "d": round(duration * 1000, 3),
+        }
+        try:
+            os.write(self._fd, (json.dumps(entry, separators=(",", ":")) + "\n").encode())
+        except OSError as e:
+            logger.error(f"Traffic capture write failed: {e}")
+    
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+# Global instance, None unless TRAFFIC_CAPTURE_PATH is set
+traffic_recorder = (
+    TrafficRecorder(
+        settings.traffic_capture_path,
+        sample_ratio=settings.traffic_capture_sample_ratio,
+        max_body_bytes=settings.traffic_capture_max_body_bytes,
+    )
+    if settings.traffic_capture_path
+    else None
+)
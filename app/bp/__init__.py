@@ -1,7 +1,9 @@
 from .signup_usecase import SignupUseCase
 from .get_user_usecase import GetUserUseCase
+from .get_signup_stats_usecase import GetSignupStatsUseCase
 from .usecase import UseCase
 from .domain import User
 from .repository import UserCreateRepository
 from .repository import UserReadRepository
-from .repository import EncryptRepository
\ No newline at end of file
+from .repository import EncryptRepository
+from .repository import StatsRepository
\ No newline at end of file
@@ -1,3 +1,5 @@
 from .idempotency import IdempotencyKey
 from .user import User
 from .user import UserReadModel
+from .user import UserEmailIndex
+from .signup_stat import SignupStat
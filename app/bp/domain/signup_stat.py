@@ -0,0 +1,18 @@
+from tortoise import fields
+from tortoise.models import Model
+
+
+class SignupStat(Model):
+    """Signups counted per hour, per day and in total (granularity "total")."""
+    
+    id = fields.IntField(pk=True)
+    granularity = fields.CharField(max_length=8)
+    bucket = fields.DatetimeField()
+    count = fields.BigIntField(default=0)
+    
+    class Meta:
+        table = "signup_stats"
+        unique_together = (("granularity", "bucket"),)
+    
+    def __str__(self):
+        return f"SignupStat(granularity={self.granularity}, bucket={self.bucket}, count={self.count})"
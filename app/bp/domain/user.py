@@ -23,10 +23,24 @@ class UserReadModel(Model):
     name = fields.CharField(max_length=255)
     email = fields.CharField(max_length=255, index=True)
     display_name = fields.CharField(max_length=255)
-    created_at = fields.DatetimeField()
+    created_at = fields.DatetimeField(index=True)
     
     class Meta:
         table = "users_read_model"
         
     def __str__(self):
         return f"UserReadModel(id={self.id}, email={self.email})"
+
+
+class UserEmailIndex(Model):
+    """Global email -> user id index, used when users are sharded by id."""
+    
+    email = fields.CharField(max_length=255, pk=True)
+    user_id = fields.UUIDField()
+    created_at = fields.DatetimeField(auto_now_add=True, index=True)
+    
+    class Meta:
+        table = "user_email_index"
+        
+    def __str__(self):
+        return f"UserEmailIndex(email={self.email}, user_id={self.user_id})"
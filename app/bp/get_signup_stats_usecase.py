@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta, timezone
+from app.bp.repository import StatsRepository
+
+from app.core.observability import get_tracer
+from .usecase import UseCase
+
+
+tracer = get_tracer(__name__)
+
+BUCKET_SIZES = {
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+}
+
+
+def bucket_start(moment: datetime, granularity: str) -> datetime:
+    """Start of the hour or day (UTC) containing `moment`."""
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    start = moment.astimezone(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    if granularity == "day":
+        start = start.replace(hour=0)
+    return start
+
+
+class GetSignupStatsUseCase(UseCase):
+    def __init__(
+        self,
+        stats_repository: StatsRepository,
+    ) -> None:
+        self.stats_repository = stats_repository
+
+    async def run(self, granularity: str, start: datetime, end: datetime) -> dict:
+        """
+        Signups per hour or day in [start, end) and the total user count.
+        
+        Reads the incrementally maintained signup_stats counters, so the cost
+        depends on the number of buckets in the range, not on the users table.
+        Buckets without signups are returned with a count of 0.
+        """
+        with tracer.start_as_current_span("GetSignupStatsUseCase.run") as span:
+            span.set_attribute("granularity", granularity)
+            
+            start = bucket_start(start, granularity)
+            end = bucket_start(end, granularity)
+            step = BUCKET_SIZES[granularity]
+            
+            stats = await self.stats_repository.get_signup_stats(
+                granularity=granularity, start=start, end=end
+            )
+            counts = {bucket_start(stat.bucket, granularity): stat.count for stat in stats}
+            total = await self.stats_repository.get_total_signups()
+            
+            buckets = []
+            current = start
+            while current < end:
+                buckets.append({"start": current, "count": counts.get(current, 0)})
+                current += step
+            
+            return {
+                "granularity": granularity,
+                "start": start,
+                "end": end,
+                "total_users": total,
+                "signups": sum(bucket["count"] for bucket in buckets),
+                "buckets": buckets,
+            }
\ No newline at end of file
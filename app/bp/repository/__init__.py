@@ -2,3 +2,4 @@
 from .user_create_repository import UserCreateRepository
 from .user_read_repository import UserReadRepository
 from .encrypt_repository import EncryptRepository
+from .stats_repository import StatsRepository
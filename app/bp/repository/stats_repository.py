@@ -0,0 +1,26 @@
+from abc import ABC
+from abc import abstractmethod
+from datetime import datetime
+from app.bp.domain import SignupStat
+
+class StatsRepository(ABC):
+    @abstractmethod
+    async def record_signup(
+        self, created_at:datetime
+    ) -> None:
+        pass
+    
+    @abstractmethod
+    async def get_signup_stats(
+        self,
+        granularity:str,
+        start:datetime,
+        end:datetime,
+    ) -> list[SignupStat]:
+        pass
+    
+    @abstractmethod
+    async def get_total_signups(
+        self,
+    ) -> int:
+        pass
@@ -1,15 +1,16 @@
-import uuid
 from loguru import logger
 from tortoise.exceptions import IntegrityError
 
 from app.bp.repository import UserCreateRepository
 from app.bp.repository import UserReadRepository
 from app.bp.repository import EncryptRepository
+from app.bp.repository import StatsRepository
 
 from app.bp.domain import User
 from app.schemas.user import SignupRequest
-from app.infrastructure.metrics import signup_requests_total, signup_duplicates_total
+from app.infrastructure.metrics import signup_requests_total, signup_duplicates_total, track_stage
 from app.core.observability import get_tracer
+from app.core.ids import uuid7
 from .usecase import UseCase
 
 tracer = get_tracer(__name__)
@@ -21,10 +22,12 @@ class SignupUseCase(UseCase):
         user_create_repository: UserCreateRepository,
         user_read_repository: UserReadRepository,
         encrypt_repository: EncryptRepository,
+        stats_repository: StatsRepository,
     ) -> None:
         self.user_create_repository = user_create_repository
         self.user_read_repository = user_read_repository
         self.encrypt_repository = encrypt_repository
+        self.stats_repository = stats_repository
 
     async def run(self, params: SignupRequest) -> User:
         """
@@ -33,6 +36,7 @@ class SignupUseCase(UseCase):
         2. Hash password
         3. Create user in write model
         4. Project to read model
+        5. Count it in the signup stats
         
         Handled errors:
             ValueError: If email already exists
@@ -43,7 +47,8 @@ class SignupUseCase(UseCase):
             try:
                 
                 # check if already exists
-                existing_user = await self.user_create_repository.get_user_by_email(email=params.email)
+                with track_stage("duplicate_check"):
+                    existing_user = await self.user_create_repository.get_user_by_email(email=params.email)
                 if existing_user:
                     logger.warning(f"Duplicate signup attempt for email: {params.email}")
                     # metrics
@@ -53,25 +58,35 @@ class SignupUseCase(UseCase):
                     raise ValueError(f"User with email {params.email} already exists")
                 
                 # encrypt password
-                password_hash = await self.encrypt_repository.encrypt(params.password)
+                with track_stage("password_hash"):
+                    password_hash = await self.encrypt_repository.encrypt(params.password)
                 
                 # write model
-                user = await self.user_create_repository.create_user(
-                    id=uuid.uuid4(),
-                    name=params.name,
-                    email=params.email,
-                    password_hash=password_hash,
-                    display_name=params.display_name,
-                )
+                with track_stage("write_insert"):
+                    user = await self.user_create_repository.create_user(
+                        id=uuid7(),
+                        name=params.name,
+                        email=params.email,
+                        password_hash=password_hash,
+                        display_name=params.display_name,
+                    )
                 
                 # proyection to read model
-                await self.user_read_repository.project_to_read_model(
-                    id=user.id,
-                    name=user.name,
-                    email=user.email,
-                    display_name=user.display_name,
-                    created_at=user.created_at,
-                )
+                with track_stage("projection_insert"):
+                    await self.user_read_repository.project_to_read_model(
+                        id=user.id,
+                        name=user.name,
+                        email=user.email,
+                        display_name=user.display_name,
+                        created_at=user.created_at,
+                    )
+                
+                # signup stats (rebuildable, so a failure doesn't fail the signup)
+                with track_stage("stats_update"):
+                    try:
+                        await self.stats_repository.record_signup(user.created_at)
+                    except Exception as e:
+                        logger.error(f"Failed to update signup stats for {user.id}: {str(e)}")
                 
                 logger.info(f"User created successfully: {user.id} ({user.email})")
                 # metrics
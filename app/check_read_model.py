@@ -0,0 +1,50 @@
+"""
+Check users_read_model against users and repair the rows that drifted.
+
+Projection is a separate insert after the write in SignupUseCase, so a crash
+between both leaves a user without its read model row. Both tables are
+compared bucket by bucket over id prefixes, descending only into the
+buckets that differ (see app/infrastructure/read_model/drift.py).
+
+Exits with status 1 when drift was found and --no-repair was given.
+
+Usage:
+    python -m app.check_read_model
+    python -m app.check_read_model --no-repair --leaf-size 128
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+
+from app.core.config import settings
+from app.core.database import init_db, close_db
+from app.di import container
+
+
+async def main(args: argparse.Namespace) -> dict:
+    await init_db()
+    try:
+        container.read_model_drift_checker.leaf_size = args.leaf_size
+        return await container.read_model_drift_checker.check(repair=args.repair)
+    finally:
+        await close_db()
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--no-repair", dest="repair", action="store_false", help="only report the drift")
+    parser.add_argument(
+        "--leaf-size", type=int, default=settings.read_model_drift_leaf_size,
+        help="compare rows one by one below this many rows per bucket",
+    )
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    report = asyncio.run(main(args))
+    print(json.dumps(report, indent=2))
+    if (report["divergent_rows"] or report["orphaned_email_index"]) and not args.repair:
+        sys.exit(1)
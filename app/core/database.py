@@ -1,24 +1,107 @@
 from tortoise import Tortoise
+from tortoise.backends.base.config_generator import expand_db_url
 from app.core.config import settings
 
 
+POOLED_ENGINE = "app.infrastructure.database.pool"
+
+
+def build_connection_config(dsn: str) -> str | dict:
+    """
+    Build the Tortoise connection config for a DSN.
+    
+    PostgreSQL DSNs use the instrumented asyncpg engine with the pool
+    settings from `Settings`; other backends (e.g. SQLite in tests) keep the
+    plain DSN.
+    """
+    if not dsn.startswith(("postgres://", "asyncpg://")):
+        return dsn
+    
+    config = expand_db_url(dsn)
+    config["engine"] = POOLED_ENGINE
+    config["credentials"].update(
+        minsize=settings.db_pool_min_size,
+        maxsize=settings.db_pool_max_size,
+        acquire_timeout=settings.db_pool_acquire_timeout_seconds,
+        statement_cache_size=settings.db_statement_cache_size,
+        max_lifetime=settings.db_connection_max_lifetime_seconds,
+    )
+    return config
+
+
+def shard_connection_name(shard: str) -> str:
+    """Tortoise connection name of a user shard."""
+    return f"shard_{shard}"
+
+
+def connection_names() -> list[str]:
+    """Tortoise connection names: "default" and one per user shard."""
+    return ["default", *map(shard_connection_name, settings.db_shards)]
+
+
 TORTOISE_ORM = {
     "connections": {
-        "default": settings.db_dsn,
+        "default": build_connection_config(settings.db_dsn),
+        **{
+            shard_connection_name(shard): build_connection_config(dsn)
+            for shard, dsn in settings.db_shards.items()
+        },
     },
     "apps": {
         "models": {
-            "models": ["app.bp.domain.user", "app.bp.domain.idempotency", "aerich.models"],
+            "models": ["app.bp.domain.user", "app.bp.domain.idempotency", "app.bp.domain.signup_stat", "aerich.models"],
             "default_connection": "default",
         },
     },
 }
 
 
+def should_generate_schemas() -> bool:
+    """
+    Whether init_db creates missing tables.
+    
+    Production schemas are managed by aerich migrations (see entrypoint.sh),
+    so generation is skipped there unless DB_GENERATE_SCHEMAS says otherwise.
+    """
+    if settings.db_generate_schemas is not None:
+        return settings.db_generate_schemas
+    return settings.environment != "production"
+
+
 async def init_db():
     """Initialize database connection."""
     await Tortoise.init(config=TORTOISE_ORM)
-    await Tortoise.generate_schemas()
+    if should_generate_schemas():
+        await Tortoise.generate_schemas()
+    await generate_shard_schemas(settings.db_shards)
+
+
+async def generate_shard_schemas(shards) -> None:
+    """
+    Create the users and users_read_model tables on each shard if missing.
+    
+    aerich only migrates the default connection, so shards always get their
+    tables here (CREATE TABLE IF NOT EXISTS), whatever should_generate_schemas
+    says.
+    """
+    from app.bp.domain import User, UserReadModel
+    
+    for shard in shards:
+        client = Tortoise.get_connection(shard_connection_name(shard))
+        generator = client.schema_generator(client)
+        sql = "\n".join(
+            generator._get_table_sql(model, safe=True)["table_creation_string"]
+            for model in (User, UserReadModel)
+        )
+        await generator.generate_from_string(sql)
+
+
+async def warm_up_db():
+    """Pre-open the connection pools so the first requests don't pay for it."""
+    for name in connection_names():
+        connection = Tortoise.get_connection(name)
+        if hasattr(connection, "warm_up"):
+            await connection.warm_up()
 
 
 async def close_db():
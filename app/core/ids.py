@@ -0,0 +1,24 @@
+"""Time-ordered (version 7) UUIDs, RFC 9562; uuid.uuid7 only exists from Python 3.14."""
+
+import os
+import time
+from datetime import datetime, timezone
+from uuid import UUID
+
+
+def uuid7(unix_ms: int | None = None) -> UUID:
+    """48-bit Unix time in milliseconds followed by 74 random bits."""
+    if unix_ms is None:
+        unix_ms = time.time_ns() // 1_000_000
+    value = (unix_ms & 0xFFFF_FFFF_FFFF) << 80 | int.from_bytes(os.urandom(10), "big")
+    # version 7 and the RFC 9562 variant
+    value = value & ~(0xF << 76) | 7 << 76
+    value = value & ~(0x3 << 62) | 0x2 << 62
+    return UUID(int=value)
+
+
+def uuid7_time(id: UUID) -> datetime | None:
+    """When a version 7 id was generated; None for other versions."""
+    if id.version != 7:
+        return None
+    return datetime.fromtimestamp((id.int >> 80) / 1000, timezone.utc)
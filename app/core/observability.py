@@ -1,21 +1,18 @@
 """Observability setup: logging and distributed tracing."""
 
 import sys
+from contextvars import ContextVar
 from loguru import logger
-from opentelemetry import trace
-from opentelemetry.sdk.trace import TracerProvider
-from opentelemetry.sdk.trace.export import BatchSpanProcessor
-from opentelemetry.exporter.jaeger.thrift import JaegerExporter
-from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
-from opentelemetry.sdk.resources import Resource, SERVICE_NAME
 
 from app.core.config import settings
 
 
-# Service resource for tracing
-resource = Resource(attributes={
-    SERVICE_NAME: "signup-service"
-})
+# OpenTelemetry SDK, instrumentation and exporters are imported in
+# setup_tracing only, so they cost nothing at startup when tracing is disabled
+SERVICE_NAME = "signup-service"
+
+# Request id of the request being handled, readable from other threads via the task context
+request_id_var: ContextVar[str | None] = ContextVar("request_id", default=None)
 
 def setup_logging():
     """
@@ -52,11 +49,13 @@ def setup_logging():
 
 def setup_tracing(app):
     """
-    Configure distributed tracing with Jaeger.
+    Configure distributed tracing.
     
     Sets up:
-    - OpenTelemetry tracer provider
-    - Jaeger exporter
+    - OpenTelemetry tracer provider with a parent-based ratio sampler,
+      rate-limited per route
+    - Optional tail sampling (always keeps error and slow traces)
+    - Jaeger or OTLP (HTTP/gRPC) exporter behind a bounded batch processor
     - FastAPI instrumentation
     
     Args:
@@ -65,20 +64,72 @@ def setup_tracing(app):
     if not settings.enable_tracing:
         return
     
-    trace.set_tracer_provider(TracerProvider(resource=resource))
+    from opentelemetry import trace
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+    from opentelemetry.sdk.resources import Resource, SERVICE_NAME as SERVICE_NAME_KEY
+    from app.infrastructure.tracing import (
+        CountingBatchSpanProcessor,
+        TailSamplingSpanProcessor,
+        build_sampler,
+        build_span_exporter,
+    )
     
-    jaeger_exporter = JaegerExporter(
-        agent_host_name=settings.jaeger_agent_host,
-        agent_port=settings.jaeger_agent_port,
+    provider = TracerProvider(
+        resource=Resource(attributes={SERVICE_NAME_KEY: SERVICE_NAME}),
+        sampler=build_sampler(
+            ratio=settings.trace_sample_ratio,
+            route_limits=settings.trace_route_rate_limits,
+            default_limit=settings.trace_default_rate_limit,
+        ),
     )
     
-    trace.get_tracer_provider().add_span_processor(
-        BatchSpanProcessor(jaeger_exporter)
+    exporter = build_span_exporter(
+        settings.trace_exporter,
+        endpoint=settings.otlp_endpoint,
+        jaeger_host=settings.jaeger_agent_host,
+        jaeger_port=settings.jaeger_agent_port,
+    )
+    span_processor = CountingBatchSpanProcessor(
+        exporter,
+        max_queue_size=settings.trace_batch_max_queue_size,
+        max_export_batch_size=settings.trace_batch_max_export_batch_size,
+        schedule_delay_millis=settings.trace_batch_schedule_delay_ms,
+        export_timeout_millis=settings.trace_batch_export_timeout_ms,
     )
     
+    if settings.enable_tail_sampling:
+        span_processor = TailSamplingSpanProcessor(
+            span_processor,
+            sample_ratio=settings.trace_tail_sample_ratio,
+            slow_threshold_seconds=settings.trace_slow_threshold_ms / 1000,
+            max_traces=settings.trace_tail_max_traces,
+        )
+    
+    provider.add_span_processor(span_processor)
+    trace.set_tracer_provider(provider)
+    
     FastAPIInstrumentor.instrument_app(app)
 
 
+def shutdown_tracing():
+    """
+    Flush buffered spans and shut the tracer provider down.
+    
+    Called on application shutdown so spans still queued in the batch
+    processor are exported instead of lost with the process.
+    """
+    if not settings.enable_tracing:
+        return
+    
+    from opentelemetry import trace
+    
+    provider = trace.get_tracer_provider()
+    if hasattr(provider, "shutdown"):
+        provider.force_flush(settings.trace_batch_export_timeout_ms)
+        provider.shutdown()
+
+
 def get_tracer(name: str):
     """
     Get a tracer instance for creating spans.
@@ -87,6 +138,25 @@ def get_tracer(name: str):
         name: Name of the tracer (usually __name__)
     
     Returns:
-        Tracer instance
+        Tracer instance (a no-op proxy until tracing is set up)
     """
+    from opentelemetry import trace
+    
     return trace.get_tracer(name)
+
+
+def get_current_trace_id() -> str | None:
+    """
+    Get the trace id of the active span, used as a metrics exemplar.
+    
+    Returns:
+        Trace id as 32 hex characters, or None outside of a sampled trace
+    """
+    if not settings.enable_tracing:
+        return None
+    from opentelemetry import trace
+    
+    span_context = trace.get_current_span().get_span_context()
+    if not span_context.is_valid or not span_context.trace_flags.sampled:
+        return None
+    return format(span_context.trace_id, "032x")
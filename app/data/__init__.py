@@ -1,4 +1,6 @@
 from .datasources import DataSource
+from .datasources import ShardedDataSource
 from .encrypt_repository_imp import EncryptRepositoryImp
 from .user_create_repository_imp import UserCreateRepositoryImp
 from .user_read_repository_imp import UserReadRepositoryImp
+from .stats_repository_imp import StatsRepositoryImp
@@ -1 +1,2 @@
 from .data_source import DataSource
+from .sharded_data_source import ShardedDataSource
@@ -1,8 +1,85 @@
 
 from app.bp.domain import User
 from app.bp.domain import UserReadModel
+from app.bp.domain import SignupStat
+from tortoise.backends.base.client import BaseDBAsyncClient
+from tortoise.expressions import Q, RawSQL
+from tortoise.models import Model
+from tortoise.transactions import in_transaction
+from collections import Counter
 from uuid import UUID
-from datetime import datetime
+from datetime import datetime, timezone
+import hashlib
+
+
+READ_MODEL_FIELDS = ("id", "name", "email", "display_name", "created_at")
+
+# count and order-independent digest (sum of row hashes) per id tail, computed
+# by PostgreSQL so only one row per bucket leaves the database
+BUCKET_DIGESTS_SQL = """
+SELECT {tail} AS bucket,
+       count(*) AS rows,
+       sum(hashtextextended(concat_ws('|', id::text, name, email, display_name, created_at::text), 0)) AS digest
+FROM {table}
+{where}
+GROUP BY bucket
+"""
+
+
+TOTAL_BUCKET = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# one statement bumps the hour, day and total counters of a signup
+ADD_SIGNUP_STATS_SQL = """
+INSERT INTO signup_stats (granularity, bucket, count)
+VALUES {values}
+ON CONFLICT (granularity, bucket) DO UPDATE SET count = signup_stats.count + excluded.count
+"""
+
+
+def signup_stat_buckets(created_at: datetime) -> list[tuple[str, datetime]]:
+    """(granularity, bucket start) counters a signup at `created_at` belongs to."""
+    hour = created_at.astimezone(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    return [("hour", hour), ("day", hour.replace(hour=0)), ("total", TOTAL_BUCKET)]
+
+
+def open_signup_stats(started_at: datetime) -> Q:
+    """Counters signups after `started_at` can still bump: its hour and day onwards, and the total."""
+    hour, day, _ = signup_stat_buckets(started_at)
+    return (
+        Q(granularity=hour[0], bucket__gte=hour[1])
+        | Q(granularity=day[0], bucket__gte=day[1])
+        | Q(granularity="total")
+    )
+
+
+def id_tail_sql(dialect: str, length: int) -> str:
+    """SQL for the last `length` hex digits of the id column."""
+    if dialect == "postgres":
+        return f"right(replace(id::text, '-', ''), {int(length)})"
+    return f"substr(replace(id, '-', ''), -{int(length)})"
+
+
+def row_digest(row: tuple) -> int:
+    """Hash of a read model row for backends without a SQL hash function."""
+    data = "|".join(str(value) for value in row).encode()
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "big", signed=True)
+
+
+def project_user(
+    id: UUID,
+    name:str,
+    email:str,
+    display_name:str,
+    created_at:datetime,
+) -> UserReadModel:
+    """Read model row of a user (shared by signup and the read model rebuild)."""
+    return UserReadModel(
+        id=id,
+        name=name,
+        email=email,
+        display_name=display_name,
+        created_at=created_at,
+    )
 
 
 class DataSource:
@@ -14,6 +91,11 @@ class DataSource:
     ) -> UserReadModel | None:
         return await UserReadModel.get_or_none(id=id)
     
+    async def get_users_by_ids(
+        self, ids:list[UUID]
+    ) -> list[UserReadModel]:
+        return await UserReadModel.filter(id__in=ids)
+    
     async def get_user_by_email(
         self, email:str
     ) -> User | None:
@@ -43,10 +125,237 @@ class DataSource:
         display_name:str,
         created_at:datetime,
     ):
-        await UserReadModel.create(
+        read_model = project_user(
             id=id,
             name=name,
             email=email,
             display_name=display_name,
             created_at=created_at,
-        )
\ No newline at end of file
+        )
+        await read_model.save(force_create=True)
+
+    async def get_users_page(
+        self,
+        after_id:UUID | None,
+        limit:int,
+        connection:BaseDBAsyncClient | None = None,
+    ) -> list[dict]:
+        """Next `limit` users ordered by id (keyset pagination), read model fields only."""
+        query = User.all().using_db(connection)
+        if after_id is not None:
+            query = query.filter(id__gt=after_id)
+        return await query.order_by("id").limit(limit).values(*READ_MODEL_FIELDS)
+
+    async def get_read_model_page(
+        self,
+        after_id:UUID | None,
+        limit:int,
+        field:str = "id",
+        connection:BaseDBAsyncClient | None = None,
+    ) -> list[dict]:
+        """Next `limit` read model rows ordered by id (keyset pagination), with their id and `field`."""
+        query = UserReadModel.all().using_db(connection)
+        if after_id is not None:
+            query = query.filter(id__gt=after_id)
+        return await query.order_by("id").limit(limit).values(*dict.fromkeys(("id", field)))
+
+    async def get_read_model_values_since(
+        self,
+        since:datetime,
+        field:str = "id",
+        connection:BaseDBAsyncClient | None = None,
+    ) -> list:
+        """`field` of the read model rows created at or after `since`."""
+        return await UserReadModel.filter(created_at__gte=since).using_db(connection).values_list(field, flat=True)
+
+    async def upsert_user_read_models(
+        self,
+        users:list[dict],
+        connection:BaseDBAsyncClient | None = None,
+    ) -> None:
+        """Project users to the read model, overwriting existing rows."""
+        await UserReadModel.bulk_create(
+            [project_user(**user) for user in users],
+            on_conflict=["id"],
+            update_fields=[field for field in READ_MODEL_FIELDS if field != "id"],
+            using_db=connection,
+        )
+
+    async def delete_user_read_models(
+        self,
+        ids:list[UUID],
+        connection:BaseDBAsyncClient | None = None,
+    ) -> None:
+        await UserReadModel.filter(id__in=ids).using_db(connection).delete()
+
+    async def get_orphan_email_index_entries(
+        self,
+        created_since:datetime | None,
+        created_before:datetime,
+    ) -> list[dict]:
+        """Email index entries without their user; unsharded users have no email index."""
+        return []
+
+    async def delete_email_index_entries(
+        self, entries:list[dict]
+    ) -> None:
+        pass
+
+    async def increment_signup_stats(
+        self, created_at:datetime
+    ) -> None:
+        await self.add_signup_stats({key: 1 for key in signup_stat_buckets(created_at)})
+
+    async def add_signup_stats(
+        self,
+        counts:dict[tuple[str, datetime], int],
+        connection:BaseDBAsyncClient | None = None,
+    ) -> None:
+        """Add `counts` to the (granularity, bucket) counters, creating missing ones."""
+        connection = connection or SignupStat._meta.db
+        bucket_field = SignupStat._meta.fields_map["bucket"]
+        values = []
+        for (granularity, bucket), count in counts.items():
+            values += [granularity, bucket_field.to_db_value(bucket, SignupStat), count]
+        if connection.capabilities.dialect == "postgres":
+            placeholders = [f"${i}" for i in range(1, len(values) + 1)]
+        else:
+            placeholders = ["?"] * len(values)
+        rows = ", ".join(
+            f"({', '.join(placeholders[i:i + 3])})" for i in range(0, len(placeholders), 3)
+        )
+        await connection.execute_query(ADD_SIGNUP_STATS_SQL.format(values=rows), values)
+
+    async def get_signup_stats(
+        self,
+        granularity:str,
+        start:datetime,
+        end:datetime,
+    ) -> list[SignupStat]:
+        return await SignupStat.filter(
+            granularity=granularity, bucket__gte=start, bucket__lt=end
+        ).order_by("bucket")
+
+    async def get_total_signups(
+        self,
+    ) -> int:
+        total = await SignupStat.get_or_none(granularity="total", bucket=TOTAL_BUCKET)
+        return total.count if total else 0
+
+    async def rebuild_signup_stats(
+        self, chunk_size:int = 5000
+    ) -> int:
+        """
+        Recount signup_stats from users (backfill).
+
+        Users created before the rebuild started are streamed in id order and
+        the counters rewritten in one transaction at the end. Counters still open
+        at the start (its hour and day onwards, and the total) are upserted and
+        keep the increments signups made while the users were read.
+        Returns the number of users counted.
+        """
+        started_at = datetime.now(timezone.utc)
+        # the only open counters users created before started_at can be in
+        open_keys = set(signup_stat_buckets(started_at))
+        open_stats = open_signup_stats(started_at)
+        increments_from = await self.get_signup_stat_counts(open_stats)
+        counts: Counter = Counter()
+        after_id = None
+        while True:
+            users = await self.get_users_page(after_id, chunk_size)
+            for user in users:
+                if user["created_at"] < started_at:
+                    counts.update(signup_stat_buckets(user["created_at"]))
+            if len(users) < chunk_size:
+                break
+            after_id = users[-1]["id"]
+        total = counts[("total", TOTAL_BUCKET)]
+
+        async with in_transaction("default") as connection:
+            # row locks make concurrent increments of open counters wait for the commit
+            current = await self.get_signup_stat_counts(open_stats, connection, for_update=True)
+            for key, count in current.items():
+                counts[key] += count - increments_from.get(key, 0)
+            await SignupStat.exclude(open_stats).using_db(connection).delete()
+            await SignupStat.bulk_create(
+                [
+                    SignupStat(granularity=key[0], bucket=key[1], count=count)
+                    for key, count in counts.items()
+                    if key not in current and key not in open_keys
+                ],
+                batch_size=1000,
+                using_db=connection,
+            )
+            for (granularity, bucket), count in current.items():
+                if counts[(granularity, bucket)] != count:
+                    await SignupStat.filter(granularity=granularity, bucket=bucket).using_db(
+                        connection
+                    ).update(count=counts[(granularity, bucket)])
+            # open counters created since they were locked are added to, not replaced
+            missing = {
+                key: count for key, count in counts.items()
+                if key in open_keys and key not in current
+            }
+            if missing:
+                await self.add_signup_stats(missing, connection)
+        return total
+
+    async def get_signup_stat_counts(
+        self,
+        where:Q,
+        connection:BaseDBAsyncClient | None = None,
+        for_update:bool = False,
+    ) -> dict[tuple[str, datetime], int]:
+        """Counters matching `where`, by (granularity, bucket)."""
+        query = SignupStat.filter(where).using_db(connection)
+        if for_update:
+            query = query.select_for_update()
+        rows = await query.values_list("granularity", "bucket", "count")
+        return {(granularity, bucket): count for granularity, bucket, count in rows}
+
+    async def get_id_bucket_digests(
+        self,
+        model:type[Model],
+        suffix:str,
+        length:int,
+        connection:BaseDBAsyncClient | None = None,
+    ) -> dict[str, tuple[int, int]]:
+        """
+        Row count and digest of the read model fields of `model` (User or
+        UserReadModel) whose id ends with the hex `suffix`, grouped by the
+        last `length` hex digits of the id.
+        """
+        connection = connection or model._meta.db
+        dialect = connection.capabilities.dialect
+        if dialect == "postgres":
+            sql = BUCKET_DIGESTS_SQL.format(
+                tail=id_tail_sql(dialect, length),
+                table=model._meta.db_table,
+                where=f"WHERE {id_tail_sql(dialect, len(suffix))} = $1" if suffix else "",
+            )
+            rows = await connection.execute_query_dict(sql, [suffix] if suffix else [])
+            return {row["bucket"]: (row["rows"], int(row["digest"])) for row in rows}
+
+        # other backends (SQLite in tests): hash the rows here
+        buckets: dict[str, tuple[int, int]] = {}
+        for row in await self.get_rows_with_id_suffix(model, suffix, as_tuples=True, connection=connection):
+            bucket = row[0].hex[-length:]
+            count, digest = buckets.get(bucket, (0, 0))
+            buckets[bucket] = (count + 1, digest + row_digest(row))
+        return buckets
+
+    async def get_rows_with_id_suffix(
+        self,
+        model:type[Model],
+        suffix:str,
+        as_tuples:bool = False,
+        connection:BaseDBAsyncClient | None = None,
+    ) -> list:
+        """Read model fields of the `model` rows whose id ends with the hex `suffix`."""
+        query = model.all().using_db(connection)
+        if suffix:
+            dialect = (connection or model._meta.db).capabilities.dialect
+            query = query.annotate(id_tail=RawSQL(id_tail_sql(dialect, len(suffix)))).filter(id_tail=suffix)
+        if as_tuples:
+            return await query.values_list(*READ_MODEL_FIELDS)
+        return await query.values(*READ_MODEL_FIELDS)
\ No newline at end of file
@@ -0,0 +1,364 @@
+import asyncio
+import heapq
+from uuid import UUID
+from datetime import datetime
+
+from tortoise import Tortoise
+from tortoise.backends.base.client import BaseDBAsyncClient
+from tortoise.models import Model
+
+from app.bp.domain import User
+from app.bp.domain import UserReadModel
+from app.bp.domain import UserEmailIndex
+from app.core.database import shard_connection_name
+from app.infrastructure.sharding import HashRing
+from .data_source import DataSource, READ_MODEL_FIELDS, project_user
+
+
+USER_FIELDS = ("id", "name", "email", "password_hash", "display_name", "created_at", "updated_at")
+SHARDED_MODELS = (User, UserReadModel)
+
+
+class ShardedDataSource(DataSource):
+    """
+    DataSource with `users` and `users_read_model` spread over several databases.
+    
+    A user and its read model row live on the shard that owns the user id on
+    a consistent hash ring, so reads by id go to a single shard. Email
+    lookups go through `user_email_index` on the default database, whose
+    primary key also keeps emails unique across shards. Idempotency keys and
+    signup stats stay on the default database.
+    
+    `connection_names` maps shard names to Tortoise connections (by default
+    `shard_<name>`); the resharding tool also uses it to read an unsharded
+    layout as a single shard on "default".
+    """
+    
+    def __init__(
+        self,
+        shards: list[str],
+        vnodes: int = 128,
+        connection_names: dict[str, str] | None = None,
+    ):
+        super().__init__()
+        self.ring = HashRing(shards, vnodes)
+        self.connection_names = connection_names or {
+            shard: shard_connection_name(shard) for shard in shards
+        }
+    
+    @property
+    def shards(self) -> list[str]:
+        return self.ring.shards
+    
+    def connection(self, shard:str) -> BaseDBAsyncClient:
+        return Tortoise.get_connection(self.connection_names[shard])
+    
+    def connection_for(self, id:UUID) -> BaseDBAsyncClient:
+        return self.connection(self.ring.shard_for(id))
+    
+    async def get_user_by_id(
+        self, id:UUID
+    ) -> UserReadModel | None:
+        return await UserReadModel.filter(id=id).using_db(self.connection_for(id)).first()
+    
+    async def get_users_by_ids(
+        self, ids:list[UUID]
+    ) -> list[UserReadModel]:
+        """Fetch from every involved shard in parallel."""
+        results = await asyncio.gather(*(
+            UserReadModel.filter(id__in=group).using_db(self.connection(shard))
+            for shard, group in self.ring.group(ids).items()
+        ))
+        return [user for users in results for user in users]
+    
+    async def get_user_by_email(
+        self, email:str
+    ) -> User | None:
+        entry = await UserEmailIndex.get_or_none(email=email)
+        if entry is None:
+            return None
+        return await User.filter(id=entry.user_id).using_db(self.connection_for(entry.user_id)).first()
+    
+    async def create_user(
+        self,
+        id: UUID,
+        name:str,
+        email:str,
+        password_hash:str,
+        display_name:str
+    ) -> User:
+        # the index insert raises IntegrityError for an email taken on any shard
+        await UserEmailIndex.create(email=email, user_id=id)
+        try:
+            return await User.create(
+                id=id,
+                name=name,
+                email=email,
+                password_hash=password_hash,
+                display_name=display_name,
+                using_db=self.connection_for(id),
+            )
+        except Exception:
+            await UserEmailIndex.filter(email=email, user_id=id).delete()
+            raise
+    
+    async def project_user_read_model(
+        self,
+        id: UUID,
+        name:str,
+        email:str,
+        display_name:str,
+        created_at:datetime,
+    ):
+        read_model = project_user(
+            id=id,
+            name=name,
+            email=email,
+            display_name=display_name,
+            created_at=created_at,
+        )
+        await read_model.save(force_create=True, using_db=self.connection_for(id))
+    
+    async def get_users_page(
+        self,
+        after_id:UUID | None,
+        limit:int,
+        connection:BaseDBAsyncClient | None = None,
+    ) -> list[dict]:
+        """Keyset page over all shards: each returns its next `limit` ids, merged in order."""
+        if connection is not None:
+            return await super().get_users_page(after_id, limit, connection)
+        pages = await asyncio.gather(*(
+            super(ShardedDataSource, self).get_users_page(after_id, limit, self.connection(shard))
+            for shard in self.shards
+        ))
+        return list(heapq.merge(*pages, key=lambda user: user["id"]))[:limit]
+    
+    async def get_read_model_page(
+        self,
+        after_id:UUID | None,
+        limit:int,
+        field:str = "id",
+        connection:BaseDBAsyncClient | None = None,
+    ) -> list[dict]:
+        if connection is not None:
+            return await super().get_read_model_page(after_id, limit, field, connection)
+        pages = await asyncio.gather(*(
+            super(ShardedDataSource, self).get_read_model_page(after_id, limit, field, self.connection(shard))
+            for shard in self.shards
+        ))
+        return list(heapq.merge(*pages, key=lambda row: row["id"]))[:limit]
+    
+    async def get_read_model_values_since(
+        self,
+        since:datetime,
+        field:str = "id",
+        connection:BaseDBAsyncClient | None = None,
+    ) -> list:
+        if connection is not None:
+            return await super().get_read_model_values_since(since, field, connection)
+        results = await asyncio.gather(*(
+            super(ShardedDataSource, self).get_read_model_values_since(since, field, self.connection(shard))
+            for shard in self.shards
+        ))
+        return [value for values in results for value in values]
+    
+    async def upsert_user_read_models(
+        self,
+        users:list[dict],
+        connection:BaseDBAsyncClient | None = None,
+    ) -> None:
+        if connection is not None:
+            return await super().upsert_user_read_models(users, connection)
+        groups: dict[str, list[dict]] = {}
+        for user in users:
+            groups.setdefault(self.ring.shard_for(user["id"]), []).append(user)
+        await asyncio.gather(*(
+            super(ShardedDataSource, self).upsert_user_read_models(group, self.connection(shard))
+            for shard, group in groups.items()
+        ))
+    
+    async def delete_user_read_models(
+        self,
+        ids:list[UUID],
+        connection:BaseDBAsyncClient | None = None,
+    ) -> None:
+        if connection is not None:
+            return await super().delete_user_read_models(ids, connection)
+        await asyncio.gather(*(
+            super(ShardedDataSource, self).delete_user_read_models(group, self.connection(shard))
+            for shard, group in self.ring.group(ids).items()
+        ))
+    
+    async def get_orphan_email_index_entries(
+        self,
+        created_since:datetime | None,
+        created_before:datetime,
+        chunk_size:int = 1000,
+    ) -> list[dict]:
+        """
+        Email index entries created in [`created_since`, `created_before`)
+        whose user is on no shard: left by a signup that died between the
+        index insert and the user insert (or its compensating delete).
+        
+        Users missing from their owner are looked up on every other shard
+        and on the default database, where a reshard may not have copied
+        them from yet. Shards dropped from DB_SHARDS are not connected, so
+        the drift repair must wait for the reshard catch-up copy.
+        """
+        orphans = []
+        after_email = None
+        while True:
+            query = UserEmailIndex.filter(created_at__lt=created_before)
+            if created_since is not None:
+                query = query.filter(created_at__gte=created_since)
+            if after_email is not None:
+                query = query.filter(email__gt=after_email)
+            entries = await query.order_by("email").limit(chunk_size).values("email", "user_id")
+            if not entries:
+                break
+            after_email = entries[-1]["email"]
+            found = await asyncio.gather(*(
+                User.filter(id__in=group).using_db(self.connection(shard)).values_list("id", flat=True)
+                for shard, group in self.ring.group(entry["user_id"] for entry in entries).items()
+            ))
+            existing = {id for ids in found for id in ids}
+            unresolved = [entry["user_id"] for entry in entries if entry["user_id"] not in existing]
+            if unresolved:
+                found = await asyncio.gather(*(
+                    User.filter(id__in=unresolved).using_db(Tortoise.get_connection(name)).values_list("id", flat=True)
+                    for name in dict.fromkeys(["default", *self.connection_names.values()])
+                ))
+                existing.update(id for ids in found for id in ids)
+            orphans += [entry for entry in entries if entry["user_id"] not in existing]
+            if len(entries) < chunk_size:
+                break
+        return orphans
+    
+    async def delete_email_index_entries(
+        self, entries:list[dict]
+    ) -> None:
+        # matched on the user id too, in case the email was taken again since
+        for entry in entries:
+            await UserEmailIndex.filter(email=entry["email"], user_id=entry["user_id"]).delete()
+    
+    async def get_id_bucket_digests(
+        self,
+        model:type[Model],
+        suffix:str,
+        length:int,
+        connection:BaseDBAsyncClient | None = None,
+    ) -> dict[str, tuple[int, int]]:
+        """Per-shard digests summed per bucket (counts and digests are additive)."""
+        if connection is not None or model not in SHARDED_MODELS:
+            return await super().get_id_bucket_digests(model, suffix, length, connection)
+        results = await asyncio.gather(*(
+            super(ShardedDataSource, self).get_id_bucket_digests(
+                model, suffix, length, self.connection(shard)
+            )
+            for shard in self.shards
+        ))
+        buckets: dict[str, tuple[int, int]] = {}
+        for result in results:
+            for bucket, (count, digest) in result.items():
+                total_count, total_digest = buckets.get(bucket, (0, 0))
+                buckets[bucket] = (total_count + count, total_digest + digest)
+        return buckets
+    
+    async def get_rows_with_id_suffix(
+        self,
+        model:type[Model],
+        suffix:str,
+        as_tuples:bool = False,
+        connection:BaseDBAsyncClient | None = None,
+    ) -> list:
+        if connection is not None or model not in SHARDED_MODELS:
+            return await super().get_rows_with_id_suffix(model, suffix, as_tuples, connection)
+        results = await asyncio.gather(*(
+            super(ShardedDataSource, self).get_rows_with_id_suffix(
+                model, suffix, as_tuples, self.connection(shard)
+            )
+            for shard in self.shards
+        ))
+        return [row for rows in results for row in rows]
+    
+    async def copy_to(
+        self, target:"ShardedDataSource", chunk_size:int = 1000
+    ) -> int:
+        """
+        Copy users, read model rows and email index entries to their owner in
+        `target` (resharding, step 1). Idempotent; rows stay on their source
+        shard until `delete_foreign_rows`. Returns the number of users copied.
+        """
+        copied = 0
+        for shard in self.shards:
+            source = self.connection(shard)
+            after_id = None
+            while True:
+                query = User.all().using_db(source).order_by("id").limit(chunk_size)
+                if after_id is not None:
+                    query = query.filter(id__gt=after_id)
+                users = await query.values(*USER_FIELDS)
+                if not users:
+                    break
+                after_id = users[-1]["id"]
+                
+                read_models = {
+                    row["id"]: row
+                    for row in await UserReadModel.filter(
+                        id__in=[user["id"] for user in users]
+                    ).using_db(source).values(*READ_MODEL_FIELDS)
+                }
+                await UserEmailIndex.bulk_create(
+                    [UserEmailIndex(email=user["email"], user_id=user["id"]) for user in users],
+                    on_conflict=["email"],
+                    update_fields=["user_id"],
+                )
+                for owner, group in target.ring.group(user["id"] for user in users).items():
+                    if target.connection_names[owner] == self.connection_names[shard]:
+                        continue
+                    destination = target.connection(owner)
+                    owned = set(group)
+                    moving = [user for user in users if user["id"] in owned]
+                    await User.bulk_create(
+                        [User(**user) for user in moving],
+                        on_conflict=["id"],
+                        update_fields=[field for field in USER_FIELDS if field != "id"],
+                        using_db=destination,
+                    )
+                    rows = [read_models[user["id"]] for user in moving if user["id"] in read_models]
+                    if rows:
+                        await self.upsert_user_read_models(rows, destination)
+                    copied += len(moving)
+                
+                if len(users) < chunk_size:
+                    break
+        return copied
+    
+    async def delete_foreign_rows(
+        self, chunk_size:int = 1000
+    ) -> int:
+        """
+        Delete users and read model rows a shard holds but doesn't own
+        (resharding, step 3, once the new layout is live). Returns the rows deleted.
+        """
+        deleted = 0
+        for shard in self.shards:
+            connection = self.connection(shard)
+            for model in SHARDED_MODELS:
+                after_id = None
+                while True:
+                    query = model.all().using_db(connection).order_by("id").limit(chunk_size)
+                    if after_id is not None:
+                        query = query.filter(id__gt=after_id)
+                    ids = await query.values_list("id", flat=True)
+                    if not ids:
+                        break
+                    after_id = ids[-1]
+                    foreign = [id for id in ids if self.ring.shard_for(id) != shard]
+                    if foreign:
+                        await model.filter(id__in=foreign).using_db(connection).delete()
+                        deleted += len(foreign)
+                    if len(ids) < chunk_size:
+                        break
+        return deleted
@@ -1,4 +1,3 @@
-from passlib.hash import bcrypt
 from app.bp.repository import EncryptRepository
 
 
@@ -11,4 +10,7 @@ class EncryptRepositoryImp(EncryptRepository):
     async def encrypt(
         self, password: str
     ) -> str:
+        # imported on first use (or startup warm-up) to keep app import fast
+        from passlib.hash import bcrypt
+        
         return bcrypt.hash(password)
\ No newline at end of file
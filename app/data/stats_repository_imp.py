@@ -0,0 +1,34 @@
+from app.bp.repository import StatsRepository
+from app.bp.domain import SignupStat
+from app.data.datasources import DataSource
+from datetime import datetime
+
+
+class StatsRepositoryImp(StatsRepository):
+    def __init__(
+        self,
+        data_source: DataSource
+    ) -> None:
+        self.data_source = data_source
+    
+    async def record_signup(
+        self, created_at:datetime
+    ) -> None:
+        await self.data_source.increment_signup_stats(created_at=created_at)
+    
+    async def get_signup_stats(
+        self,
+        granularity:str,
+        start:datetime,
+        end:datetime,
+    ) -> list[SignupStat]:
+        return await self.data_source.get_signup_stats(
+            granularity=granularity,
+            start=start,
+            end=end,
+        )
+    
+    async def get_total_signups(
+        self,
+    ) -> int:
+        return await self.data_source.get_total_signups()
@@ -2,18 +2,25 @@ from app.bp.repository import UserCreateRepository
 from app.bp.domain import User
 from uuid import UUID
 from app.data.datasources import DataSource
+from app.infrastructure.lookup_filter import EmailFilter
 
 class UserCreateRepositoryImp(UserCreateRepository):
     def __init__(
         self,
-        data_source: DataSource
+        data_source: DataSource,
+        email_filter: EmailFilter | None = None,
     ) -> None:
         self.data_source = data_source
+        self.email_filter = email_filter
 
     
     async def get_user_by_email(
         self, email:str
     ) -> User | None:
+        # an email the filter never saw is new; if it was taken after all
+        # (stale filter), create_user hits the unique index
+        if self.email_filter is not None and not self.email_filter.might_contain(email):
+            return None
         return await self.data_source.get_user_by_email(email=email)
     
     
@@ -25,12 +32,15 @@ class UserCreateRepositoryImp(UserCreateRepository):
         password_hash:str,
         display_name:str
     ) -> User:
-        return await self.data_source.create_user(
+        user = await self.data_source.create_user(
             id=id,
             name=name,
             email=email,
             password_hash=password_hash,
             display_name=display_name
         )
+        if self.email_filter is not None:
+            self.email_filter.add(email)
+        return user
         
         
\ No newline at end of file
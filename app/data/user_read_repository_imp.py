@@ -2,20 +2,37 @@ from app.bp.repository import UserReadRepository
 from app.bp.domain import UserReadModel
 from uuid import UUID
 from app.data.datasources import DataSource
+from app.infrastructure.lookup_filter import UserIdFilter
+from app.infrastructure.shared_cache import SharedUserCache
 from datetime import datetime
 
 
 class UserReadRepositoryImp(UserReadRepository):
     def __init__(
         self,
-        data_source: DataSource
+        data_source: DataSource,
+        user_id_filter: UserIdFilter | None = None,
+        user_cache: SharedUserCache | None = None,
     ) -> None:
         self.data_source = data_source
+        self.user_id_filter = user_id_filter
+        self.user_cache = user_cache
 
     async def get_user_by_id(
         self, id:UUID
     ) -> UserReadModel | None:
-        return await self.data_source.get_user_by_id(id=id)
+        # a cache hit proves the user exists, whatever this worker's filter says
+        if self.user_cache is not None:
+            cached = self.user_cache.get(id)
+            if cached is not None:
+                return UserReadModel(**cached.model_dump())
+        # ids the filter has never seen don't exist, no query needed
+        if self.user_id_filter is not None and not self.user_id_filter.might_contain(id):
+            return None
+        user = await self.data_source.get_user_by_id(id=id)
+        if user is not None and self.user_cache is not None:
+            self.user_cache.put(user)
+        return user
     
     async def project_to_read_model(
         self,
@@ -32,4 +49,14 @@ class UserReadRepositoryImp(UserReadRepository):
             display_name=display_name,
             created_at=created_at,
         )
+        if self.user_id_filter is not None:
+            self.user_id_filter.add(id)
+        if self.user_cache is not None:
+            self.user_cache.put(UserReadModel(
+                id=id,
+                name=name,
+                email=email,
+                display_name=display_name,
+                created_at=created_at,
+            ))
         
\ No newline at end of file
@@ -0,0 +1,165 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator
+
+from app.bp.repository import UserReadRepository
+from app.bp.repository import UserCreateRepository
+from app.bp.repository import EncryptRepository
+from app.bp.repository import StatsRepository
+
+from app.bp import SignupUseCase
+from app.bp import GetUserUseCase
+from app.bp import GetSignupStatsUseCase
+from app.data import UserCreateRepositoryImp
+from app.data import UserReadRepositoryImp
+from app.data import EncryptRepositoryImp
+from app.data import StatsRepositoryImp
+from app.data import DataSource
+from app.data import ShardedDataSource
+from app.infrastructure.read_model import ReadModelRebuilder
+from app.infrastructure.read_model import ReadModelDriftChecker
+from app.infrastructure.database import AdvisoryLock
+from app.infrastructure.lookup_filter import UserIdFilter
+from app.infrastructure.lookup_filter import EmailFilter
+from app.infrastructure.shared_cache import SharedMemoryTable, SharedUserCache
+from app.core.config import settings
+
+
+# (explicitly overridden names, every overridden entry) of the current context
+_overrides: ContextVar[tuple[frozenset[str], dict[str, Any]] | None] = ContextVar(
+    "container_overrides", default=None
+)
+
+
+class Container:
+    """
+    App-lifetime object graph.
+    
+    Data sources, repositories and use cases are stateless, so they are built
+    once and shared by every request instead of being rebuilt through
+    FastAPI's dependency resolution each time.
+    
+    Entries can be replaced with `override`, for the current context only
+    (the test, task or request that entered it); everything else keeps
+    seeing the app-lifetime graph.
+    """
+    
+    def __init__(self) -> None:
+        self.data_source = (
+            ShardedDataSource(list(settings.db_shards), vnodes=settings.db_shard_vnodes)
+            if settings.db_shards
+            else DataSource()
+        )
+        self.user_id_filter = UserIdFilter(
+            self.data_source,
+            capacity=settings.user_id_filter_capacity,
+            error_rate=settings.user_id_filter_error_rate,
+            **self._lookup_filter_options(),
+        )
+        self.email_filter = EmailFilter(
+            self.data_source,
+            capacity=settings.email_filter_capacity,
+            error_rate=settings.email_filter_error_rate,
+            **self._lookup_filter_options(),
+        )
+        self.user_create_repository: UserCreateRepository = UserCreateRepositoryImp(
+            self.data_source,
+            self.email_filter if settings.enable_email_filter else None,
+        )
+        self.user_cache = (
+            SharedUserCache(SharedMemoryTable(
+                settings.shared_user_cache_path,
+                slots=settings.shared_user_cache_slots,
+                slot_size=settings.shared_user_cache_slot_bytes,
+                ttl_seconds=settings.shared_user_cache_ttl_seconds,
+            ))
+            if settings.shared_user_cache_path
+            else None
+        )
+        self.user_read_repository: UserReadRepository = UserReadRepositoryImp(
+            self.data_source,
+            self.user_id_filter if settings.enable_user_id_filter else None,
+            self.user_cache,
+        )
+        self.encrypt_repository: EncryptRepository = EncryptRepositoryImp()
+        self.stats_repository: StatsRepository = StatsRepositoryImp(self.data_source)
+        self.signup_use_case: SignupUseCase
+        self.get_user_use_case: GetUserUseCase
+        self.get_signup_stats_use_case: GetSignupStatsUseCase
+        vars(self).update(self._build_use_cases())
+        self.read_model_rebuilder = ReadModelRebuilder(
+            self.data_source,
+            checkpoint_path=settings.read_model_rebuild_checkpoint_path,
+            lock=AdvisoryLock("read-model-rebuild"),
+        )
+        self.read_model_drift_checker = ReadModelDriftChecker(
+            self.data_source,
+            leaf_size=settings.read_model_drift_leaf_size,
+            grace_seconds=settings.read_model_drift_grace_seconds,
+            lock=AdvisoryLock("read-model-drift-check"),
+        )
+    
+    def __getattribute__(self, name: str) -> Any:
+        overrides = _overrides.get()
+        if overrides is not None and name in overrides[1]:
+            return overrides[1][name]
+        return super().__getattribute__(name)
+    
+    def _build_use_cases(self) -> dict[str, Any]:
+        """Use cases over the current repositories, overridden ones included."""
+        return {
+            "signup_use_case": SignupUseCase(
+                self.user_create_repository,
+                self.user_read_repository,
+                self.encrypt_repository,
+                self.stats_repository,
+            ),
+            "get_user_use_case": GetUserUseCase(self.user_read_repository),
+            "get_signup_stats_use_case": GetSignupStatsUseCase(self.stats_repository),
+        }
+    
+    @staticmethod
+    def _lookup_filter_options() -> dict:
+        return {
+            "sync_interval_seconds": settings.lookup_filter_sync_interval_seconds,
+            "sync_overlap_seconds": settings.lookup_filter_sync_overlap_seconds,
+            "max_staleness_seconds": settings.lookup_filter_max_staleness_seconds,
+            "rebuild_interval_seconds": settings.lookup_filter_rebuild_interval_seconds,
+            "chunk_size": settings.lookup_filter_chunk_size,
+        }
+    
+    @contextmanager
+    def override(self, **instances) -> Iterator["Container"]:
+        """
+        Replace objects of the graph in the current context, e.g. with fakes in tests.
+        
+        The overrides are held in a ContextVar: they apply to code running in
+        this context and in tasks started from it (requests of a test client
+        included), never to other concurrent requests, and are dropped on exit.
+        Use cases not given explicitly are rebuilt over the overridden
+        repositories.
+        
+        Example:
+            with container.override(user_read_repository=FakeUserReadRepository()):
+                client.get(f"/users/{user_id}")
+        """
+        unknown = set(instances) - set(vars(self))
+        if unknown:
+            raise AttributeError(f"Unknown container entries: {sorted(unknown)}")
+        
+        explicit, entries = _overrides.get() or (frozenset(), {})
+        explicit = explicit | instances.keys()
+        token = _overrides.set((explicit, {**entries, **instances}))
+        try:
+            use_cases = {
+                name: use_case for name, use_case in self._build_use_cases().items()
+                if name not in explicit
+            }
+            _overrides.set((explicit, {**entries, **use_cases, **instances}))
+            yield self
+        finally:
+            _overrides.reset(token)
+
+
+# Global instance
+container = Container()
@@ -1,50 +1,44 @@
 from app.bp.repository import UserReadRepository
 from app.bp.repository import UserCreateRepository
 from app.bp.repository import EncryptRepository
+from app.bp.repository import StatsRepository
 
 from app.bp import SignupUseCase
 from app.bp import GetUserUseCase
-from app.data import UserCreateRepositoryImp
-from app.data import UserReadRepositoryImp
-from app.data import EncryptRepositoryImp
-from app.data import DataSource
-from fastapi import Depends
+from app.bp import GetSignupStatsUseCase
+from .container import container
 
 
-def get_user_create_repository(
-    data_source: DataSource = Depends(DataSource),
+# Providers are async so FastAPI awaits them inline instead of running a
+# sync callable in the threadpool, and only hand out the app-lifetime
+# singletons of the container.
+
+async def get_user_create_repository(
 ) -> UserCreateRepository:
-    return UserCreateRepositoryImp(data_source)
+    return container.user_create_repository
 
-def get_user_read_repository(
-    data_source: DataSource = Depends(DataSource),
+async def get_user_read_repository(
 ) -> UserReadRepository:
-    return UserReadRepositoryImp(data_source)
+    return container.user_read_repository
 
-def get_encrypt_repository(
+async def get_encrypt_repository(
 ) -> EncryptRepository:
-    return EncryptRepositoryImp()
+    return container.encrypt_repository
+
+async def get_stats_repository(
+) -> StatsRepository:
+    return container.stats_repository
 
-def get_get_user_use_case_module(
-    user_read_repository: UserReadRepository = Depends(
-        get_user_read_repository
-    ),
+async def get_get_user_use_case_module(
 ) -> GetUserUseCase:
-    return GetUserUseCase(user_read_repository)
-
-
-def get_signup_use_case_module(
-    user_create_repository: UserCreateRepository = Depends(
-        get_user_create_repository
-    ),
-    user_read_repository: UserReadRepository = Depends(
-        get_user_read_repository
-    ),
-    encrypt_repository: EncryptRepository = Depends(
-        get_encrypt_repository
-    ),
-) -> SignupUseCase:
-    return SignupUseCase(user_create_repository, user_read_repository, encrypt_repository)
+    return container.get_user_use_case
 
 
+async def get_signup_use_case_module(
+) -> SignupUseCase:
+    return container.signup_use_case
+
 
+async def get_get_signup_stats_use_case_module(
+) -> GetSignupStatsUseCase:
+    return container.get_signup_stats_use_case
@@ -0,0 +1,3 @@
+# Imported first so multiprocess metrics mode is configured before any
+# infrastructure module (health, diagnostics, tracing) creates its own metrics.
+from . import metrics  # noqa: F401
@@ -0,0 +1,22 @@
+"""Database pool instrumentation and advisory locks."""
+
+from .advisory_lock import AdvisoryLock, advisory_lock_key
+from .pool import (
+    InstrumentedAsyncpgClient,
+    db_pool_size,
+    db_pool_in_use,
+    db_pool_waiters,
+    db_pool_max_size,
+    db_pool_acquire_seconds,
+)
+
+__all__ = [
+    "AdvisoryLock",
+    "advisory_lock_key",
+    "InstrumentedAsyncpgClient",
+    "db_pool_size",
+    "db_pool_in_use",
+    "db_pool_waiters",
+    "db_pool_max_size",
+    "db_pool_acquire_seconds",
+]
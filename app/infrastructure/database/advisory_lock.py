@@ -0,0 +1,78 @@
+"""Cluster-wide leader election over a PostgreSQL session advisory lock."""
+
+import hashlib
+
+from loguru import logger
+from tortoise import Tortoise
+
+
+def advisory_lock_key(name: str) -> int:
+    """Stable signed 64-bit lock key for a job name."""
+    return int.from_bytes(hashlib.blake2b(name.encode(), digest_size=8).digest(), "big", signed=True)
+
+
+class AdvisoryLock:
+    """
+    Session advisory lock named `name`, held on a connection taken from the
+    pool of `connection_name` until `release`.
+    
+    Every worker of every pod can `try_acquire` it; one holds it at a time,
+    and if that process dies its connection closes and the lock is free again.
+    Backends without advisory locks (SQLite, a single host in development)
+    always grant it.
+    """
+    
+    def __init__(self, name: str, connection_name: str = "default"):
+        self.name = name
+        self.key = advisory_lock_key(name)
+        self.connection_name = connection_name
+        self._wrapper = None
+        self._connection = None
+    
+    @property
+    def held(self) -> bool:
+        return self._connection is not None
+    
+    async def try_acquire(self) -> bool:
+        """Take the lock without waiting; True if this process holds it (now or already)."""
+        if self._connection is not None:
+            if await self._alive():
+                return True
+            await self.release()
+        client = Tortoise.get_connection(self.connection_name)
+        if client.capabilities.dialect != "postgres":
+            self._connection = client
+            return True
+        wrapper = client.acquire_connection()
+        connection = await wrapper.__aenter__()
+        try:
+            acquired = await connection.fetchval("SELECT pg_try_advisory_lock($1)", self.key)
+        except BaseException:
+            await wrapper.__aexit__(None, None, None)
+            raise
+        if not acquired:
+            await wrapper.__aexit__(None, None, None)
+            return False
+        self._wrapper, self._connection = wrapper, connection
+        logger.info(f"Acquired advisory lock {self.name!r}")
+        return True
+    
+    async def release(self) -> None:
+        if self._wrapper is not None:
+            try:
+                await self._connection.execute("SELECT pg_advisory_unlock($1)", self.key)
+            except Exception as e:
+                # a broken connection drops its session locks anyway
+                logger.warning(f"Failed to release advisory lock {self.name!r}: {e}")
+            await self._wrapper.__aexit__(None, None, None)
+        self._wrapper = self._connection = None
+    
+    async def _alive(self) -> bool:
+        if self._wrapper is None:
+            return True
+        try:
+            await self._connection.fetchval("SELECT 1")
+            return True
+        except Exception as e:
+            logger.warning(f"Lost the connection holding advisory lock {self.name!r}: {e}")
+            return False
@@ -0,0 +1,154 @@
+"""
+Tortoise engine for PostgreSQL: asyncpg client with acquire timeout,
+pool warm-up, connection recycling and pool saturation metrics.
+
+Selected with `"engine": "app.infrastructure.database.pool"` (see
+app.core.database.build_connection_config).
+"""
+
+import asyncio
+import time
+from typing import Any, Dict
+
+from loguru import logger
+from prometheus_client import Gauge, Histogram
+from tortoise.backends.asyncpg import AsyncpgDBClient
+from tortoise.backends.base.client import PoolConnectionWrapper
+
+
+db_pool_size = Gauge(
+    "db_pool_size",
+    "Open connections in the database pool",
+    ["connection"],
+    multiprocess_mode="livesum",
+)
+
+db_pool_in_use = Gauge(
+    "db_pool_in_use",
+    "Database pool connections currently acquired",
+    ["connection"],
+    multiprocess_mode="livesum",
+)
+
+db_pool_waiters = Gauge(
+    "db_pool_waiters",
+    "Tasks waiting to acquire a database pool connection",
+    ["connection"],
+    multiprocess_mode="livesum",
+)
+
+db_pool_max_size = Gauge(
+    "db_pool_max_size",
+    "Maximum size of the database pool",
+    ["connection"],
+    multiprocess_mode="livesum",
+)
+
+db_pool_acquire_seconds = Histogram(
+    "db_pool_acquire_seconds",
+    "Time spent waiting to acquire a database pool connection in seconds",
+    ["connection"],
+    buckets=[0.0001, 0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0],
+)
+
+
+class InstrumentedPoolConnectionWrapper(PoolConnectionWrapper):
+    """Acquires with a timeout and tracks waiters and acquire latency."""
+    
+    __slots__ = ()
+    
+    async def __aenter__(self):
+        await self.ensure_connection()
+        client = self.client
+        client.waiters += 1
+        db_pool_waiters.labels(connection=client.connection_name).inc()
+        start = time.perf_counter()
+        try:
+            self.connection = await client._pool.acquire(timeout=client.acquire_timeout)
+        finally:
+            client.waiters -= 1
+            db_pool_waiters.labels(connection=client.connection_name).dec()
+            db_pool_acquire_seconds.labels(connection=client.connection_name).observe(time.perf_counter() - start)
+        client.export_pool_stats()
+        return self.connection
+    
+    async def __aexit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        await super().__aexit__(exc_type, exc_val, exc_tb)
+        self.client.export_pool_stats()
+
+
+class InstrumentedAsyncpgClient(AsyncpgDBClient):
+    """
+    asyncpg client with pool observability.
+    
+    Extra credentials (besides Tortoise's minsize/maxsize and asyncpg's
+    statement_cache_size, timeout...):
+    - acquire_timeout: seconds to wait for a free connection (None = forever)
+    - max_lifetime: recycle every connection after this many seconds (0 = never)
+    """
+    
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.acquire_timeout = self.extra.pop("acquire_timeout", None)
+        self.max_lifetime = float(self.extra.pop("max_lifetime", 0) or 0)
+        self.waiters = 0
+        self._recycle_task: asyncio.Task | None = None
+        db_pool_max_size.labels(connection=self.connection_name).set(self.pool_maxsize)
+    
+    def acquire_connection(self) -> InstrumentedPoolConnectionWrapper:
+        return InstrumentedPoolConnectionWrapper(self, self._pool_init_lock)
+    
+    async def create_connection(self, with_db: bool) -> None:
+        await super().create_connection(with_db)
+        if with_db and self.max_lifetime > 0 and self._recycle_task is None:
+            self._recycle_task = asyncio.create_task(self._recycle_connections())
+        self.export_pool_stats()
+    
+    async def _close(self) -> None:
+        if self._recycle_task is not None:
+            self._recycle_task.cancel()
+            self._recycle_task = None
+        await super()._close()
+        self.export_pool_stats()
+    
+    async def warm_up(self) -> None:
+        """Open the pool and run a round trip on `minsize` connections concurrently."""
+        start = time.perf_counter()
+        
+        async def ping():
+            async with self.acquire_connection() as connection:
+                await connection.fetchval("SELECT 1")
+        
+        await asyncio.gather(*(ping() for _ in range(self.pool_minsize)))
+        logger.info(
+            f"Database pool warmed up: {self.pool_minsize} connections "
+            f"in {(time.perf_counter() - start) * 1000:.1f}ms"
+        )
+    
+    async def _recycle_connections(self) -> None:
+        # asyncpg has no per-connection max lifetime: expire the whole pool
+        # periodically, connections are replaced as they are released
+        while True:
+            await asyncio.sleep(self.max_lifetime)
+            await self._expire_connections()
+            logger.debug("Database pool connections expired for recycling")
+    
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Current pool size, in-use connections and waiters."""
+        size = self._pool.get_size() if self._pool else 0
+        idle = self._pool.get_idle_size() if self._pool else 0
+        return {
+            "size": size,
+            "in_use": size - idle,
+            "waiters": self.waiters,
+            "min_size": self.pool_minsize,
+            "max_size": self.pool_maxsize,
+        }
+    
+    def export_pool_stats(self) -> None:
+        stats = self.get_pool_stats()
+        db_pool_size.labels(connection=self.connection_name).set(stats["size"])
+        db_pool_in_use.labels(connection=self.connection_name).set(stats["in_use"])
+
+
+client_class = InstrumentedAsyncpgClient
@@ -0,0 +1,51 @@
+"""Runtime diagnostics: event-loop monitoring, CPU profiling and heap snapshots."""
+
+from app.core.config import settings
+
+from .loop_monitor import (
+    LoopMonitor,
+    loop_monitor,
+    event_loop_lag_seconds,
+    event_loop_blocked_total,
+)
+from .profiler import (
+    SamplingProfiler,
+    ProfilerBusyError,
+    to_collapsed,
+    to_speedscope,
+)
+from .memory import (
+    MemoryProfiler,
+    MemoryProfilerError,
+    module_of,
+    tracemalloc_traced_bytes,
+    tracemalloc_peak_bytes,
+    memory_module_bytes,
+)
+
+# Global instance
+profiler = SamplingProfiler(
+    max_seconds=settings.profiler_max_seconds,
+    max_hz=settings.profiler_max_hz,
+    max_overhead=settings.profiler_max_overhead,
+)
+memory_profiler = MemoryProfiler(max_snapshots=settings.memory_max_snapshots)
+
+__all__ = [
+    "LoopMonitor",
+    "loop_monitor",
+    "event_loop_lag_seconds",
+    "event_loop_blocked_total",
+    "SamplingProfiler",
+    "ProfilerBusyError",
+    "profiler",
+    "to_collapsed",
+    "to_speedscope",
+    "MemoryProfiler",
+    "MemoryProfilerError",
+    "memory_profiler",
+    "module_of",
+    "tracemalloc_traced_bytes",
+    "tracemalloc_peak_bytes",
+    "memory_module_bytes",
+]
@@ -0,0 +1,133 @@
+"""Event-loop lag monitor and blocking-call detector."""
+
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from typing import Any, Dict
+
+from loguru import logger
+from prometheus_client import Counter, Histogram
+
+from app.core.config import settings
+from app.core.observability import request_id_var
+
+
+event_loop_lag_seconds = Histogram(
+    "event_loop_lag_seconds",
+    "Event loop scheduling lag in seconds",
+    buckets=[0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5],
+)
+
+event_loop_blocked_total = Counter(
+    "event_loop_blocked_total",
+    "Total times a callback blocked the event loop longer than the threshold",
+)
+
+
+class LoopMonitor:
+    """
+    Measures event-loop lag and reports callbacks that block the loop.
+    
+    A heartbeat task sleeps for `interval` and records how late it wakes up.
+    A watchdog thread notices when the heartbeat stalls for longer than
+    `block_threshold` and, while the loop is still blocked, captures the stack
+    of the loop thread and the request id of the running task.
+    """
+    
+    def __init__(
+        self,
+        interval: float = settings.loop_monitor_interval_seconds,
+        block_threshold: float = settings.loop_block_threshold_seconds,
+    ):
+        self.interval = interval
+        self.block_threshold = block_threshold
+        self.last_block: Dict[str, Any] | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread_id: int | None = None
+        self._last_beat = time.monotonic()
+        self._task: asyncio.Task | None = None
+        self._watchdog: threading.Thread | None = None
+        self._stop_event = threading.Event()
+    
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+    
+    async def start(self) -> None:
+        """Start the heartbeat task and the watchdog thread on the running loop."""
+        if self.running:
+            return
+        
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stop_event.clear()
+        self._task = asyncio.create_task(self._heartbeat(), name="loop-monitor")
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+        logger.info(
+            f"Event loop monitor started (interval={self.interval}s, "
+            f"block_threshold={self.block_threshold}s)"
+        )
+    
+    async def stop(self) -> None:
+        """Stop the heartbeat task and the watchdog thread."""
+        if self._task is None:
+            return
+        
+        self._stop_event.set()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=self.interval * 2)
+        self._task = None
+        self._watchdog = None
+    
+    async def _heartbeat(self) -> None:
+        while True:
+            start = self._loop.time()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, self._loop.time() - start - self.interval)
+            event_loop_lag_seconds.observe(lag)
+            self._last_beat = time.monotonic()
+    
+    def _watch(self) -> None:
+        reported_beat = None
+        check_interval = min(self.interval, self.block_threshold) / 2
+        
+        while not self._stop_event.wait(check_interval):
+            beat = self._last_beat
+            blocked_for = time.monotonic() - beat - self.interval
+            if blocked_for >= self.block_threshold and beat != reported_beat:
+                reported_beat = beat
+                self._report_block(blocked_for)
+    
+    def _report_block(self, blocked_for: float) -> None:
+        """Capture what the loop thread is doing right now (runs in the watchdog thread)."""
+        frame = sys._current_frames().get(self._loop_thread_id)
+        stack = "".join(traceback.format_stack(frame)) if frame else "<unavailable>"
+        
+        request_id = None
+        task = asyncio.current_task(self._loop)
+        if task is not None:
+            request_id = task.get_context().get(request_id_var)
+        
+        event_loop_blocked_total.inc()
+        self.last_block = {
+            "blocked_ms": round(blocked_for * 1000, 1),
+            "request_id": request_id,
+            "stack": stack,
+        }
+        logger.bind(request_id=request_id).warning(
+            f"Event loop blocked for more than {blocked_for * 1000:.0f}ms "
+            f"(request_id={request_id}):\n{stack}"
+        )
+
+
+# Global instance
+loop_monitor = LoopMonitor()
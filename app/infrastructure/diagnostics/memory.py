@@ -0,0 +1,220 @@
+"""Heap snapshots and allocation diffs with tracemalloc."""
+
+import os
+import sys
+import threading
+import tracemalloc
+from collections import OrderedDict, defaultdict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Literal
+
+from prometheus_client import Gauge
+
+
+GroupBy = Literal["lineno", "filename", "traceback", "module"]
+
+tracemalloc_traced_bytes = Gauge(
+    "tracemalloc_traced_bytes",
+    "Memory currently traced by tracemalloc in bytes",
+    multiprocess_mode="liveall",
+)
+
+tracemalloc_peak_bytes = Gauge(
+    "tracemalloc_peak_bytes",
+    "Peak memory traced by tracemalloc in bytes",
+    multiprocess_mode="liveall",
+)
+
+memory_module_bytes = Gauge(
+    "memory_module_bytes",
+    "Memory allocated by module in the latest heap snapshot in bytes",
+    ["module"],
+    multiprocess_mode="liveall",
+)
+
+# tracemalloc's own bookkeeping and the import machinery are noise in every snapshot
+_NOISE_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+]
+
+
+class MemoryProfilerError(Exception):
+    """Raised when a heap operation is requested in the wrong tracemalloc state."""
+
+
+def module_of(filename: str) -> str:
+    """
+    Map a source file to the package that owns it.
+    
+    Third-party code is grouped by top-level package (tortoise, loguru,
+    prometheus_client...), application code by its first two components
+    (app.api, app.bp...).
+    """
+    path = os.path.abspath(filename)
+    best = ""
+    for entry in sys.path:
+        entry = os.path.abspath(entry or os.curdir)
+        if path.startswith(entry + os.sep) and len(entry) > len(best):
+            best = entry
+    if not best:
+        return os.path.basename(filename)
+    
+    parts = os.path.relpath(path, best).split(os.sep)
+    parts[-1] = os.path.splitext(parts[-1])[0]
+    if parts[-1] == "__init__" and len(parts) > 1:
+        parts.pop()
+    return ".".join(parts[:2] if parts[0] == "app" else parts[:1])
+
+
+class MemoryProfiler:
+    """Keeps a bounded set of named tracemalloc snapshots and compares them."""
+    
+    def __init__(self, max_snapshots: int):
+        self.max_snapshots = max_snapshots
+        self._snapshots: "OrderedDict[int, tuple[datetime, tracemalloc.Snapshot]]" = OrderedDict()
+        self._next_id = 1
+        self._exported_modules: set[str] = set()
+        self._lock = threading.Lock()
+    
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+    
+    def start(self, frames: int = 1) -> Dict[str, Any]:
+        """Start tracing allocations, keeping `frames` frames per traceback."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+        return self.status()
+    
+    def stop(self) -> Dict[str, Any]:
+        """Stop tracing and drop the stored snapshots."""
+        tracemalloc.stop()
+        with self._lock:
+            self._snapshots.clear()
+        return self.status()
+    
+    def status(self) -> Dict[str, Any]:
+        current, peak = tracemalloc.get_traced_memory() if self.tracing else (0, 0)
+        return {
+            "tracing": self.tracing,
+            "traceback_limit": tracemalloc.get_traceback_limit() if self.tracing else 0,
+            "traced_kb": round(current / 1024, 1),
+            "peak_kb": round(peak / 1024, 1),
+            "snapshots": [
+                {"id": snapshot_id, "taken_at": taken_at.isoformat()}
+                for snapshot_id, (taken_at, _) in self._snapshots.items()
+            ],
+        }
+    
+    def take_snapshot(self, limit: int = 20, group_by: GroupBy = "lineno") -> Dict[str, Any]:
+        """Take and store a snapshot, return its top `limit` allocation sites."""
+        snapshot = self._snapshot()
+        with self._lock:
+            snapshot_id = self._next_id
+            self._next_id += 1
+            self._snapshots[snapshot_id] = (datetime.now(timezone.utc), snapshot)
+            while len(self._snapshots) > self.max_snapshots:
+                self._snapshots.popitem(last=False)
+        
+        self._export(snapshot)
+        return {"id": snapshot_id, **self.top(snapshot, limit, group_by)}
+    
+    def top(
+        self,
+        snapshot: tracemalloc.Snapshot | None = None,
+        limit: int = 20,
+        group_by: GroupBy = "lineno",
+    ) -> Dict[str, Any]:
+        """Top allocation sites of a snapshot (a fresh one by default)."""
+        snapshot = snapshot or self._snapshot()
+        
+        if group_by == "module":
+            sizes: Dict[str, List[int]] = defaultdict(lambda: [0, 0])
+            for stat in snapshot.statistics("filename"):
+                entry = sizes[module_of(stat.traceback[0].filename)]
+                entry[0] += stat.size
+                entry[1] += stat.count
+            ranked = sorted(sizes.items(), key=lambda item: item[1][0], reverse=True)
+            sites = [
+                {"module": module, "size_kb": round(size / 1024, 1), "count": count}
+                for module, (size, count) in ranked[:limit]
+            ]
+            total = sum(size for size, _ in sizes.values())
+        else:
+            stats = snapshot.statistics(group_by)
+            sites = [
+                {
+                    "site": _format_traceback(stat.traceback, group_by),
+                    "size_kb": round(stat.size / 1024, 1),
+                    "count": stat.count,
+                }
+                for stat in stats[:limit]
+            ]
+            total = sum(stat.size for stat in stats)
+        
+        return {"group_by": group_by, "total_kb": round(total / 1024, 1), "top": sites}
+    
+    def diff(self, base_id: int, target_id: int, limit: int = 20) -> Dict[str, Any]:
+        """Allocation growth between two stored snapshots, grouped by module."""
+        base = self._get(base_id)
+        target = self._get(target_id)
+        
+        by_module: Dict[str, List[int]] = defaultdict(lambda: [0, 0, 0])
+        for stat in target.compare_to(base, "filename"):
+            entry = by_module[module_of(stat.traceback[0].filename)]
+            entry[0] += stat.size_diff
+            entry[1] += stat.count_diff
+            entry[2] += stat.size
+        
+        ranked = sorted(by_module.items(), key=lambda item: abs(item[1][0]), reverse=True)
+        return {
+            "base": base_id,
+            "target": target_id,
+            "size_diff_kb": round(sum(entry[0] for entry in by_module.values()) / 1024, 1),
+            "modules": [
+                {
+                    "module": module,
+                    "size_diff_kb": round(size_diff / 1024, 1),
+                    "count_diff": count_diff,
+                    "size_kb": round(size / 1024, 1),
+                }
+                for module, (size_diff, count_diff, size) in ranked[:limit]
+            ],
+        }
+    
+    def _get(self, snapshot_id: int) -> tracemalloc.Snapshot:
+        try:
+            return self._snapshots[snapshot_id][1]
+        except KeyError:
+            raise KeyError(f"Snapshot {snapshot_id} not found")
+    
+    def _snapshot(self) -> tracemalloc.Snapshot:
+        if not self.tracing:
+            raise MemoryProfilerError("tracemalloc is not running, start it first")
+        return tracemalloc.take_snapshot().filter_traces(_NOISE_FILTERS)
+    
+    def _export(self, snapshot: tracemalloc.Snapshot) -> None:
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc_traced_bytes.set(current)
+        tracemalloc_peak_bytes.set(peak)
+        
+        sizes: Dict[str, int] = defaultdict(int)
+        for stat in snapshot.statistics("filename"):
+            sizes[module_of(stat.traceback[0].filename)] += stat.size
+        # modules that disappeared from the heap drop to zero instead of keeping stale values
+        for module in self._exported_modules - sizes.keys():
+            memory_module_bytes.labels(module=module).set(0)
+        for module, size in sizes.items():
+            memory_module_bytes.labels(module=module).set(size)
+        self._exported_modules = set(sizes)
+
+
+def _format_traceback(traceback: tracemalloc.Traceback, group_by: GroupBy) -> str:
+    if group_by == "filename":
+        return traceback[0].filename
+    if group_by == "traceback":
+        return " <- ".join(f"{frame.filename}:{frame.lineno}" for frame in traceback)
+    return f"{traceback[0].filename}:{traceback[0].lineno}"
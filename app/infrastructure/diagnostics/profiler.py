@@ -0,0 +1,197 @@
+"""In-process sampling CPU profiler with collapsed-stack and speedscope output."""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Tuple
+
+from loguru import logger
+
+
+Frame = Tuple[str, str, int]  # (qualified name, file, first line)
+
+
+class ProfilerBusyError(Exception):
+    """Raised when a profile is requested while another one is running."""
+
+
+def _frame_key(frame) -> Frame:
+    code = frame.f_code
+    return (code.co_qualname, code.co_filename, code.co_firstlineno)
+
+
+def _thread_stack(frame) -> List[Frame]:
+    """Walk a thread's frames from the leaf up, return them root first."""
+    stack = []
+    while frame is not None:
+        stack.append(_frame_key(frame))
+        frame = frame.f_back
+    stack.reverse()
+    return stack
+
+
+def _task_stack(task: asyncio.Task) -> List[Frame]:
+    """Follow the await chain of a suspended task, root first."""
+    stack = []
+    coro = task.get_coro()
+    while coro is not None:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None)
+        if frame is not None:
+            stack.append(_frame_key(frame))
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None)
+    return stack
+
+
+class SamplingProfiler:
+    """
+    Samples the stacks of every thread (and optionally every asyncio task).
+    
+    Sampling happens in a separate thread, so the event loop keeps serving
+    traffic. The time spent sampling is measured; when it goes over
+    `max_overhead` of the elapsed time, the sampling interval is doubled so
+    the profiler's own cost stays bounded.
+    """
+    
+    def __init__(self, max_seconds: float, max_hz: int, max_overhead: float):
+        self.max_seconds = max_seconds
+        self.max_hz = max_hz
+        self.max_overhead = max_overhead
+        self._lock = threading.Lock()
+    
+    def run(
+        self,
+        seconds: float,
+        hz: int,
+        loop: asyncio.AbstractEventLoop | None = None,
+    ) -> Dict[str, Any]:
+        """
+        Profile the process for `seconds` (blocking, call it from a worker thread).
+        
+        Args:
+            seconds: Profile duration, capped at max_seconds
+            hz: Samples per second, capped at max_hz
+            loop: When given, suspended tasks of this loop are sampled too
+        
+        Returns:
+            Dict with the aggregated stacks and the profiler's own overhead
+        """
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusyError("A profile is already running")
+        
+        try:
+            return self._sample(min(seconds, self.max_seconds), min(hz, self.max_hz), loop)
+        finally:
+            self._lock.release()
+    
+    def _sample(self, seconds: float, hz: int, loop) -> Dict[str, Any]:
+        own_ident = threading.get_ident()
+        stacks: Counter = Counter()
+        interval = 1.0 / hz
+        samples = 0
+        sampling_time = 0.0
+        backoffs = 0
+        
+        logger.info(f"Profiling started: {seconds}s at {hz}Hz")
+        started = time.perf_counter()
+        deadline = started + seconds
+        
+        while (now := time.perf_counter()) < deadline:
+            thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+                root = (f"thread:{thread_names.get(ident, ident)}", "", 0)
+                stacks[(root, *_thread_stack(frame))] += 1
+            
+            if loop is not None:
+                try:
+                    tasks = asyncio.all_tasks(loop)
+                except RuntimeError:
+                    tasks = set()
+                for task in tasks:
+                    root = (f"task:{task.get_name()}", "", 0)
+                    stacks[(root, *_task_stack(task))] += 1
+            
+            samples += 1
+            sampling_time += time.perf_counter() - now
+            
+            # back off when sampling costs more than the overhead budget
+            if sampling_time > self.max_overhead * (time.perf_counter() - started):
+                interval *= 2
+                backoffs += 1
+            
+            time.sleep(max(0.0, min(interval, deadline - time.perf_counter())))
+        
+        elapsed = time.perf_counter() - started
+        logger.info(f"Profiling finished: {samples} samples in {elapsed:.2f}s")
+        
+        return {
+            "stacks": stacks,
+            "duration_seconds": elapsed,
+            "samples": samples,
+            "requested_hz": hz,
+            "effective_hz": samples / elapsed if elapsed else 0.0,
+            "overhead_seconds": sampling_time,
+            "overhead_percent": 100 * sampling_time / elapsed if elapsed else 0.0,
+            "backoffs": backoffs,
+        }
+
+
+def _frame_name(frame: Frame) -> str:
+    name, filename, line = frame
+    if not filename:
+        return name
+    return f"{name} ({os.path.basename(filename)}:{line})"
+
+
+def to_collapsed(profile: Dict[str, Any]) -> str:
+    """Render a profile as collapsed stacks (flamegraph.pl / speedscope input)."""
+    lines = [
+        f"{';'.join(_frame_name(frame) for frame in stack)} {count}"
+        for stack, count in profile["stacks"].most_common()
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def to_speedscope(profile: Dict[str, Any], name: str = "signup-service") -> Dict[str, Any]:
+    """Render a profile as a speedscope sampled profile."""
+    frames: List[Dict[str, Any]] = []
+    frame_index: Dict[Frame, int] = {}
+    samples = []
+    weights = []
+    
+    weight = profile["duration_seconds"] / profile["samples"] if profile["samples"] else 0.0
+    for stack, count in profile["stacks"].items():
+        indexes = []
+        for frame in stack:
+            if frame not in frame_index:
+                frame_index[frame] = len(frames)
+                entry = {"name": frame[0]}
+                if frame[1]:
+                    entry.update(file=frame[1], line=frame[2])
+                frames.append(entry)
+            indexes.append(frame_index[frame])
+        samples.append(indexes)
+        weights.append(count * weight)
+    
+    return {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "exporter": "signup-service sampling profiler",
+        "name": name,
+        "shared": {"frames": frames},
+        "profiles": [{
+            "type": "sampled",
+            "name": (
+                f"{name} ({profile['samples']} samples, "
+                f"overhead {profile['overhead_percent']:.2f}%)"
+            ),
+            "unit": "seconds",
+            "startValue": 0,
+            "endValue": profile["duration_seconds"],
+            "samples": samples,
+            "weights": weights,
+        }],
+    }
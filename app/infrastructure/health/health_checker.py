@@ -1,19 +1,134 @@
 """Health check service for monitoring application status."""
 
+import asyncio
 import time
-from typing import Dict, Any
-from datetime import datetime
+from typing import Awaitable, Callable, Dict, Any
+from datetime import datetime, timezone
 from tortoise import Tortoise
 from loguru import logger
 
+from app.core.config import settings
+from app.core.database import connection_names
 from .system_monitor import system_monitor
 
 
 class HealthChecker:
-    """Service for checking application health and readiness."""
+    """
+    Service for checking application health and readiness.
     
-    def __init__(self):
+    Readiness is answered from a snapshot (database + system resources)
+    refreshed by a background task every `snapshot_interval` seconds, so
+    probes never hit the database or psutil themselves. A snapshot older
+    than `snapshot_max_age` makes the instance not ready, and so does a
+    startup warm-up that hasn't finished yet or has failed.
+    """
+    
+    def __init__(
+        self,
+        snapshot_interval: float = settings.health_snapshot_interval_seconds,
+        snapshot_max_age: float = settings.health_snapshot_max_age_seconds,
+    ):
         self.start_time = time.time()
+        self.snapshot_interval = snapshot_interval
+        self.snapshot_max_age = snapshot_max_age
+        self._snapshot: Dict[str, Any] | None = None
+        self._snapshot_taken_at = 0.0
+        self._task: asyncio.Task | None = None
+        self._warm_up_task: asyncio.Task | None = None
+        self._warm_up: Dict[str, Any] | None = None
+        self.draining = False
+    
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+    
+    async def start(
+        self,
+        warm_up: Callable[[], Awaitable[Dict[str, float]]] | None = None,
+    ) -> None:
+        """
+        Take a first snapshot and keep refreshing it in the background.
+        
+        Args:
+            warm_up: Coroutine function run in the background, so the server
+                accepts probes meanwhile; the instance stays not ready until
+                it completes, or for good if it fails. Returns milliseconds
+                per step.
+        """
+        if self.running:
+            return
+        await self.refresh()
+        self._task = asyncio.create_task(self._refresh_loop(), name="health-snapshot")
+        if warm_up is not None:
+            self._warm_up = {"status": "pending"}
+            self._warm_up_task = asyncio.create_task(self._run_warm_up(warm_up), name="warm-up")
+    
+    async def _run_warm_up(self, warm_up: Callable[[], Awaitable[Dict[str, float]]]) -> None:
+        start = time.perf_counter()
+        try:
+            durations = await warm_up()
+        except Exception as e:
+            self._warm_up = {"status": "failed", "error": str(e)}
+            logger.error(f"Warm-up failed, staying not ready: {e}")
+            return
+        self._warm_up = {
+            "status": "done",
+            "duration_ms": round((time.perf_counter() - start) * 1000, 2),
+            "steps_ms": durations,
+        }
+        logger.info(f"Warm-up done: {self._warm_up}")
+    
+    async def stop(self) -> None:
+        """Stop the background refresh (and a warm-up still running)."""
+        if self._warm_up_task is not None:
+            self._warm_up_task.cancel()
+            try:
+                await self._warm_up_task
+            except asyncio.CancelledError:
+                pass
+            self._warm_up_task = None
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+    
+    def start_draining(self) -> None:
+        """Report not ready from now on so load balancers stop routing here."""
+        self.draining = True
+    
+    async def _refresh_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.snapshot_interval)
+            try:
+                await self.refresh()
+            except Exception as e:
+                # keep the last snapshot; it turns stale and fails the probe
+                logger.error(f"Health snapshot refresh failed: {e}")
+    
+    async def refresh(self) -> Dict[str, Any]:
+        """Collect database and system checks into a new snapshot."""
+        db_status = await self.check_database()
+        # psutil calls are blocking syscalls, keep them off the event loop
+        system_metrics = await asyncio.to_thread(system_monitor.get_all_metrics)
+        
+        self._snapshot = {
+            "database": db_status,
+            "pool": self.check_pool(),
+            "system": system_metrics,
+            "system_healthy": system_monitor.is_healthy(system_metrics),
+        }
+        self._snapshot_taken_at = time.monotonic()
+        return self._snapshot
+    
+    def get_snapshot_age(self) -> float | None:
+        """Seconds since the last snapshot, None if none was taken yet."""
+        if self._snapshot is None:
+            return None
+        return time.monotonic() - self._snapshot_taken_at
     
     def get_uptime(self) -> float:
         """Get application uptime in seconds."""
@@ -21,25 +136,75 @@ class HealthChecker:
     
     async def check_database(self) -> Dict[str, Any]:
         """
-        Check database connectivity and health.
+        Check connectivity of every database connection (default and shards).
+        
+        A single failing connection makes the database unhealthy: requests
+        for the users of a dead shard would fail.
         
         Returns:
-            Dict with status and message
+            Dict with status, message and the status of each connection
         """
-        try:
-            conn = Tortoise.get_connection("default")
-            await conn.execute_query("SELECT 1")
-            
-            return {
-                "status": "healthy",
-                "message": "Database connection is active"
-            }
-        except Exception as e:
-            logger.error(f"Database health check failed: {e}")
+        names = connection_names()
+        results = await asyncio.gather(
+            *(self._ping(name) for name in names), return_exceptions=True
+        )
+        failures = {
+            name: str(result) for name, result in zip(names, results)
+            if isinstance(result, Exception)
+        }
+        connections = {
+            name: "unhealthy" if name in failures else "healthy" for name in names
+        }
+        if failures:
+            logger.error(f"Database health check failed: {failures}")
             return {
                 "status": "unhealthy",
-                "message": f"Database connection failed: {str(e)}"
+                "message": "Database connection failed: " + "; ".join(
+                    f"{name}: {error}" for name, error in failures.items()
+                ),
+                "connections": connections,
             }
+        return {
+            "status": "healthy",
+            "message": "Database connection is active",
+            "connections": connections,
+        }
+    
+    @staticmethod
+    async def _ping(name: str) -> None:
+        await Tortoise.get_connection(name).execute_query("SELECT 1")
+    
+    def check_pool(self) -> Dict[str, Any] | None:
+        """
+        Check pool saturation of every database connection.
+        
+        A pool is saturated when every connection is in use and at least
+        DB_POOL_SATURATION_WAITERS tasks are queued for one.
+        
+        Returns:
+            Dict with the overall status and the stats of each pool, None
+            when no connection is pooled (non-pooled backends)
+        """
+        pools = {}
+        for name in connection_names():
+            try:
+                conn = Tortoise.get_connection(name)
+            except Exception:
+                continue
+            if not hasattr(conn, "get_pool_stats"):
+                continue
+            stats = conn.get_pool_stats()
+            saturated = (
+                stats["in_use"] >= stats["max_size"] and
+                stats["waiters"] >= settings.db_pool_saturation_waiters
+            )
+            if saturated:
+                logger.warning(f"Database pool {name} saturated: {stats}")
+            pools[name] = {"status": "saturated" if saturated else "healthy", **stats}
+        if not pools:
+            return None
+        saturated = any(pool["status"] == "saturated" for pool in pools.values())
+        return {"status": "saturated" if saturated else "healthy", "connections": pools}
     
     async def get_health_status(self) -> Dict[str, Any]:
         """
@@ -64,9 +229,12 @@ class HealthChecker:
         """
         Get detailed readiness status (readiness probe).
         
-        Checks:
+        Checks (from the latest snapshot):
         - Database connectivity
         - System resources (CPU, memory, disk)
+        - Snapshot freshness
+        - Startup warm-up completion
+        - Not draining for shutdown
         
         Returns 'ready' if all checks pass, 'not_ready' otherwise.
         Used by load balancers to determine if traffic should be routed.
@@ -74,14 +242,40 @@ class HealthChecker:
         Returns:
             Dict with readiness status and detailed checks
         """
-        db_status = await self.check_database()
-        system_metrics = system_monitor.get_all_metrics()
+        warming_up = self._warm_up is not None and self._warm_up["status"] != "done"
+        # without the background task (e.g. tests), refresh on demand
+        if not self.running and not warming_up:
+            await self.refresh()
+        
+        snapshot = self._snapshot
+        snapshot_age = self.get_snapshot_age()
         uptime = self.get_uptime()
         
+        if snapshot is None:
+            return {
+                "status": "not_ready",
+                "service": "signup-service",
+                "version": "1.0.0",
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "uptime_seconds": round(uptime, 2),
+                "snapshot_age_seconds": None,
+                "checks": {"warm_up": self._warm_up},
+            }
+        
         # Determine overall readiness
+        is_fresh = snapshot_age is not None and snapshot_age <= self.snapshot_max_age
+        if not is_fresh:
+            logger.warning(f"Health snapshot is stale: age={snapshot_age}s")
+        pool_saturated = (
+            snapshot["pool"] is not None and snapshot["pool"]["status"] == "saturated"
+        )
         is_ready = (
-            db_status["status"] == "healthy" and
-            system_monitor.is_healthy()
+            not warming_up and
+            not self.draining and
+            is_fresh and
+            snapshot["database"]["status"] == "healthy" and
+            snapshot["system_healthy"] and
+            not (pool_saturated and settings.health_fail_on_pool_saturation)
         )
         
         return {
@@ -90,9 +284,13 @@ class HealthChecker:
             "version": "1.0.0",
             "timestamp": datetime.utcnow().isoformat(),
             "uptime_seconds": round(uptime, 2),
+            "snapshot_age_seconds": round(snapshot_age, 3) if snapshot_age is not None else None,
+            "draining": self.draining,
             "checks": {
-                "database": db_status,
-                "system": system_metrics
+                "database": snapshot["database"],
+                "pool": snapshot["pool"],
+                "system": snapshot["system"],
+                "warm_up": self._warm_up
             },
             "endpoints": {
                 "signup": "POST /signup",
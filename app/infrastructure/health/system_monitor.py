@@ -1,7 +1,6 @@
-"""System resource monitoring using psutil."""
+"""System resource monitoring using psutil (imported on first use)."""
 
 from typing import Dict, Any
-import psutil
 from loguru import logger
 
 
@@ -9,10 +8,17 @@ class SystemMonitor:
     """Monitor system resources (CPU, memory, disk)."""
     
     def get_cpu_metrics(self) -> Dict[str, Any]:
-        """Get CPU usage metrics."""
+        """
+        Get CPU usage metrics.
+        
+        Non-blocking: usage is measured since the previous call, so it is
+        meaningful when sampled periodically (see HealthChecker).
+        """
+        import psutil
+        
         try:
             return {
-                "usage_percent": round(psutil.cpu_percent(interval=0.1), 2),
+                "usage_percent": round(psutil.cpu_percent(interval=None), 2),
                 "count": psutil.cpu_count()
             }
         except Exception as e:
@@ -21,6 +27,8 @@ class SystemMonitor:
     
     def get_memory_metrics(self) -> Dict[str, Any]:
         """Get memory usage metrics."""
+        import psutil
+        
         try:
             memory = psutil.virtual_memory()
             return {
@@ -34,6 +42,8 @@ class SystemMonitor:
     
     def get_disk_metrics(self) -> Dict[str, Any]:
         """Get disk usage metrics."""
+        import psutil
+        
         try:
             disk = psutil.disk_usage('/')
             return {
@@ -53,17 +63,21 @@ class SystemMonitor:
             "disk": self.get_disk_metrics()
         }
     
-    def is_healthy(self) -> bool:
+    def is_healthy(self, metrics: Dict[str, Any] | None = None) -> bool:
         """
         Check if system resources are healthy.
         
+        Args:
+            metrics: Result of get_all_metrics(), fetched if not given
+        
         Returns False if:
         - Memory usage > 95%
         - Disk usage > 95%
         """
         try:
-            memory = self.get_memory_metrics()
-            disk = self.get_disk_metrics()
+            metrics = metrics or self.get_all_metrics()
+            memory = metrics["memory"]
+            disk = metrics["disk"]
             
             if "error" in memory or "error" in disk:
                 return True  # Don't fail on metric errors
@@ -0,0 +1,21 @@
+"""In-memory existence filters that spare the database lookups of absent keys."""
+
+from .bloom import BloomFilter
+from .read_model_filter import (
+    ReadModelFilter,
+    lookup_filter_size_bytes,
+    lookup_filter_false_positive_rate,
+)
+from .user_id_filter import UserIdFilter, user_lookups_short_circuited_total
+from .email_filter import EmailFilter, signup_duplicate_checks_skipped_total
+
+__all__ = [
+    "BloomFilter",
+    "ReadModelFilter",
+    "lookup_filter_size_bytes",
+    "lookup_filter_false_positive_rate",
+    "UserIdFilter",
+    "user_lookups_short_circuited_total",
+    "EmailFilter",
+    "signup_duplicate_checks_skipped_total",
+]
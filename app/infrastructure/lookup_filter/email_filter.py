@@ -0,0 +1,29 @@
+"""Probabilistic set of taken emails: signups with a new email skip the duplicate lookup."""
+
+from prometheus_client import Counter
+
+from .read_model_filter import ReadModelFilter
+
+
+signup_duplicate_checks_skipped_total = Counter(
+    "signup_duplicate_checks_skipped_total",
+    "Signups whose email the filter never saw, inserted without the duplicate lookup",
+)
+
+
+class EmailFilter(ReadModelFilter):
+    """
+    Normalized emails of `users_read_model`; the write path adds each new user.
+    
+    A stale negative is harmless: the insert hits the unique index and the
+    signup still fails as a duplicate, only after hashing the password.
+    """
+    
+    name = "email"
+    field = "email"
+    negatives_total = signup_duplicate_checks_skipped_total
+    
+    @staticmethod
+    def key(value: str) -> bytes:
+        # normalized, so every spelling the unique index could match shares a key
+        return value.strip().lower().encode()
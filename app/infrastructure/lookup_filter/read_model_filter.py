@@ -0,0 +1,206 @@
+"""Negative lookup filters over a column of users_read_model."""
+
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, timezone
+
+from loguru import logger
+from prometheus_client import Counter, Gauge
+
+from .bloom import BloomFilter
+
+
+lookup_filter_size_bytes = Gauge(
+    "lookup_filter_size_bytes",
+    "Memory used by a lookup filter bit array",
+    ["filter"],
+    multiprocess_mode="liveall",
+)
+
+lookup_filter_false_positive_rate = Gauge(
+    "lookup_filter_false_positive_rate",
+    "Estimated false positive rate of a lookup filter at its current fill",
+    ["filter"],
+    multiprocess_mode="liveall",
+)
+
+
+class ReadModelFilter(ABC):
+    """
+    Bloom filter over one column of `users_read_model` that answers
+    "definitely absent" without the database.
+    
+    Subclasses set `field`, the column, and `key`, its encoding as filter
+    bytes, and may count the negatives in `negatives_total`.
+    
+    `build` streams the column of every row in id-keyset pages into a new
+    filter; the write path `add`s each new user. Each worker only writes its
+    own signups, so `sync` also pulls the values created since the previous
+    sync (minus `sync_overlap_seconds` for clock skew and in-flight
+    projections), every `sync_interval_seconds` once `start`ed.
+    
+    `might_contain` says yes for everything until the filter is built and
+    while its last sync is older than `max_staleness_seconds`, so a stalled
+    sync degrades to plain database reads rather than wrong answers. A value
+    written by another worker can still be reported absent by this one for
+    up to one sync interval, unless the subclass, like `UserIdFilter`, only
+    trusts misses on values older than the sync watermark.
+    
+    Rows written with an old `created_at` (read model rebuilds, drift
+    repairs) are not seen by `sync`, so the filter is also rebuilt every
+    `rebuild_interval_seconds`; when it fills past twice its target error
+    rate, the next sync rebuilds it with twice the capacity.
+    """
+    
+    name: str
+    field: str
+    negatives_total: Counter | None = None
+    
+    def __init__(
+        self,
+        data_source,
+        capacity: int = 1_000_000,
+        error_rate: float = 0.01,
+        sync_interval_seconds: float = 1.0,
+        sync_overlap_seconds: float = 10.0,
+        max_staleness_seconds: float = 5.0,
+        rebuild_interval_seconds: float = 900.0,
+        chunk_size: int = 10_000,
+    ):
+        self.data_source = data_source
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_interval_seconds = sync_interval_seconds
+        self.sync_overlap_seconds = sync_overlap_seconds
+        self.max_staleness_seconds = max_staleness_seconds
+        self.rebuild_interval_seconds = rebuild_interval_seconds
+        self.chunk_size = chunk_size
+        self._filter: BloomFilter | None = None
+        self._building: BloomFilter | None = None
+        self._watermark: datetime | None = None
+        self._synced_at = 0.0
+        self._built_at = 0.0
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+    
+    @property
+    def ready(self) -> bool:
+        """Built and synced recently enough for its negatives to be trusted."""
+        return (
+            self._filter is not None
+            and time.monotonic() - self._synced_at <= self.max_staleness_seconds
+        )
+    
+    @staticmethod
+    @abstractmethod
+    def key(value) -> bytes:
+        """The filter bytes of a column value."""
+    
+    def might_contain(self, value) -> bool:
+        if not self.ready:
+            return True
+        if self.key(value) in self._filter:
+            return True
+        if self.negatives_total is not None:
+            self.negatives_total.inc()
+        return False
+    
+    def add(self, value) -> None:
+        key = self.key(value)
+        for bloom in (self._filter, self._building):
+            if bloom is not None:
+                bloom.add(key)
+    
+    async def build(self, capacity: int | None = None) -> int:
+        """Load the column of every read model row into a new filter and swap it in. Returns the rows read."""
+        async with self._lock:
+            start = time.perf_counter()
+            synced_at = time.monotonic()
+            watermark = self._now() - timedelta(seconds=self.sync_overlap_seconds)
+            bloom = BloomFilter(capacity or self.capacity, self.error_rate)
+            # values written while the pages stream in go to both filters
+            self._building = bloom
+            try:
+                rows = 0
+                after_id = None
+                while True:
+                    page = await self.data_source.get_read_model_page(after_id, self.chunk_size, self.field)
+                    for row in page:
+                        bloom.add(self.key(row[self.field]))
+                    rows += len(page)
+                    if len(page) < self.chunk_size:
+                        break
+                    after_id = page[-1]["id"]
+            finally:
+                self._building = None
+            self.capacity = bloom.capacity
+            self._filter = bloom
+            self._watermark = watermark
+            self._synced_at = self._built_at = synced_at
+            self._export()
+            logger.info(
+                f"{self.name} filter built: {rows} rows, {bloom.size_bytes} bytes, "
+                f"in {time.perf_counter() - start:.2f}s"
+            )
+            return rows
+    
+    async def sync(self) -> int:
+        """Add the values created since the previous sync. Returns the rows read."""
+        if self._filter is None or time.monotonic() - self._built_at > self.rebuild_interval_seconds:
+            return await self.build()
+        if self._filter.false_positive_rate > 2 * self.error_rate:
+            logger.info(f"{self.name} filter holds ~{self._filter.approximate_count} keys, rebuilding it larger")
+            return await self.build(capacity=2 * max(self.capacity, self._filter.approximate_count))
+        async with self._lock:
+            synced_at = time.monotonic()
+            watermark = self._now() - timedelta(seconds=self.sync_overlap_seconds)
+            values = await self.data_source.get_read_model_values_since(self._watermark, self.field)
+            for value in values:
+                self._filter.add(self.key(value))
+            self._watermark = watermark
+            self._synced_at = synced_at
+            self._export()
+            return len(values)
+    
+    def status(self) -> dict:
+        bloom = self._filter
+        return {
+            "ready": self.ready,
+            "size_bytes": bloom.size_bytes if bloom else 0,
+            "capacity": self.capacity,
+            "approximate_count": bloom.approximate_count if bloom else 0,
+            "false_positive_rate": bloom.false_positive_rate if bloom else None,
+            "seconds_since_sync": round(time.monotonic() - self._synced_at, 3) if bloom else None,
+        }
+    
+    def start(self) -> None:
+        """Build the filter, then keep it in sync, in the background."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._sync_loop(), name=f"{self.name}-filter-sync")
+    
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+    
+    async def _sync_loop(self) -> None:
+        while True:
+            try:
+                await self.sync()
+            except Exception as e:
+                logger.error(f"{self.name} filter sync failed: {e}")
+            await asyncio.sleep(self.sync_interval_seconds)
+    
+    def _export(self) -> None:
+        lookup_filter_size_bytes.labels(filter=self.name).set(self._filter.size_bytes)
+        lookup_filter_false_positive_rate.labels(filter=self.name).set(self._filter.false_positive_rate)
+    
+    @staticmethod
+    def _now() -> datetime:
+        return datetime.now(timezone.utc)
@@ -3,17 +3,67 @@
 from .prometheus import (
     http_requests_total,
     http_request_duration_seconds,
+    probe_requests_total,
+    probe_request_duration_seconds,
     signup_requests_total,
     signup_duplicates_total,
     idempotency_hits_total,
+    build_multiprocess_registry,
+    cleanup_dead_workers,
+    mark_worker_dead,
+    render_metrics,
     get_metrics_data,
 )
+from .stage_timer import (
+    request_stage_duration_seconds,
+    StageRecorder,
+    begin_request_stages,
+    get_request_stages,
+    start_stage,
+    stop_stage,
+    track_stage,
+)
+from .query_tracker import (
+    db_query_duration_seconds,
+    db_queries_per_request,
+    db_time_per_request_seconds,
+    db_query_budget_exceeded_total,
+    QueryStats,
+    fingerprint_query,
+    begin_request_queries,
+    get_request_queries,
+    finish_request_queries,
+    instrument_connection,
+)
 
 __all__ = [
     "http_requests_total",
     "http_request_duration_seconds",
+    "probe_requests_total",
+    "probe_request_duration_seconds",
     "signup_requests_total",
     "signup_duplicates_total",
     "idempotency_hits_total",
+    "build_multiprocess_registry",
+    "cleanup_dead_workers",
+    "mark_worker_dead",
+    "render_metrics",
     "get_metrics_data",
+    "request_stage_duration_seconds",
+    "StageRecorder",
+    "begin_request_stages",
+    "get_request_stages",
+    "start_stage",
+    "stop_stage",
+    "track_stage",
+    "db_query_duration_seconds",
+    "db_queries_per_request",
+    "db_time_per_request_seconds",
+    "db_query_budget_exceeded_total",
+    "QueryStats",
+    "fingerprint_query",
+    "begin_request_queries",
+    "get_request_queries",
+    "finish_request_queries",
+    "instrument_connection",
 ]
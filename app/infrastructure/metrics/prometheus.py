@@ -1,8 +1,33 @@
 """Prometheus metrics definitions for the application."""
 
-from prometheus_client import Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST
+import glob
+import gzip
+import os
+import time
+
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    multiprocess,
+    values,
+)
+from prometheus_client.exposition import choose_encoder, gzip_accepted
 from fastapi import Response
 
+from app.core.config import settings
+
+
+# Multiprocess mode: each worker writes its samples to mmap files in a shared
+# directory and /metrics aggregates them. Must be enabled before any metric is created.
+MULTIPROC_DIR = settings.prometheus_multiproc_dir
+
+if MULTIPROC_DIR:
+    os.makedirs(MULTIPROC_DIR, exist_ok=True)
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = MULTIPROC_DIR
+    values.ValueClass = values.get_value_class()
+
 
 # HTTP Metrics
 http_requests_total = Counter(
@@ -19,6 +44,21 @@ http_request_duration_seconds = Histogram(
 )
 
 
+# Probe Metrics (served by the fast path, outside the HTTP metrics above)
+probe_requests_total = Counter(
+    "probe_requests_total",
+    "Total probe and metrics requests served by the fast path",
+    ["path", "status"],
+)
+
+probe_request_duration_seconds = Histogram(
+    "probe_request_duration_seconds",
+    "Fast path probe latency in seconds",
+    ["path"],
+    buckets=[0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.05, 0.25],
+)
+
+
 # Business Metrics - Signup
 signup_requests_total = Counter(
     "signup_requests_total",
@@ -40,14 +80,119 @@ idempotency_hits_total = Counter(
 )
 
 
-def get_metrics_data() -> Response:
+def build_multiprocess_registry(path: str) -> CollectorRegistry:
+    """
+    Build a registry that aggregates the samples written by all worker processes.
+    
+    Args:
+        path: Shared multiprocess directory
+    
+    Returns:
+        Registry with a MultiProcessCollector attached
+    """
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry, path=path)
+    return registry
+
+
+def cleanup_dead_workers(path: str | None = MULTIPROC_DIR) -> list[int]:
     """
-    Generate Prometheus metrics in text format.
+    Remove live-gauge files left behind by worker processes that no longer exist.
+    
+    Counter and histogram files are kept so totals stay monotonic after a
+    worker restart.
+    
+    Args:
+        path: Shared multiprocess directory
     
     Returns:
-        Response with metrics in Prometheus format
+        PIDs of the dead workers that were cleaned up
     """
-    return Response(
-        content=generate_latest(),
-        media_type=CONTENT_TYPE_LATEST
-    )
+    if not path:
+        return []
+    
+    import psutil
+    
+    pids = set()
+    for file in glob.glob(os.path.join(path, "*.db")):
+        pid = os.path.basename(file)[:-3].rsplit("_", 1)[-1]
+        if pid.isdigit():
+            pids.add(int(pid))
+    
+    dead_pids = sorted(pid for pid in pids if not psutil.pid_exists(pid))
+    for pid in dead_pids:
+        multiprocess.mark_process_dead(pid, path)
+    return dead_pids
+
+
+def mark_worker_dead(path: str | None = MULTIPROC_DIR) -> None:
+    """Mark the current worker as dead on shutdown (multiprocess mode only)."""
+    if path:
+        multiprocess.mark_process_dead(os.getpid(), path)
+
+
+def render_metrics(
+    registry: CollectorRegistry,
+    accept: str | None = None,
+    accept_encoding: str | None = None,
+) -> tuple[bytes, dict[str, str]]:
+    """
+    Render a registry in the format negotiated with the scraper.
+    
+    OpenMetrics is used when requested through the Accept header (required
+    for exemplars), the classic text format otherwise. The payload is gzipped
+    when the scraper accepts it. Both headers are listed in Vary, so caches
+    between the scraper and the app keep one payload per format.
+    
+    Args:
+        registry: Registry to render
+        accept: Accept header of the scrape request
+        accept_encoding: Accept-Encoding header of the scrape request
+    
+    Returns:
+        Tuple of (payload, response headers)
+    """
+    encoder, content_type = choose_encoder(accept or "")
+    content = encoder(registry)
+    headers = {"Content-Type": content_type, "Vary": "Accept, Accept-Encoding"}
+    
+    if gzip_accepted(accept_encoding or ""):
+        content = gzip.compress(content, compresslevel=settings.metrics_gzip_level)
+        headers["Content-Encoding"] = "gzip"
+    
+    return content, headers
+
+
+# Rendered snapshots reused for metrics_cache_ttl_seconds, keyed by negotiated format
+_snapshot_cache: dict[tuple[str, bool], tuple[float, bytes, dict[str, str]]] = {}
+
+
+def get_metrics_data(accept: str | None = None, accept_encoding: str | None = None) -> Response:
+    """
+    Generate Prometheus metrics in the negotiated format.
+    
+    In multiprocess mode the samples of every worker are aggregated. When
+    metrics_cache_ttl_seconds is set, a rendered snapshot is reused for that
+    long instead of walking the registry on every scrape.
+    
+    Args:
+        accept: Accept header of the scrape request
+        accept_encoding: Accept-Encoding header of the scrape request
+    
+    Returns:
+        Response with metrics in Prometheus or OpenMetrics format
+    """
+    ttl = settings.metrics_cache_ttl_seconds
+    cache_key = (choose_encoder(accept or "")[1], gzip_accepted(accept_encoding or ""))
+    now = time.monotonic()
+    
+    cached = _snapshot_cache.get(cache_key) if ttl > 0 else None
+    if cached and cached[0] > now:
+        _, content, headers = cached
+    else:
+        registry = build_multiprocess_registry(MULTIPROC_DIR) if MULTIPROC_DIR else REGISTRY
+        content, headers = render_metrics(registry, accept, accept_encoding)
+        if ttl > 0:
+            _snapshot_cache[cache_key] = (now + ttl, content, headers)
+    
+    return Response(content=content, headers=headers)
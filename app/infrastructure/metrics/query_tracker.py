@@ -0,0 +1,157 @@
+"""Database query instrumentation: per-request query count/time and slow-query log."""
+
+import re
+import time
+from contextvars import ContextVar
+from functools import wraps
+
+from loguru import logger
+from prometheus_client import Counter, Histogram
+
+from app.core.config import settings
+
+
+db_query_duration_seconds = Histogram(
+    "db_query_duration_seconds",
+    "Database statement latency in seconds by query fingerprint",
+    ["fingerprint"],
+    buckets=[0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0],
+)
+
+db_queries_per_request = Histogram(
+    "db_queries_per_request",
+    "Number of database statements issued per request",
+    ["endpoint"],
+    buckets=[0, 1, 2, 3, 4, 5, 7, 10, 15, 25, 50],
+)
+
+db_time_per_request_seconds = Histogram(
+    "db_time_per_request_seconds",
+    "Total database time per request in seconds",
+    ["endpoint"],
+    buckets=[0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0],
+)
+
+db_query_budget_exceeded_total = Counter(
+    "db_query_budget_exceeded_total",
+    "Total requests that issued more statements than the configured query budget",
+    ["endpoint"],
+)
+
+INSTRUMENTED_METHODS = (
+    "execute_query",
+    "execute_query_dict",
+    "execute_insert",
+    "execute_many",
+    "execute_script",
+)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"\$\d+|\?")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint_query(query: str) -> str:
+    """
+    Normalize a statement so that executions differing only in values share a label.
+    
+    Literals and placeholders become `?`, IN-lists collapse to `(?+)`.
+    """
+    fingerprint = _STRING_LITERAL.sub("?", query)
+    fingerprint = _PLACEHOLDER.sub("?", fingerprint)
+    fingerprint = _NUMBER_LITERAL.sub("?", fingerprint)
+    fingerprint = _PLACEHOLDER_LIST.sub("(?+)", fingerprint)
+    return _WHITESPACE.sub(" ", fingerprint).strip()[:200]
+
+
+class QueryStats:
+    """Statements issued by a single request."""
+    
+    def __init__(self):
+        self.count = 0
+        self.total_time = 0.0
+    
+    def record(self, duration: float) -> None:
+        self.count += 1
+        self.total_time += duration
+
+
+# Set by RequestContextMiddleware; shared (by reference) with the downstream tasks
+_current_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+# Guards against counting a statement twice when one execute_* calls another
+_in_query: ContextVar[bool] = ContextVar("in_query", default=False)
+
+
+def begin_request_queries() -> QueryStats:
+    """Start counting statements for the current request."""
+    stats = QueryStats()
+    _current_stats.set(stats)
+    return stats
+
+
+def get_request_queries() -> QueryStats | None:
+    """Get the query stats of the current request, if any."""
+    return _current_stats.get()
+
+
+def finish_request_queries(stats: QueryStats, endpoint: str) -> None:
+    """Export the per-request query stats and flag requests over the query budget."""
+    db_queries_per_request.labels(endpoint=endpoint).observe(stats.count)
+    db_time_per_request_seconds.labels(endpoint=endpoint).observe(stats.total_time)
+    
+    if stats.count > settings.db_query_budget:
+        db_query_budget_exceeded_total.labels(endpoint=endpoint).inc()
+        logger.warning(
+            f"Query budget exceeded: {endpoint} issued {stats.count} statements "
+            f"(budget={settings.db_query_budget}) db_time={stats.total_time * 1000:.1f}ms"
+        )
+
+
+def _record_query(query: str, duration: float) -> None:
+    db_query_duration_seconds.labels(fingerprint=fingerprint_query(query)).observe(duration)
+    
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(duration)
+    
+    duration_ms = duration * 1000
+    if duration_ms >= settings.db_slow_query_threshold_ms:
+        # request_id is attached by the request logging context
+        logger.warning(f"Slow query ({duration_ms:.1f}ms): {fingerprint_query(query)}")
+
+
+def _instrument(method):
+    @wraps(method)
+    async def instrumented(query, *args, **kwargs):
+        if _in_query.get():
+            return await method(query, *args, **kwargs)
+        
+        token = _in_query.set(True)
+        start = time.perf_counter()
+        try:
+            return await method(query, *args, **kwargs)
+        finally:
+            _record_query(query, time.perf_counter() - start)
+            _in_query.reset(token)
+    
+    instrumented.__instrumented__ = True
+    return instrumented
+
+
+def instrument_connection(connection) -> None:
+    """
+    Hook query counting and timing into a Tortoise connection.
+    
+    Wraps the execute_* methods of the given client instance; calling it
+    twice on the same connection is a no-op.
+    
+    Args:
+        connection: Tortoise client, e.g. Tortoise.get_connection("default")
+    """
+    for name in INSTRUMENTED_METHODS:
+        method = getattr(connection, name, None)
+        if method is None or getattr(method, "__instrumented__", False):
+            continue
+        setattr(connection, name, _instrument(method))
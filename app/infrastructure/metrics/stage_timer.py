@@ -0,0 +1,100 @@
+"""Per-stage request latency breakdown (stage histogram + Server-Timing)."""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from prometheus_client import Histogram
+
+
+request_stage_duration_seconds = Histogram(
+    "request_stage_duration_seconds",
+    "Latency of the main stages of a request in seconds",
+    ["stage"],
+    buckets=[0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0],
+)
+
+
+class StageRecorder:
+    """Collects the stage durations of a single request."""
+    
+    def __init__(self):
+        self.durations: dict[str, float] = {}
+        self._started: dict[str, float] = {}
+    
+    def start(self, stage: str) -> None:
+        """Mark the beginning of a stage that ends in another call frame."""
+        self._started[stage] = time.perf_counter()
+    
+    def stop(self, stage: str) -> None:
+        """Close a stage opened with start(); ignored if it was never started."""
+        started = self._started.pop(stage, None)
+        if started is not None:
+            self.record(stage, time.perf_counter() - started)
+    
+    def record(self, stage: str, duration: float) -> None:
+        """Add a stage duration and feed the stage histogram."""
+        self.durations[stage] = self.durations.get(stage, 0.0) + duration
+        request_stage_duration_seconds.labels(stage=stage).observe(duration)
+    
+    def server_timing(self, total: float | None = None) -> str:
+        """Render the durations as a Server-Timing header value (milliseconds)."""
+        durations = dict(self.durations)
+        if total is not None:
+            durations["total"] = total
+        return ", ".join(
+            f"{stage};dur={duration * 1000:.2f}" for stage, duration in durations.items()
+        )
+
+
+# Set by RequestContextMiddleware; shared (by reference) with the downstream tasks
+_current_recorder: ContextVar[StageRecorder | None] = ContextVar("stage_recorder", default=None)
+
+
+def begin_request_stages() -> StageRecorder:
+    """Start collecting stages for the current request."""
+    recorder = StageRecorder()
+    _current_recorder.set(recorder)
+    return recorder
+
+
+def get_request_stages() -> StageRecorder | None:
+    """Get the stage recorder of the current request, if any."""
+    return _current_recorder.get()
+
+
+def start_stage(stage: str) -> None:
+    """Mark the beginning of a stage of the current request."""
+    recorder = _current_recorder.get()
+    if recorder is not None:
+        recorder.start(stage)
+
+
+def stop_stage(stage: str) -> None:
+    """Close a stage of the current request opened with start_stage()."""
+    recorder = _current_recorder.get()
+    if recorder is not None:
+        recorder.stop(stage)
+
+
+@contextmanager
+def track_stage(stage: str):
+    """
+    Time a block of code as a request stage.
+    
+    The duration always feeds the stage histogram, and is added to the
+    current request's breakdown when one is being collected.
+    
+    Args:
+        stage: Stage name (label value)
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - start
+        recorder = _current_recorder.get()
+        if recorder is not None:
+            recorder.record(stage, duration)
+        else:
+            request_stage_duration_seconds.labels(stage=stage).observe(duration)
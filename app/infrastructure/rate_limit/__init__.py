@@ -0,0 +1,25 @@
+"""Token bucket rate limiting with pluggable storage."""
+
+from .backends import (
+    RateLimitBackend,
+    InMemoryTokenBucketBackend,
+    RedisTokenBucketBackend,
+    build_rate_limit_backend,
+)
+from .limiter import (
+    rate_limit_rejections_total,
+    rate_limit_backend_errors_total,
+    RateLimiter,
+    normalize_email,
+)
+
+__all__ = [
+    "RateLimitBackend",
+    "InMemoryTokenBucketBackend",
+    "RedisTokenBucketBackend",
+    "build_rate_limit_backend",
+    "rate_limit_rejections_total",
+    "rate_limit_backend_errors_total",
+    "RateLimiter",
+    "normalize_email",
+]
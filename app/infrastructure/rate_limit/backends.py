@@ -0,0 +1,143 @@
+"""Token bucket storage backends for the rate limiter."""
+
+import hashlib
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+
+class RateLimitBackend(ABC):
+    """Stores token buckets; implementations must update a bucket atomically."""
+    
+    @abstractmethod
+    async def acquire(self, key: str, rate: float, capacity: float, cost: float = 1.0) -> float:
+        """
+        Take `cost` tokens from the bucket of `key`.
+        
+        Args:
+            key: Bucket key, e.g. "ip:10.0.0.1"
+            rate: Refill rate in tokens per second
+            capacity: Bucket size (burst)
+            cost: Tokens taken by this request
+        
+        Returns:
+            0 if allowed, else seconds until enough tokens are available
+        """
+
+
+class InMemoryTokenBucketBackend(RateLimitBackend):
+    """
+    Per-process token buckets in sharded LRU maps.
+    
+    Keys are spread over `shards` ordered dicts, each holding at most
+    `max_keys / shards` buckets; the least recently used bucket of a shard is
+    evicted when it is full, which bounds memory under key-spraying attacks.
+    A bucket is (tokens, last refill time).
+    """
+    
+    def __init__(self, shards: int = 16, max_keys: int = 100_000):
+        self._shards: list[OrderedDict[str, tuple[float, float]]] = [OrderedDict() for _ in range(shards)]
+        self._max_keys_per_shard = max(1, max_keys // shards)
+    
+    def _shard(self, key: str) -> OrderedDict:
+        # stable across processes, unlike hash() of str
+        digest = hashlib.blake2b(key.encode(), digest_size=8).digest()
+        return self._shards[int.from_bytes(digest) % len(self._shards)]
+    
+    async def acquire(self, key: str, rate: float, capacity: float, cost: float = 1.0) -> float:
+        now = time.monotonic()
+        shard = self._shard(key)
+        
+        tokens, last = shard.pop(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - last) * rate)
+        if tokens >= cost:
+            tokens -= cost
+            retry_after = 0.0
+        else:
+            retry_after = (cost - tokens) / rate
+        
+        shard[key] = (tokens, now)
+        if len(shard) > self._max_keys_per_shard:
+            shard.popitem(last=False)
+        return retry_after
+    
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
+
+
+# Token bucket as a Redis hash {tokens, ts}, refilled with the server clock so
+# pods with skewed clocks share consistent buckets. Returns the retry-after as
+# a string, Redis would truncate a Lua number to an integer.
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local retry_after = 0
+if tokens >= cost then
+    tokens = tokens - cost
+else
+    retry_after = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return tostring(retry_after)
+"""
+
+
+class RedisTokenBucketBackend(RateLimitBackend):
+    """
+    Token buckets in Redis, shared by every pod.
+    
+    Each acquire is a single Lua script call, so the read-refill-write of a
+    bucket is atomic. `client` is a `redis.asyncio.Redis` (or anything with
+    the same `eval`).
+    """
+    
+    def __init__(self, client, prefix: str = "ratelimit:"):
+        self._client = client
+        self._prefix = prefix
+    
+    async def acquire(self, key: str, rate: float, capacity: float, cost: float = 1.0) -> float:
+        result = await self._client.eval(
+            TOKEN_BUCKET_SCRIPT, 1, self._prefix + key, rate, capacity, cost
+        )
+        return float(result.decode() if isinstance(result, bytes) else result)
+
+
+BACKENDS = ("memory", "redis")
+
+
+def build_rate_limit_backend(
+    name: str,
+    redis_url: str | None = None,
+    shards: int = 16,
+    max_keys: int = 100_000,
+) -> RateLimitBackend:
+    """
+    Build the configured rate limit backend.
+    
+    The redis client is an optional dependency, imported only when selected.
+    
+    Args:
+        name: One of BACKENDS
+        redis_url: Redis URL for the redis backend
+        shards: Shard count for the memory backend
+        max_keys: Bucket limit for the memory backend
+    """
+    if name == "memory":
+        return InMemoryTokenBucketBackend(shards=shards, max_keys=max_keys)
+    if name == "redis":
+        if not redis_url:
+            raise ValueError("rate_limit_redis_url is required for the redis backend")
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError("The redis rate limit backend requires the redis package") from e
+        return RedisTokenBucketBackend(redis.from_url(redis_url))
+    raise ValueError(f"Unknown rate limit backend {name!r}, expected one of {BACKENDS}")
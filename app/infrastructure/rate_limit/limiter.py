@@ -0,0 +1,73 @@
+"""Rate limiter applying per-key token bucket rules."""
+
+from loguru import logger
+from prometheus_client import Counter
+
+from .backends import RateLimitBackend
+
+
+rate_limit_rejections_total = Counter(
+    "rate_limit_rejections_total",
+    "Requests rejected by the rate limiter",
+    ["endpoint", "key_type"],
+)
+
+rate_limit_backend_errors_total = Counter(
+    "rate_limit_backend_errors_total",
+    "Rate limit checks skipped because the backend failed",
+)
+
+
+def normalize_email(email: str) -> str:
+    """
+    Normalize an email so trivial variants share a bucket.
+    
+    Lowercases, strips whitespace and drops a "+tag" in the local part
+    ("John.Doe+1@X.com" -> "john.doe@x.com").
+    """
+    local, _, domain = email.strip().lower().rpartition("@")
+    if not local:
+        return domain
+    return f"{local.split('+', 1)[0]}@{domain}"
+
+
+class RateLimiter:
+    """
+    Checks a request against one token bucket per key type.
+    
+    `rules` maps a key type (e.g. "ip", "email") to (rate per second, burst).
+    Every bucket of the request is charged; the request is rejected when any
+    of them is empty. If the backend fails the request is let through, so a
+    shared store outage does not take signup down.
+    """
+    
+    def __init__(self, backend: RateLimitBackend, rules: dict[str, tuple[float, float]]):
+        self.backend = backend
+        self.rules = rules
+    
+    async def check(self, endpoint: str, keys: dict[str, str]) -> float:
+        """
+        Charge the buckets of a request.
+        
+        Args:
+            endpoint: Endpoint path, used as bucket namespace and metrics label
+            keys: Key type -> key value, e.g. {"ip": "10.0.0.1"}
+        
+        Returns:
+            0 if allowed, else seconds the client should wait (Retry-After)
+        """
+        retry_after = 0.0
+        for key_type, value in keys.items():
+            if key_type not in self.rules or not value:
+                continue
+            rate, burst = self.rules[key_type]
+            try:
+                wait = await self.backend.acquire(f"{endpoint}:{key_type}:{value}", rate, burst)
+            except Exception as e:
+                logger.error(f"Rate limit backend failed, allowing request: {e}")
+                rate_limit_backend_errors_total.inc()
+                return 0.0
+            if wait > 0:
+                rate_limit_rejections_total.labels(endpoint=endpoint, key_type=key_type).inc()
+                retry_after = max(retry_after, wait)
+        return retry_after
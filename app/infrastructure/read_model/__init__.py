@@ -0,0 +1,21 @@
+"""Read model maintenance."""
+
+from .rebuild import (
+    ReadModelRebuilder,
+    RebuildAlreadyRunningError,
+    read_model_rebuild_rows_total,
+)
+from .drift import (
+    ReadModelDriftChecker,
+    read_model_divergent_rows,
+    read_model_repaired_rows_total,
+)
+
+__all__ = [
+    "ReadModelRebuilder",
+    "RebuildAlreadyRunningError",
+    "read_model_rebuild_rows_total",
+    "ReadModelDriftChecker",
+    "read_model_divergent_rows",
+    "read_model_repaired_rows_total",
+]
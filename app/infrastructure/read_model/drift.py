@@ -0,0 +1,202 @@
+"""Drift detection and repair between users and users_read_model."""
+
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+
+from loguru import logger
+from prometheus_client import Counter, Gauge
+
+from app.bp.domain import User, UserReadModel
+from app.infrastructure.database import AdvisoryLock
+
+
+read_model_divergent_rows = Gauge(
+    "read_model_divergent_rows",
+    "Rows that differ between users and users_read_model in the last drift check",
+    multiprocess_mode="mostrecent",
+)
+
+read_model_repaired_rows_total = Counter(
+    "read_model_repaired_rows_total",
+    "Read model rows inserted, updated or deleted by the drift repair",
+)
+
+HEX_DIGITS = 32
+
+
+class ReadModelDriftChecker:
+    """
+    Finds and repairs rows that differ between `users` and `users_read_model`.
+    
+    Both tables are summarized as a Merkle-style tree over id tails: each
+    bucket holds the row count and a digest of the rows whose id ends with
+    its hex digits, and a bucket's children are the 16 tails one digit
+    longer. Starting from the root, only buckets whose (count, digest) differ
+    between the tables are split further; once a mismatching bucket holds at
+    most `leaf_size` rows its rows are compared one by one. The tail is
+    random in both uuid4 and uuid7 ids (whose leading digits are the signup
+    time), so buckets stay balanced and a handful of bad rows costs one
+    aggregate per level plus a few small reads, instead of a join over both
+    tables.
+    
+    Users created in the last `grace_seconds` are not reported missing: their
+    signup may still be writing the projection.
+    
+    With sharded users, the check also finds `user_email_index` entries whose
+    user was never written (the signup died in between) and, when repairing,
+    deletes them so the email can sign up again. Entries are only checked
+    once they are older than `grace_seconds`, and each check only reads the
+    entries created since the previous one.
+    
+    The periodic check (`start`) runs in every worker, but only the one
+    holding `lock` checks; the others retry the lock every interval and take
+    over when its holder dies. Checks run on demand (`check`) ignore it.
+    """
+    
+    def __init__(
+        self,
+        data_source,
+        leaf_size: int = 256,
+        grace_seconds: float = 60.0,
+        lock: AdvisoryLock | None = None,
+    ):
+        self.data_source = data_source
+        self.leaf_size = leaf_size
+        self.grace_seconds = grace_seconds
+        self.lock = lock
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+        self._email_index_checked_until: datetime | None = None
+        self.last_report: dict | None = None
+    
+    async def check(self, repair: bool = True) -> dict:
+        """Compare both tables, optionally repair the read model, and export the drift."""
+        async with self._lock:
+            start = time.perf_counter()
+            leaves, buckets_compared = await self._mismatching_leaves()
+            
+            cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.grace_seconds)
+            missing, stale, orphaned = [], [], []
+            for suffix in leaves:
+                m, s, o = await self._diff_leaf(suffix, cutoff)
+                missing += m
+                stale += s
+                orphaned += o
+            
+            divergent = len(missing) + len(stale) + len(orphaned)
+            read_model_divergent_rows.set(divergent)
+            
+            repaired = 0
+            if repair and divergent:
+                repaired = await self._repair(missing + stale, orphaned)
+            
+            orphaned_email_index = await self.data_source.get_orphan_email_index_entries(
+                self._email_index_checked_until, cutoff
+            )
+            if repair and orphaned_email_index:
+                await self.data_source.delete_email_index_entries(orphaned_email_index)
+                logger.info(f"Deleted {len(orphaned_email_index)} orphaned email index entries")
+                repaired += len(orphaned_email_index)
+            if repair or not orphaned_email_index:
+                self._email_index_checked_until = cutoff
+            
+            self.last_report = {
+                "divergent_rows": divergent,
+                "missing": len(missing),
+                "stale": len(stale),
+                "orphaned": len(orphaned),
+                "orphaned_email_index": len(orphaned_email_index),
+                "repaired": repaired,
+                "buckets_compared": buckets_compared,
+                "leaves": len(leaves),
+                "duration_ms": round((time.perf_counter() - start) * 1000, 3),
+                "checked_at": datetime.now(timezone.utc).isoformat(),
+            }
+            if divergent or orphaned_email_index:
+                logger.warning(f"Read model drift: {self.last_report}")
+            return self.last_report
+    
+    async def _mismatching_leaves(self) -> tuple[list[str], int]:
+        leaves = []
+        buckets_compared = 0
+        pending = [""]
+        while pending:
+            suffix = pending.pop()
+            length = len(suffix) + 1
+            users, read_models = await asyncio.gather(
+                self.data_source.get_id_bucket_digests(User, suffix, length),
+                self.data_source.get_id_bucket_digests(UserReadModel, suffix, length),
+            )
+            buckets_compared += len(users.keys() | read_models.keys())
+            for bucket in users.keys() | read_models.keys():
+                expected, actual = users.get(bucket), read_models.get(bucket)
+                if expected == actual:
+                    continue
+                rows = max(expected[0] if expected else 0, actual[0] if actual else 0)
+                if rows <= self.leaf_size or len(bucket) == HEX_DIGITS:
+                    leaves.append(bucket)
+                else:
+                    pending.append(bucket)
+        return leaves, buckets_compared
+    
+    async def _diff_leaf(self, suffix: str, cutoff: datetime) -> tuple[list[dict], list[dict], list[UUID]]:
+        users = {
+            row["id"]: row
+            for row in await self.data_source.get_rows_with_id_suffix(User, suffix)
+        }
+        read_models = {
+            row["id"]: row
+            for row in await self.data_source.get_rows_with_id_suffix(UserReadModel, suffix)
+        }
+        
+        missing = [
+            user for id, user in users.items()
+            if id not in read_models and user["created_at"] < cutoff
+        ]
+        stale = [
+            user for id, user in users.items()
+            if id in read_models and read_models[id] != user
+        ]
+        orphaned = [id for id in read_models if id not in users]
+        return missing, stale, orphaned
+    
+    async def _repair(self, upserts: list[dict], deletes: list[UUID]) -> int:
+        if upserts:
+            await self.data_source.upsert_user_read_models(upserts)
+        if deletes:
+            await self.data_source.delete_user_read_models(deletes)
+        repaired = len(upserts) + len(deletes)
+        read_model_repaired_rows_total.inc(repaired)
+        logger.info(f"Read model drift repaired: {len(upserts)} upserted, {len(deletes)} deleted")
+        return repaired
+    
+    def start(self, interval_seconds: float, repair: bool = True) -> None:
+        """Run a check every `interval_seconds` in the background."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(
+                self._check_loop(interval_seconds, repair), name="read-model-drift-check"
+            )
+    
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        if self.lock is not None:
+            await self.lock.release()
+    
+    async def _check_loop(self, interval_seconds: float, repair: bool) -> None:
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                if self.lock is not None and not await self.lock.try_acquire():
+                    continue
+                await self.check(repair=repair)
+            except Exception as e:
+                logger.error(f"Read model drift check failed: {e}")
@@ -0,0 +1,297 @@
+"""Rebuild of users_read_model from users."""
+
+import asyncio
+import json
+import os
+import time
+from datetime import datetime, timezone
+from uuid import UUID
+
+from loguru import logger
+from prometheus_client import Counter
+
+from app.infrastructure.database import AdvisoryLock
+
+
+read_model_rebuild_rows_total = Counter(
+    "read_model_rebuild_rows_total",
+    "Users projected to the read model by the rebuild",
+)
+
+
+class RebuildAlreadyRunningError(Exception):
+    """A rebuild is already in progress in this process, or in the one holding the lock."""
+
+
+class ReadModelRebuilder:
+    """
+    Streams `users` in id order and bulk-upserts them into `users_read_model`.
+    
+    A reader fetches keyset-ordered chunks (`id > last id`, so no OFFSET scans)
+    and hands them to `workers` concurrent writers through a bounded queue.
+    Chunks can finish out of order; the checkpoint only moves past a chunk
+    once every chunk before it is written, so a resumed rebuild never skips
+    rows (it may rewrite a few, which upserts make harmless).
+    
+    Users signing up while the rebuild runs are projected by the signup
+    itself, so rows behind the cursor are not revisited.
+    
+    `max_rows_per_second` throttles the reader to protect the primary.
+    
+    One rebuild runs at a time: per process, and across the workers, pods and
+    the CLI when `lock` is set, since they would all advance the same
+    checkpoint.
+    """
+    
+    def __init__(
+        self,
+        data_source,
+        checkpoint_path: str | None = None,
+        progress_interval_seconds: float = 5.0,
+        lock: AdvisoryLock | None = None,
+    ):
+        self.data_source = data_source
+        self.checkpoint_path = checkpoint_path
+        self.progress_interval_seconds = progress_interval_seconds
+        self.lock = lock
+        self._running = False
+        self._task: asyncio.Task | None = None
+        self._status: dict = {"state": "idle"}
+    
+    @property
+    def running(self) -> bool:
+        return self._running
+    
+    def status(self) -> dict:
+        """State of the current (or last) rebuild with its rows/sec."""
+        status = dict(self._status)
+        if self._status["state"] == "running":
+            status.update(self._rates())
+        return status
+    
+    def load_checkpoint(self) -> dict | None:
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return None
+        with open(self.checkpoint_path) as f:
+            return json.load(f)
+    
+    def save_checkpoint(self, last_id: UUID, rows: int) -> None:
+        if not self.checkpoint_path:
+            return
+        checkpoint = {
+            "last_id": str(last_id),
+            "rows": rows,
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+        }
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(checkpoint, f)
+        os.replace(tmp_path, self.checkpoint_path)
+    
+    def clear_checkpoint(self) -> None:
+        if self.checkpoint_path and os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+    
+    async def run(
+        self,
+        chunk_size: int = 1000,
+        workers: int = 4,
+        max_rows_per_second: float | None = None,
+        reset: bool = False,
+    ) -> dict:
+        """
+        Rebuild the read model and return the final status.
+        
+        Resumes from the checkpoint unless `reset` is set. On failure or
+        cancellation the checkpoint is kept; on success it is removed.
+        
+        Raises:
+            RebuildAlreadyRunningError: A rebuild is already running
+        """
+        await self._claim()
+        try:
+            return await self._run(chunk_size, workers, max_rows_per_second, reset)
+        finally:
+            await self._unclaim()
+    
+    async def _run(
+        self,
+        chunk_size: int = 1000,
+        workers: int = 4,
+        max_rows_per_second: float | None = None,
+        reset: bool = False,
+    ) -> dict:
+        checkpoint = None if reset else self.load_checkpoint()
+        if reset:
+            self.clear_checkpoint()
+        after_id = UUID(checkpoint["last_id"]) if checkpoint else None
+        
+        self._started = time.monotonic()
+        self._last_report = self._started
+        self._status = {
+            "state": "running",
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "resumed_from": str(after_id) if after_id else None,
+            "chunk_size": chunk_size,
+            "workers": workers,
+            "max_rows_per_second": max_rows_per_second,
+            "rows": 0,
+            "total_rows": checkpoint["rows"] if checkpoint else 0,
+            "checkpoint": str(after_id) if after_id else None,
+        }
+        logger.info(
+            f"Read model rebuild started (chunk_size={chunk_size}, workers={workers}, "
+            f"max_rows_per_second={max_rows_per_second}, resume_after={after_id})"
+        )
+        
+        try:
+            await self._rebuild(after_id, chunk_size, workers, max_rows_per_second)
+        except asyncio.CancelledError:
+            self._finish("cancelled")
+            raise
+        except Exception as e:
+            self._finish("failed", error=str(e))
+            raise
+        
+        self.clear_checkpoint()
+        self._finish("completed")
+        return self.status()
+    
+    async def start(self, **options) -> dict:
+        """
+        Run the rebuild as a background task (admin endpoint).
+        
+        Raises:
+            RebuildAlreadyRunningError: A rebuild is already running
+        """
+        await self._claim()
+        
+        async def run_in_background():
+            try:
+                await self._run(**options)
+            except asyncio.CancelledError:
+                pass
+            except Exception as e:
+                logger.error(f"Read model rebuild failed: {e}")
+            finally:
+                await self._unclaim()
+        
+        self._status = {"state": "starting"}
+        self._task = asyncio.create_task(run_in_background())
+        return self.status()
+    
+    async def _claim(self) -> None:
+        # the flag is set before the first await, so concurrent calls can't both pass
+        if self._running:
+            raise RebuildAlreadyRunningError("A read model rebuild is already running")
+        self._running = True
+        try:
+            acquired = self.lock is None or await self.lock.try_acquire()
+        except BaseException:
+            self._running = False
+            raise
+        if not acquired:
+            self._running = False
+            raise RebuildAlreadyRunningError("A read model rebuild is already running in another process")
+    
+    async def _unclaim(self) -> None:
+        try:
+            if self.lock is not None:
+                await self.lock.release()
+        finally:
+            self._running = False
+    
+    async def cancel(self) -> dict:
+        """Cancel the background rebuild; it resumes from its checkpoint next time."""
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        return self.status()
+    
+    async def _rebuild(
+        self,
+        after_id: UUID | None,
+        chunk_size: int,
+        workers: int,
+        max_rows_per_second: float | None,
+    ) -> None:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=workers)
+        written: dict[int, tuple[UUID, int]] = {}
+        next_to_commit = 0
+        
+        async def read():
+            cursor = after_id
+            seq = 0
+            rows_read = 0
+            while True:
+                users = await self.data_source.get_users_page(cursor, chunk_size)
+                if not users:
+                    break
+                cursor = users[-1]["id"]
+                await queue.put((seq, users))
+                seq += 1
+                rows_read += len(users)
+                if max_rows_per_second:
+                    ahead = rows_read / max_rows_per_second - (time.monotonic() - self._started)
+                    if ahead > 0:
+                        await asyncio.sleep(ahead)
+                if len(users) < chunk_size:
+                    break
+            for _ in range(workers):
+                await queue.put(None)
+        
+        async def write():
+            nonlocal next_to_commit
+            while (item := await queue.get()) is not None:
+                seq, users = item
+                await self.data_source.upsert_user_read_models(users)
+                read_model_rebuild_rows_total.inc(len(users))
+                self._status["rows"] += len(users)
+                written[seq] = (users[-1]["id"], len(users))
+                
+                # advance the checkpoint over the contiguous written chunks
+                while next_to_commit in written:
+                    last_id, rows = written.pop(next_to_commit)
+                    next_to_commit += 1
+                    self._status["total_rows"] += rows
+                    self._status["checkpoint"] = str(last_id)
+                    self.save_checkpoint(last_id, self._status["total_rows"])
+                self._report_progress()
+        
+        try:
+            async with asyncio.TaskGroup() as group:
+                group.create_task(read())
+                for _ in range(workers):
+                    group.create_task(write())
+        except ExceptionGroup as e:
+            raise e.exceptions[0]
+    
+    def _rates(self) -> dict:
+        elapsed = time.monotonic() - self._started
+        return {
+            "elapsed_seconds": round(elapsed, 3),
+            "rows_per_second": round(self._status["rows"] / elapsed, 1) if elapsed > 0 else 0.0,
+        }
+    
+    def _report_progress(self) -> None:
+        now = time.monotonic()
+        if now - self._last_report < self.progress_interval_seconds:
+            return
+        self._last_report = now
+        rates = self._rates()
+        logger.info(
+            f"Read model rebuild: {self._status['rows']} rows "
+            f"({rates['rows_per_second']} rows/s), checkpoint {self._status['checkpoint']}"
+        )
+    
+    def _finish(self, state: str, error: str | None = None) -> None:
+        self._status.update(self._rates(), state=state)
+        if error:
+            self._status["error"] = error
+        logger.info(
+            f"Read model rebuild {state}: {self._status['rows']} rows "
+            f"({self._status['rows_per_second']} rows/s)" + (f": {error}" if error else "")
+        )
@@ -0,0 +1,8 @@
+"""Hash sharding of user data."""
+
+from .ring import HashRing, ring_hash
+
+__all__ = [
+    "HashRing",
+    "ring_hash",
+]
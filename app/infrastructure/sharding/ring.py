@@ -0,0 +1,47 @@
+"""Consistent hash ring mapping user ids to shards."""
+
+import bisect
+import hashlib
+from uuid import UUID
+
+
+def ring_hash(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """
+    Consistent hashing over shard names.
+    
+    Every shard owns `vnodes` points on a 64-bit ring and a key belongs to the
+    first point at or after its hash. Adding a shard to N existing ones moves
+    about 1/(N+1) of the keys, all of them to the new shard.
+    
+    Shards are identified by name, not DSN, so credentials can change without
+    moving data.
+    """
+    
+    def __init__(self, shards: list[str], vnodes: int = 128):
+        if not shards:
+            raise ValueError("A hash ring needs at least one shard")
+        self.shards = sorted(shards)
+        self.vnodes = vnodes
+        points = sorted(
+            (ring_hash(f"{shard}#{i}"), shard)
+            for shard in self.shards
+            for i in range(vnodes)
+        )
+        self._hashes = [point for point, _ in points]
+        self._owners = [shard for _, shard in points]
+    
+    def shard_for(self, key: UUID | str) -> str:
+        """Shard owning `key` (a user id)."""
+        index = bisect.bisect_left(self._hashes, ring_hash(str(key)))
+        return self._owners[index % len(self._owners)]
+    
+    def group(self, keys) -> dict[str, list]:
+        """Split keys by owning shard."""
+        groups: dict[str, list] = {}
+        for key in keys:
+            groups.setdefault(self.shard_for(key), []).append(key)
+        return groups
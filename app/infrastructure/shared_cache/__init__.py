@@ -0,0 +1,10 @@
+"""Caches shared by the workers of a host through a memory-mapped file."""
+
+from .table import SharedMemoryTable
+from .user_cache import SharedUserCache, shared_user_cache_requests_total
+
+__all__ = [
+    "SharedMemoryTable",
+    "SharedUserCache",
+    "shared_user_cache_requests_total",
+]
@@ -0,0 +1,132 @@
+"""Fixed-size hash table in a memory-mapped file, shared by the workers of a host."""
+
+import fcntl
+import hashlib
+import mmap
+import os
+import struct
+import time
+import zlib
+
+
+MAGIC = b"SHMTABLE"
+HEADER = struct.Struct("<8sIIII")  # magic, version, slots, slot size, ways
+HEADER_SIZE = 64
+VERSION = 2
+
+# seq (odd while a write is in progress), written_at, crc32 of key + payload, length, padding, key
+SLOT_HEADER = struct.Struct("<IIIHH16s")
+SEQ = struct.Struct("<I")
+
+
+class SharedMemoryTable:
+    """
+    Set-associative hash table of 16-byte keys to byte payloads in a shared mmap.
+    
+    The file (best on tmpfs, e.g. /dev/shm) holds `slots` fixed-size slots
+    grouped in buckets of `ways`; a key can only live in its bucket, and a
+    full bucket overwrites its oldest entry. Every worker maps the same file,
+    so an entry written by one is a hit for all and the memory is paid once
+    per host.
+    
+    Writers take a POSIX record lock on their bucket's byte range (striped
+    locks: writers of different buckets never wait for each other) and bump
+    the slot's sequence number to odd before and to even after the write.
+    Readers take no lock: a slot whose sequence changed during the copy, or
+    whose crc32 doesn't match, is a miss rather than a torn payload.
+    
+    Entries older than `ttl_seconds` are misses, which bounds how long a
+    row changed behind the write path (drift repair, rebuild) stays stale.
+    """
+    
+    def __init__(self, path: str, slots: int = 65536, slot_size: int = 512, ways: int = 4, ttl_seconds: float = 300.0):
+        if slots % ways or slot_size <= SLOT_HEADER.size:
+            raise ValueError("slots must be a multiple of ways and slot_size larger than the slot header")
+        self.path = path
+        self.slots = slots
+        self.slot_size = slot_size
+        self.ways = ways
+        self.ttl_seconds = ttl_seconds
+        self.buckets = slots // ways
+        self.max_payload = slot_size - SLOT_HEADER.size
+        self.size = HEADER_SIZE + slots * slot_size
+        
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            self._init_file()
+            self._mm = mmap.mmap(self._fd, self.size)
+        except Exception:
+            os.close(self._fd)
+            raise
+    
+    def _init_file(self) -> None:
+        # the first worker to get here sizes the file and writes the header
+        fcntl.lockf(self._fd, fcntl.LOCK_EX, HEADER_SIZE, 0)
+        try:
+            if os.fstat(self._fd).st_size == 0:
+                os.ftruncate(self._fd, self.size)
+                os.pwrite(self._fd, HEADER.pack(MAGIC, VERSION, self.slots, self.slot_size, self.ways), 0)
+                return
+            header = HEADER.unpack(os.pread(self._fd, HEADER.size, 0))
+            if header != (MAGIC, VERSION, self.slots, self.slot_size, self.ways):
+                raise ValueError(
+                    f"{self.path} holds a table of another layout {header[1:]}; remove it or change the path"
+                )
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN, HEADER_SIZE, 0)
+    
+    def _bucket_offset(self, key: bytes) -> int:
+        bucket = int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little") % self.buckets
+        return HEADER_SIZE + bucket * self.ways * self.slot_size
+    
+    def get(self, key: bytes) -> bytes | None:
+        mm = self._mm
+        offset = self._bucket_offset(key)
+        for way in range(self.ways):
+            slot = offset + way * self.slot_size
+            seq, written_at, crc, length, _, slot_key = SLOT_HEADER.unpack_from(mm, slot)
+            if slot_key != key or seq & 1 or not written_at:
+                continue
+            start = slot + SLOT_HEADER.size
+            payload = mm[start:start + length]
+            if SEQ.unpack_from(mm, slot)[0] != seq or zlib.crc32(payload, zlib.crc32(key)) != crc:
+                return None
+            if time.time() - written_at > self.ttl_seconds:
+                return None
+            return payload
+        return None
+    
+    def put(self, key: bytes, payload: bytes) -> bool:
+        """Store `payload` under `key`; False if it doesn't fit in a slot."""
+        if len(payload) > self.max_payload:
+            return False
+        mm = self._mm
+        offset = self._bucket_offset(key)
+        bucket_size = self.ways * self.slot_size
+        fcntl.lockf(self._fd, fcntl.LOCK_EX, bucket_size, offset)
+        try:
+            target, oldest = offset, None
+            for way in range(self.ways):
+                slot = offset + way * self.slot_size
+                _, written_at, _, _, _, slot_key = SLOT_HEADER.unpack_from(mm, slot)
+                if slot_key == key or not written_at:
+                    target = slot
+                    break
+                if oldest is None or written_at < oldest:
+                    target, oldest = slot, written_at
+            
+            seq = SEQ.unpack_from(mm, target)[0]
+            writing, written = (seq + 1) & 0xFFFFFFFF, (seq + 2) & 0xFFFFFFFF
+            SEQ.pack_into(mm, target, writing)
+            start = target + SLOT_HEADER.size
+            mm[start:start + len(payload)] = payload
+            crc = zlib.crc32(payload, zlib.crc32(key))
+            SLOT_HEADER.pack_into(mm, target, writing, int(time.time()), crc, len(payload), 0, key)
+            SEQ.pack_into(mm, target, written)
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN, bucket_size, offset)
+        return True
+    
+    def close(self) -> None:
+        self._mm.close()
+        os.close(self._fd)
@@ -0,0 +1,38 @@
+"""Cross-worker cache of GET /users/{id} payloads."""
+
+from uuid import UUID
+
+from prometheus_client import Counter
+
+from app.schemas.user import UserResponse
+from .table import SharedMemoryTable
+
+
+shared_user_cache_requests_total = Counter(
+    "shared_user_cache_requests_total",
+    "Shared user cache lookups and writes by result",
+    ["result"],  # hit, miss, stored, oversized
+)
+
+
+class SharedUserCache:
+    """Serialized `UserResponse` payloads keyed by user id in a `SharedMemoryTable`."""
+    
+    def __init__(self, table: SharedMemoryTable):
+        self.table = table
+    
+    def get(self, id: UUID) -> UserResponse | None:
+        payload = self.table.get(id.bytes)
+        if payload is None:
+            shared_user_cache_requests_total.labels(result="miss").inc()
+            return None
+        shared_user_cache_requests_total.labels(result="hit").inc()
+        return UserResponse.model_validate_json(payload)
+    
+    def put(self, user) -> None:
+        """Cache `user`, anything with the `UserResponse` attributes (read model row, response)."""
+        response = UserResponse.model_validate(user)
+        if self.table.put(response.id.bytes, response.model_dump_json().encode()):
+            shared_user_cache_requests_total.labels(result="stored").inc()
+        else:
+            shared_user_cache_requests_total.labels(result="oversized").inc()
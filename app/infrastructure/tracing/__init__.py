@@ -0,0 +1,27 @@
+"""Trace sampling and export."""
+
+from .sampling import (
+    trace_spans_dropped_total,
+    trace_tail_decisions_total,
+    TokenBucket,
+    RouteRateLimitingSampler,
+    TailSamplingSpanProcessor,
+    build_sampler,
+)
+from .export import (
+    CountingSpanExporter,
+    CountingBatchSpanProcessor,
+    build_span_exporter,
+)
+
+__all__ = [
+    "trace_spans_dropped_total",
+    "trace_tail_decisions_total",
+    "TokenBucket",
+    "RouteRateLimitingSampler",
+    "TailSamplingSpanProcessor",
+    "build_sampler",
+    "CountingSpanExporter",
+    "CountingBatchSpanProcessor",
+    "build_span_exporter",
+]
@@ -0,0 +1,145 @@
+"""Span exporter selection and drop accounting."""
+
+import threading
+from typing import Callable, Sequence
+
+from opentelemetry.sdk.trace import ReadableSpan
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, SpanExporter, SpanExportResult
+
+from .sampling import trace_spans_dropped_total
+
+
+EXPORTERS = ("jaeger", "otlp-http", "otlp-grpc")
+
+
+class CountingSpanExporter(SpanExporter):
+    """Wraps an exporter and counts the spans of failed exports as dropped."""
+    
+    def __init__(self, delegate: SpanExporter):
+        self._delegate = delegate
+    
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        try:
+            result = self._delegate.export(spans)
+        except Exception:
+            trace_spans_dropped_total.labels(reason="export_failed").inc(len(spans))
+            raise
+        if result != SpanExportResult.SUCCESS:
+            trace_spans_dropped_total.labels(reason="export_failed").inc(len(spans))
+        return result
+    
+    def shutdown(self) -> None:
+        self._delegate.shutdown()
+    
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return self._delegate.force_flush(timeout_millis)
+
+
+class _DequeuingSpanExporter(SpanExporter):
+    """Reports every batch taken off the processor queue before exporting it."""
+    
+    def __init__(self, delegate: SpanExporter, on_dequeue: Callable[[int], None]):
+        self._delegate = delegate
+        self._on_dequeue = on_dequeue
+    
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        self._on_dequeue(len(spans))
+        return self._delegate.export(spans)
+    
+    def shutdown(self) -> None:
+        self._delegate.shutdown()
+    
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return self._delegate.force_flush(timeout_millis)
+
+
+class CountingBatchSpanProcessor(BatchSpanProcessor):
+    """
+    BatchSpanProcessor that counts the spans it drops because its queue is full.
+    
+    The queue is a bounded deque that silently discards the oldest span when
+    full, so its depth is tracked here: sampled spans ended minus spans handed
+    to the exporter.
+    """
+    
+    def __init__(self, span_exporter: SpanExporter, max_queue_size: int = 2048, **kwargs):
+        # the SDK default; passed explicitly so the tracked depth has the same bound
+        self.max_queue_size = max_queue_size
+        self._queued = 0
+        self._lock = threading.Lock()
+        self._done = False
+        super().__init__(
+            _DequeuingSpanExporter(span_exporter, self._dequeued),
+            max_queue_size=max_queue_size,
+            **kwargs,
+        )
+    
+    @property
+    def queue_depth(self) -> int:
+        return self._queued
+    
+    def on_end(self, span: ReadableSpan) -> None:
+        if span.context.trace_flags.sampled and not self._done:
+            with self._lock:
+                if self._queued >= self.max_queue_size:
+                    trace_spans_dropped_total.labels(reason="queue_full").inc()
+                else:
+                    self._queued += 1
+        super().on_end(span)
+    
+    def shutdown(self):
+        self._done = True
+        return super().shutdown()
+    
+    def _dequeued(self, count: int) -> None:
+        with self._lock:
+            self._queued = max(0, self._queued - count)
+
+
+def build_span_exporter(
+    exporter: str,
+    endpoint: str | None = None,
+    jaeger_host: str = "localhost",
+    jaeger_port: int = 6831,
+) -> SpanExporter:
+    """
+    Create the configured span exporter.
+    
+    OTLP exporters are optional dependencies, imported only when selected.
+    
+    Args:
+        exporter: One of "jaeger", "otlp-http", "otlp-grpc"
+        endpoint: OTLP collector endpoint (exporter default when None)
+        jaeger_host: Jaeger agent host (thrift over UDP)
+        jaeger_port: Jaeger agent port
+    
+    Raises:
+        ValueError: Unknown exporter
+        RuntimeError: The exporter package is not installed
+    """
+    if exporter == "jaeger":
+        from opentelemetry.exporter.jaeger.thrift import JaegerExporter
+        
+        return CountingSpanExporter(
+            JaegerExporter(agent_host_name=jaeger_host, agent_port=jaeger_port)
+        )
+    
+    if exporter == "otlp-http":
+        try:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        except ImportError as e:
+            raise RuntimeError(
+                "TRACE_EXPORTER=otlp-http requires opentelemetry-exporter-otlp-proto-http"
+            ) from e
+        return CountingSpanExporter(OTLPSpanExporter(endpoint=endpoint))
+    
+    if exporter == "otlp-grpc":
+        try:
+            from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+        except ImportError as e:
+            raise RuntimeError(
+                "TRACE_EXPORTER=otlp-grpc requires opentelemetry-exporter-otlp-proto-grpc"
+            ) from e
+        return CountingSpanExporter(OTLPSpanExporter(endpoint=endpoint))
+    
+    raise ValueError(f"Unknown trace exporter {exporter!r}, expected one of {EXPORTERS}")
@@ -0,0 +1,208 @@
+"""Trace sampling: per-route rate limiting (head) and error/slow-aware tail sampling."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence
+
+from opentelemetry.context import Context
+from opentelemetry.sdk.trace import ReadableSpan, Span, SpanProcessor
+from opentelemetry.sdk.trace.sampling import (
+    Decision,
+    ParentBased,
+    Sampler,
+    SamplingResult,
+    TraceIdRatioBased,
+)
+from opentelemetry.trace import Link, SpanKind, StatusCode
+from opentelemetry.util.types import Attributes
+from prometheus_client import Counter
+
+
+trace_spans_dropped_total = Counter(
+    "trace_spans_dropped_total",
+    "Total spans dropped before reaching the trace backend",
+    ["reason"],
+)
+
+trace_tail_decisions_total = Counter(
+    "trace_tail_decisions_total",
+    "Total tail-sampling decisions by outcome",
+    ["decision"],
+)
+
+ROUTE_ATTRIBUTES = ("http.route", "url.path", "http.target")
+
+
+class TokenBucket:
+    """Thread-safe token bucket allowing `rate` events per second."""
+    
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.capacity = max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def try_acquire(self) -> bool:
+        if self.rate <= 0:
+            return False
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+
+class RouteRateLimitingSampler(Sampler):
+    """
+    Ratio sampler with a traces-per-second cap per route.
+    
+    Routes without an explicit limit use `default_limit` (None = unlimited).
+    A limit of 0 never traces the route (e.g. probes).
+    """
+    
+    def __init__(
+        self,
+        ratio: float,
+        route_limits: Dict[str, float] | None = None,
+        default_limit: float | None = None,
+    ):
+        self._ratio_sampler = TraceIdRatioBased(ratio)
+        self._route_limits = dict(route_limits or {})
+        self._default_limit = default_limit
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+    
+    def should_sample(
+        self,
+        parent_context: Optional[Context],
+        trace_id: int,
+        name: str,
+        kind: Optional[SpanKind] = None,
+        attributes: Attributes = None,
+        links: Optional[Sequence[Link]] = None,
+        trace_state=None,
+    ) -> SamplingResult:
+        result = self._ratio_sampler.should_sample(
+            parent_context, trace_id, name, kind, attributes, links, trace_state
+        )
+        if result.decision != Decision.RECORD_AND_SAMPLE:
+            return result
+        
+        bucket = self._bucket_for(self._route_of(name, attributes))
+        if bucket is not None and not bucket.try_acquire():
+            return SamplingResult(Decision.DROP, None, result.trace_state)
+        return result
+    
+    def get_description(self) -> str:
+        return f"RouteRateLimitingSampler{{{self._ratio_sampler.get_description()}}}"
+    
+    @staticmethod
+    def _route_of(name: str, attributes: Attributes) -> str:
+        for key in ROUTE_ATTRIBUTES:
+            value = (attributes or {}).get(key)
+            if value:
+                return str(value)
+        # server span names look like "GET /users/{user_id}"
+        return name.split(" ", 1)[-1]
+    
+    def _bucket_for(self, route: str) -> TokenBucket | None:
+        limit = self._route_limits.get(route, self._default_limit)
+        if limit is None:
+            return None
+        with self._lock:
+            bucket = self._buckets.get(route)
+            if bucket is None:
+                bucket = self._buckets[route] = TokenBucket(limit)
+            return bucket
+
+
+def build_sampler(
+    ratio: float,
+    route_limits: Dict[str, float] | None = None,
+    default_limit: float | None = None,
+) -> Sampler:
+    """Parent-based sampler: follow the caller's decision, rate-limit new root traces."""
+    return ParentBased(root=RouteRateLimitingSampler(ratio, route_limits, default_limit))
+
+
+class TailSamplingSpanProcessor(SpanProcessor):
+    """
+    Buffers the spans of each trace until its local root span ends, then
+    forwards the whole trace to `delegate` if it is worth keeping.
+    
+    Error traces and traces slower than `slow_threshold_seconds` are always
+    kept; the rest are kept with probability `sample_ratio` (by trace id, so
+    every process makes the same decision). At most `max_traces` traces are
+    buffered; the oldest is dropped when the buffer is full.
+    """
+    
+    def __init__(
+        self,
+        delegate: SpanProcessor,
+        sample_ratio: float,
+        slow_threshold_seconds: float,
+        max_traces: int = 10000,
+    ):
+        self._delegate = delegate
+        self._bound = TraceIdRatioBased.get_bound_for_rate(sample_ratio)
+        self._slow_threshold_ns = int(slow_threshold_seconds * 1e9)
+        self._max_traces = max_traces
+        self._traces: "OrderedDict[int, List[ReadableSpan]]" = OrderedDict()
+        # decisions of recently finished traces, for spans ending after their root
+        self._decisions: "OrderedDict[int, bool]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def on_start(self, span: Span, parent_context: Optional[Context] = None) -> None:
+        self._delegate.on_start(span, parent_context=parent_context)
+    
+    def on_end(self, span: ReadableSpan) -> None:
+        trace_id = span.context.trace_id
+        evicted = 0
+        
+        with self._lock:
+            decided = self._decisions.get(trace_id)
+            if decided is not None:
+                spans, keep, decision = [span], decided, None
+            else:
+                self._traces.setdefault(trace_id, []).append(span)
+                if span.parent is not None and not span.parent.is_remote:
+                    while len(self._traces) > self._max_traces:
+                        evicted += len(self._traces.popitem(last=False)[1])
+                    spans = None
+                else:
+                    spans = self._traces.pop(trace_id)
+                    decision = self._decide(span, spans)
+                    keep = decision != "dropped"
+                    self._decisions[trace_id] = keep
+                    while len(self._decisions) > self._max_traces:
+                        self._decisions.popitem(last=False)
+        
+        if evicted:
+            trace_spans_dropped_total.labels(reason="tail_buffer_full").inc(evicted)
+        if spans is None:
+            return
+        if decision is not None:
+            trace_tail_decisions_total.labels(decision=decision).inc()
+        if keep:
+            for buffered in spans:
+                self._delegate.on_end(buffered)
+    
+    def _decide(self, root: ReadableSpan, spans: List[ReadableSpan]) -> str:
+        if any(span.status.status_code == StatusCode.ERROR for span in spans):
+            return "error"
+        if root.end_time - root.start_time >= self._slow_threshold_ns:
+            return "slow"
+        if root.context.trace_id & TraceIdRatioBased.TRACE_ID_LIMIT < self._bound:
+            return "sampled"
+        return "dropped"
+    
+    def shutdown(self) -> None:
+        self._delegate.shutdown()
+    
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return self._delegate.force_flush(timeout_millis)
@@ -7,10 +7,11 @@ app = create_app()
 if __name__ == "__main__":
     import uvicorn
     
+    # development entry point; production runs `python -m app.server`
     uvicorn.run(
         "app.main:app",
         host="0.0.0.0",
         port=settings.port,
-        reload=settings.environment,
+        reload=settings.environment == "development",
         log_config=None
     )
@@ -0,0 +1,64 @@
+"""
+Rebuild users_read_model from users.
+
+Streams users in id order and bulk-upserts their projection with several
+concurrent writers (see app/infrastructure/read_model/rebuild.py). Progress
+(rows/sec) is logged every few seconds and a checkpoint file records the
+last fully written id: an interrupted rebuild resumes from it, --reset
+starts over.
+
+Defaults come from the READ_MODEL_REBUILD_* settings. The same rebuild can
+run inside the service through POST /debug/read-model/rebuild.
+
+Usage:
+    python -m app.rebuild_read_model
+    python -m app.rebuild_read_model --workers 8 --chunk-size 2000 --max-rows-per-second 5000
+    python -m app.rebuild_read_model --reset
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+
+from app.core.config import settings
+from app.core.database import init_db, close_db
+from app.di import container
+
+
+async def main(args: argparse.Namespace) -> dict:
+    await init_db()
+    try:
+        return await container.read_model_rebuilder.run(
+            chunk_size=args.chunk_size,
+            workers=args.workers,
+            max_rows_per_second=args.max_rows_per_second,
+            reset=args.reset,
+        )
+    finally:
+        await close_db()
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunk-size", type=int, default=settings.read_model_rebuild_chunk_size)
+    parser.add_argument("--workers", type=int, default=settings.read_model_rebuild_workers)
+    parser.add_argument(
+        "--max-rows-per-second", type=float, default=settings.read_model_rebuild_max_rows_per_second,
+        help="throttle reads from users (default: unthrottled)",
+    )
+    parser.add_argument(
+        "--checkpoint", default=settings.read_model_rebuild_checkpoint_path,
+        help="checkpoint file to resume from",
+    )
+    parser.add_argument("--reset", action="store_true", help="ignore the checkpoint and start over")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    container.read_model_rebuilder.checkpoint_path = args.checkpoint
+    try:
+        print(json.dumps(asyncio.run(main(args)), indent=2))
+    except KeyboardInterrupt:
+        sys.exit("Interrupted, run again to resume from the checkpoint")
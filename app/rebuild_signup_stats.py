@@ -0,0 +1,35 @@
+"""
+Backfill signup_stats from users.
+
+Counters are normally bumped by every signup; run this once after deploying
+them, or whenever they are suspected wrong. Users created before it started
+are streamed in id order and the hour, day and total counters rewritten in one
+transaction; signups made while it runs are kept in the counters still open.
+
+Usage:
+    python -m app.rebuild_signup_stats
+"""
+
+import argparse
+import asyncio
+
+from loguru import logger
+
+from app.core.database import init_db, close_db
+from app.di import container
+
+
+async def main(chunk_size: int) -> int:
+    await init_db()
+    try:
+        return await container.data_source.rebuild_signup_stats(chunk_size=chunk_size)
+    finally:
+        await close_db()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    args = parser.parse_args()
+    total = asyncio.run(main(args.chunk_size))
+    logger.info(f"Signup stats rebuilt from {total} users")
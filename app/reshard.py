@@ -0,0 +1,103 @@
+"""
+Move users between shard layouts.
+
+Layouts are JSON objects of shard name -> DSN, as in DB_SHARDS; an empty
+DB_SHARDS means every user is in the default database. Shards are placed by
+consistent hashing of their names, so adding one shard moves only the users
+it takes over, and a shard name must keep its DSN across layouts.
+
+1. `copy --to NEW` while the service runs on the current DB_SHARDS: copies
+   every user, read model row and email index entry to its owner in NEW.
+2. Switch DB_SHARDS to NEW and restart the service.
+3. `copy --from OLD` to catch up with the signups that landed on the old
+   layout between steps 1 and 2 (copies are idempotent upserts).
+4. `cleanup` deletes the rows each shard of DB_SHARDS holds but no longer owns.
+
+Don't run the read model drift repair (`python -m app.check_read_model`, or
+READ_MODEL_DRIFT_CHECK_INTERVAL_SECONDS) between steps 2 and 3: until the
+catch-up copy is done, users only on a shard removed from DB_SHARDS would look
+orphaned, and their email index entries would be deleted. Set the interval to
+0 for the restart of step 2 and restore it after step 3.
+
+Usage:
+    python -m app.reshard copy --to '{"s0": "postgres://...", "s1": "postgres://...", "s2": "postgres://..."}'
+    python -m app.reshard copy --from '{"s0": "postgres://...", "s1": "postgres://..."}'
+    python -m app.reshard cleanup
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+
+from loguru import logger
+
+from app.core.config import settings
+from app.core.database import (
+    TORTOISE_ORM,
+    build_connection_config,
+    close_db,
+    generate_shard_schemas,
+    init_db,
+    shard_connection_name,
+)
+from app.data import ShardedDataSource
+
+
+def layout_data_source(layout: dict[str, str]) -> ShardedDataSource:
+    """Data source of a layout; an unsharded layout is one shard on "default"."""
+    if not layout:
+        return ShardedDataSource(["default"], connection_names={"default": "default"})
+    return ShardedDataSource(list(layout), vnodes=settings.db_shard_vnodes)
+
+
+def register_layout(layout: dict[str, str]) -> None:
+    """Add the connections of a layout that isn't DB_SHARDS to the Tortoise config."""
+    for shard, dsn in layout.items():
+        name = shard_connection_name(shard)
+        if shard in settings.db_shards and settings.db_shards[shard] != dsn:
+            sys.exit(f"Shard {shard!r} has a different DSN in DB_SHARDS; shard names must keep their DSN")
+        TORTOISE_ORM["connections"].setdefault(name, build_connection_config(dsn))
+
+
+async def main(args: argparse.Namespace) -> None:
+    if args.command == "copy":
+        other = json.loads(args.to or args.source)
+        register_layout(other)
+    await init_db()
+    try:
+        if args.command == "copy":
+            await generate_shard_schemas(other)
+            current = layout_data_source(settings.db_shards)
+            if args.to:
+                source, target = current, layout_data_source(other)
+            else:
+                source, target = layout_data_source(other), current
+            copied = await source.copy_to(target, chunk_size=args.chunk_size)
+            logger.info(f"Copied {copied} users to their new shards")
+        else:
+            if not settings.db_shards:
+                sys.exit("DB_SHARDS is empty, nothing to clean up")
+            deleted = await layout_data_source(settings.db_shards).delete_foreign_rows(chunk_size=args.chunk_size)
+            logger.info(f"Deleted {deleted} rows from shards that no longer own them")
+    finally:
+        await close_db()
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    
+    copy = subcommands.add_parser("copy", help="copy users to their owner in another layout")
+    direction = copy.add_mutually_exclusive_group(required=True)
+    direction.add_argument("--to", help="target layout (JSON), source is DB_SHARDS")
+    direction.add_argument("--from", dest="source", help="source layout (JSON), target is DB_SHARDS")
+    copy.add_argument("--chunk-size", type=int, default=1000)
+    
+    cleanup = subcommands.add_parser("cleanup", help="delete rows DB_SHARDS shards don't own")
+    cleanup.add_argument("--chunk-size", type=int, default=1000)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
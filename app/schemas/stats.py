@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+from datetime import datetime
+
+
+class SignupStatsBucket(BaseModel):
+    start: datetime
+    count: int
+
+
+class SignupStatsResponse(BaseModel):
+    granularity: str
+    start: datetime
+    end: datetime
+    total_users: int
+    signups: int
+    buckets: list[SignupStatsBucket]
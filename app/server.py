@@ -0,0 +1,101 @@
+"""
+Production server launcher.
+
+Runs uvicorn with one worker per available CPU (SERVER_WORKERS), uvloop and
+httptools when installed, and a graceful drain on SIGTERM/SIGINT:
+
+1. /ready turns not ready, so load balancers stop routing to the instance
+   (for SHUTDOWN_UNREADY_DELAY_SECONDS the server keeps accepting requests)
+2. the server stops accepting and waits up to SHUTDOWN_DRAIN_TIMEOUT_SECONDS
+   for in-flight requests
+3. the lifespan shutdown flushes queued spans and closes the database pool
+
+A second signal skips the delay and shuts down right away.
+
+Usage:
+    python -m app.server
+"""
+
+import os
+import signal
+import time
+from types import FrameType
+
+import uvicorn
+from loguru import logger
+from uvicorn.supervisors import Multiprocess
+
+from app.core.config import settings
+
+
+APP = "app.main:app"
+
+
+def worker_count() -> int:
+    """Number of workers: SERVER_WORKERS, else the CPUs this process may run on."""
+    if settings.server_workers:
+        return settings.server_workers
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def build_config() -> uvicorn.Config:
+    """Uvicorn config from Settings."""
+    return uvicorn.Config(
+        APP,
+        host="0.0.0.0",
+        port=settings.port,
+        workers=worker_count(),
+        loop=settings.server_loop,
+        http=settings.server_http,
+        timeout_graceful_shutdown=settings.shutdown_drain_timeout_seconds,
+        log_config=None,
+    )
+
+
+class DrainingServer(uvicorn.Server):
+    """Uvicorn server that turns not ready before it stops accepting requests."""
+    
+    def __init__(self, config: uvicorn.Config, unready_delay: float = settings.shutdown_unready_delay_seconds):
+        super().__init__(config)
+        self.unready_delay = unready_delay
+        self.drain_deadline: float | None = None
+    
+    def handle_exit(self, sig: int, frame: FrameType | None) -> None:
+        if self.drain_deadline is not None or self.unready_delay <= 0:
+            super().handle_exit(sig, frame)
+            return
+        
+        # only flags are set here, the serving loop notices them in on_tick
+        from app.infrastructure.health import health_checker
+        
+        health_checker.start_draining()
+        self.drain_deadline = time.monotonic() + self.unready_delay
+        logger.info(f"Received {signal.Signals(sig).name}, draining for {self.unready_delay}s")
+    
+    async def on_tick(self, counter: int) -> bool:
+        if self.drain_deadline is not None and time.monotonic() >= self.drain_deadline:
+            self.should_exit = True
+        return await super().on_tick(counter)
+
+
+def run() -> None:
+    """Start the server: a single process or a supervisor with N workers."""
+    config = build_config()
+    if config.workers > 1 and not settings.prometheus_multiproc_dir:
+        logger.warning(
+            "Running several workers without PROMETHEUS_MULTIPROC_DIR: "
+            "/metrics only reports the worker that serves the scrape"
+        )
+    
+    server = DrainingServer(config)
+    if config.workers > 1:
+        sock = config.bind_socket()
+        Multiprocess(config, target=server.run, sockets=[sock]).run()
+    else:
+        server.run()
+
+
+if __name__ == "__main__":
+    run()
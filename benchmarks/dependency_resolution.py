@@ -0,0 +1,101 @@
+"""
+Benchmark of per-request dependency resolution for the use case providers.
+
+Compares the previous per-request object graph (sync providers building a
+DataSource, repositories and use case through nested Depends, each run in the
+threadpool) against the app-scoped container providers. Each variant is a
+bare endpoint that only resolves the dependency, driven in-process over ASGI;
+a dependency-free endpoint gives the baseline to subtract.
+
+Usage:
+    python -m benchmarks.dependency_resolution --requests 2000
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+from fastapi import Depends, FastAPI
+
+from app.bp import SignupUseCase
+from app.data import (
+    DataSource,
+    EncryptRepositoryImp,
+    StatsRepositoryImp,
+    UserCreateRepositoryImp,
+    UserReadRepositoryImp,
+)
+from app.di import providers
+
+
+# per-request graph as built before the container
+def legacy_user_create_repository(data_source: DataSource = Depends(DataSource)):
+    return UserCreateRepositoryImp(data_source)
+
+def legacy_user_read_repository(data_source: DataSource = Depends(DataSource)):
+    return UserReadRepositoryImp(data_source)
+
+def legacy_encrypt_repository():
+    return EncryptRepositoryImp()
+
+def legacy_stats_repository(data_source: DataSource = Depends(DataSource)):
+    return StatsRepositoryImp(data_source)
+
+def legacy_signup_use_case(
+    user_create_repository=Depends(legacy_user_create_repository),
+    user_read_repository=Depends(legacy_user_read_repository),
+    encrypt_repository=Depends(legacy_encrypt_repository),
+    stats_repository=Depends(legacy_stats_repository),
+) -> SignupUseCase:
+    return SignupUseCase(user_create_repository, user_read_repository, encrypt_repository, stats_repository)
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    
+    @app.get("/baseline")
+    async def baseline():
+        return None
+    
+    @app.get("/per-request")
+    async def per_request(use_case: SignupUseCase = Depends(legacy_signup_use_case)):
+        return None
+    
+    @app.get("/container")
+    async def container(use_case: SignupUseCase = Depends(providers.get_signup_use_case_module)):
+        return None
+    
+    return app
+
+
+async def measure(client: httpx.AsyncClient, path: str, requests: int) -> float:
+    """Return mean microseconds per request."""
+    for _ in range(min(requests, 100)):
+        await client.get(path)
+    start = time.perf_counter()
+    for _ in range(requests):
+        await client.get(path)
+    return (time.perf_counter() - start) / requests * 1_000_000
+
+
+async def run(requests: int):
+    transport = httpx.ASGITransport(app=build_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        baseline = await measure(client, "/baseline", requests)
+        print(f"{'variant':>12} {'us/request':>11} {'resolution us':>14}")
+        print(f"{'baseline':>12} {baseline:>11.1f} {'-':>14}")
+        for variant in ("per-request", "container"):
+            micros = await measure(client, f"/{variant}", requests)
+            print(f"{variant:>12} {micros:>11.1f} {micros - baseline:>14.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(run(args.requests))
+
+
+if __name__ == "__main__":
+    main()
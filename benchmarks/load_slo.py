@@ -0,0 +1,134 @@
+"""
+Headless load test with SLO gates.
+
+Runs a locustfile.py scenario headless against a running server, keeps
+locust's CSV stats, writes a JSON summary next to them and exits non-zero
+when the aggregated p95 latency or error rate misses the SLO (README: p95 <
+100 ms, success rate > 99%). Endpoints over the p95 target are listed too.
+
+Usage:
+    python -m benchmarks.load_slo --scenario read-heavy --users 50 --run-time 2m
+    python -m benchmarks.load_slo --scenario open-model --arrival-rate 200 --p95-ms 100
+"""
+
+import argparse
+import csv
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+SCENARIOS = {
+    "signup": ["SignupUser"],
+    "read-heavy": ["ReadHeavyUser"],
+    "retry-storm": ["RetryStormUser"],
+    "duplicate-burst": ["DuplicateEmailUser"],
+    "open-model": ["OpenModelUser"],
+    "mixed": ["ReadHeavyUser", "RetryStormUser", "DuplicateEmailUser", "SignupUser"],
+}
+
+
+def run_locust(args) -> Path:
+    """Run locust headless; return the path of its *_stats.csv."""
+    args.output.mkdir(parents=True, exist_ok=True)
+    prefix = args.output / args.scenario
+    command = [
+        sys.executable, "-m", "locust",
+        "-f", str(PROJECT_ROOT / "locustfile.py"),
+        "--headless", "--only-summary",
+        "--host", args.host,
+        "--users", str(args.users),
+        "--spawn-rate", str(args.spawn_rate),
+        "--run-time", args.run_time,
+        "--csv", str(prefix),
+        *SCENARIOS[args.scenario],
+    ]
+    env = {**os.environ, "ARRIVAL_RATE": str(args.arrival_rate)}
+    # locust exits 1 on any failed request; the SLO decides here instead
+    subprocess.run(command, env=env, check=False)
+    return Path(f"{prefix}_stats.csv")
+
+
+def summarize(stats_csv: Path) -> dict:
+    """Per-endpoint and aggregated throughput, error rate and percentiles from locust stats."""
+    endpoints = {}
+    with stats_csv.open() as file:
+        for row in csv.DictReader(file):
+            requests = int(row["Request Count"])
+            name = row["Name"] if row["Name"] == "Aggregated" else f"{row['Type']} {row['Name']}"
+            endpoints[name] = {
+                "requests": requests,
+                "failures": int(row["Failure Count"]),
+                "error_rate": int(row["Failure Count"]) / requests if requests else 0.0,
+                "rps": float(row["Requests/s"]),
+                "p50_ms": float(row["50%"] or 0),
+                "p95_ms": float(row["95%"] or 0),
+                "p99_ms": float(row["99%"] or 0),
+            }
+    return endpoints
+
+
+def check_slo(endpoints: dict, p95_ms: float, max_error_rate: float) -> list[str]:
+    """Return SLO violations of the aggregated stats."""
+    total = endpoints.get("Aggregated")
+    if not total or not total["requests"]:
+        return ["no requests were made"]
+    
+    violations = []
+    if total["p95_ms"] > p95_ms:
+        violations.append(f"p95 {total['p95_ms']:.0f} ms > {p95_ms:.0f} ms")
+    if total["error_rate"] > max_error_rate:
+        violations.append(f"error rate {total['error_rate']:.2%} > {max_error_rate:.2%}")
+    return violations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scenario", choices=SCENARIOS, default="mixed")
+    parser.add_argument("--host", default="http://localhost:8000")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--spawn-rate", type=float, default=10)
+    parser.add_argument("--run-time", default="2m")
+    parser.add_argument("--arrival-rate", type=float, default=20, help="req/s for open-model")
+    parser.add_argument("--p95-ms", type=float, default=100.0)
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    parser.add_argument("--output", type=Path, default=Path("load-results"))
+    args = parser.parse_args()
+    
+    stats_csv = run_locust(args)
+    if not stats_csv.exists():
+        print(f"Locust did not write {stats_csv}")
+        sys.exit(2)
+    
+    endpoints = summarize(stats_csv)
+    violations = check_slo(endpoints, args.p95_ms, args.max_error_rate)
+    summary = {
+        "scenario": args.scenario,
+        "slo": {"p95_ms": args.p95_ms, "max_error_rate": args.max_error_rate},
+        "passed": not violations,
+        "violations": violations,
+        "endpoints": endpoints,
+    }
+    summary_path = args.output / f"{args.scenario}_summary.json"
+    summary_path.write_text(json.dumps(summary, indent=2) + "\n")
+    
+    for name, stats in endpoints.items():
+        marker = "!" if stats["p95_ms"] > args.p95_ms else " "
+        print(
+            f"{marker} {name:<40} {stats['requests']:>7} req {stats['rps']:>8.1f}/s "
+            f"p95 {stats['p95_ms']:>7.0f} ms  errors {stats['error_rate']:.2%}"
+        )
+    print(f"Summary written to {summary_path}")
+    
+    if violations:
+        print("SLO violated: " + "; ".join(violations))
+        sys.exit(1)
+    print("SLO met")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Benchmark of /metrics scrape cost against the number of label series.
+
+Renders a registry shaped like ours (a request counter and a latency histogram
+per method/endpoint) in every negotiated format. A snapshot-cache hit
+(METRICS_CACHE_TTL_SECONDS > 0) skips rendering entirely.
+
+Usage:
+    python -m benchmarks.metrics_scrape --series 10 100 1000 5000 --repeat 20
+"""
+
+import argparse
+import time
+
+from prometheus_client import CollectorRegistry, Counter, Histogram
+
+from app.infrastructure.metrics import render_metrics
+
+
+OPENMETRICS = "application/openmetrics-text; version=1.0.0"
+
+FORMATS = {
+    "text": (None, None),
+    "text+gzip": (None, "gzip"),
+    "openmetrics": (OPENMETRICS, None),
+    "openmetrics+gzip": (OPENMETRICS, "gzip"),
+}
+
+
+def build_registry(series: int) -> CollectorRegistry:
+    """Build a registry with `series` label combinations per metric."""
+    registry = CollectorRegistry()
+    requests = Counter(
+        "http_requests_total", "Total HTTP requests", ["method", "endpoint", "status"],
+        registry=registry,
+    )
+    latency = Histogram(
+        "http_request_duration_seconds", "HTTP request latency in seconds", ["method", "endpoint"],
+        buckets=[0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0],
+        registry=registry,
+    )
+    for i in range(series):
+        endpoint = f"/endpoint/{i}"
+        requests.labels(method="GET", endpoint=endpoint, status="200").inc()
+        latency.labels(method="GET", endpoint=endpoint).observe(
+            0.01, exemplar={"trace_id": f"{i:032x}"}
+        )
+    return registry
+
+
+def measure(registry: CollectorRegistry, accept, accept_encoding, repeat: int) -> tuple[float, int]:
+    """Return (mean milliseconds per scrape, payload bytes)."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        content, _ = render_metrics(registry, accept, accept_encoding)
+    elapsed = time.perf_counter() - start
+    return elapsed / repeat * 1000, len(content)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--series", type=int, nargs="+", default=[10, 100, 1000, 5000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    
+    print(f"{'series':>8} {'format':>18} {'ms/scrape':>10} {'bytes':>10}")
+    for series in args.series:
+        registry = build_registry(series)
+        for name, (accept, accept_encoding) in FORMATS.items():
+            millis, size = measure(registry, accept, accept_encoding, args.repeat)
+            print(f"{series:>8} {name:>18} {millis:>10.3f} {size:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Benchmark of the shared user cache against a per-process cache, across workers.
+
+Starts `--workers` processes that each serve `--lookups` reads of user ids
+drawn from a Zipf distribution over `--users` ids. A miss "loads" the user
+(builds its UserResponse payload) and caches it. Both variants hold
+`--entries` payloads: the per-process variant in an LRU dict per worker, the
+shared variant in one SharedMemoryTable mapped by all workers. Reported per
+variant: the hit ratio over all workers and the memory growth of the workers
+during the run, as RSS (shared pages counted in every worker) and PSS
+(shared pages split between the workers that map them).
+
+Usage:
+    python -m benchmarks.shared_cache --workers 8 --users 200000 --entries 65536
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import tempfile
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+from app.infrastructure.shared_cache import SharedMemoryTable
+from app.schemas.user import UserResponse
+
+
+def memory_kib() -> dict:
+    """RSS and PSS of this process in KiB (Linux)."""
+    memory = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            field, _, value = line.partition(":")
+            if field in ("Rss", "Pss"):
+                memory[field.lower()] = int(value.split()[0])
+    return memory
+
+
+def load_user(index: int) -> bytes:
+    """Stand-in for the database read: the UserResponse payload of user `index`."""
+    return UserResponse(
+        id=uuid.UUID(int=index),
+        name=f"User {index}",
+        email=f"user{index}@example.com",
+        display_name=f"user{index}",
+        created_at=datetime(2024, 1, 1, tzinfo=timezone.utc),
+    ).model_dump_json().encode()
+
+
+class LRUCache:
+    def __init__(self, entries: int):
+        self.entries = entries
+        self._data: OrderedDict[bytes, bytes] = OrderedDict()
+    
+    def get(self, key: bytes) -> bytes | None:
+        payload = self._data.get(key)
+        if payload is not None:
+            self._data.move_to_end(key)
+        return payload
+    
+    def put(self, key: bytes, payload: bytes) -> None:
+        self._data[key] = payload
+        self._data.move_to_end(key)
+        if len(self._data) > self.entries:
+            self._data.popitem(last=False)
+
+
+def worker(variant: str, path: str, args: argparse.Namespace, seed: int, results) -> None:
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) ** args.zipf for rank in range(args.users)]
+    cum_weights, total = [], 0.0
+    for weight in weights:
+        total += weight
+        cum_weights.append(total)
+    draws = rng.choices(range(args.users), cum_weights=cum_weights, k=args.lookups)
+    
+    before = memory_kib()
+    if variant == "shared":
+        cache = SharedMemoryTable(path, slots=args.entries, slot_size=args.slot_bytes, ttl_seconds=3600)
+    else:
+        cache = LRUCache(args.entries)
+    hits = 0
+    for index in draws:
+        key = uuid.UUID(int=index).bytes
+        if cache.get(key) is not None:
+            hits += 1
+        else:
+            cache.put(key, load_user(index))
+    after = memory_kib()
+    results.put({
+        "hits": hits,
+        "lookups": len(draws),
+        "rss_kib": after["rss"] - before["rss"],
+        "pss_kib": after["pss"] - before["pss"],
+    })
+
+
+def run_variant(variant: str, args: argparse.Namespace) -> dict:
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    with tempfile.TemporaryDirectory(dir="/dev/shm" if os.path.isdir("/dev/shm") else None) as directory:
+        path = os.path.join(directory, "users-cache")
+        processes = [
+            context.Process(target=worker, args=(variant, path, args, seed, results))
+            for seed in range(args.workers)
+        ]
+        for process in processes:
+            process.start()
+        reports = [results.get() for _ in processes]
+        for process in processes:
+            process.join()
+    return {
+        "hit_ratio": sum(r["hits"] for r in reports) / sum(r["lookups"] for r in reports),
+        "rss_mib": sum(r["rss_kib"] for r in reports) / 1024,
+        "pss_mib": sum(r["pss_kib"] for r in reports) / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--users", type=int, default=200_000)
+    parser.add_argument("--entries", type=int, default=65536)
+    parser.add_argument("--slot-bytes", type=int, default=512)
+    parser.add_argument("--lookups", type=int, default=200_000, help="per worker")
+    parser.add_argument("--zipf", type=float, default=0.9, help="skew of the id distribution")
+    args = parser.parse_args()
+    
+    print(f"{args.workers} workers, {args.entries} entries per cache, {args.lookups} lookups per worker")
+    print(f"{'variant':>12} {'hit ratio':>10} {'RSS MiB':>9} {'PSS MiB':>9}")
+    for variant in ("per-process", "shared"):
+        result = run_variant(variant, args)
+        print(
+            f"{variant:>12} {result['hit_ratio']:>10.3f} "
+            f"{result['rss_mib']:>9.1f} {result['pss_mib']:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark of cold-start import cost, broken down by package.
+
+Imports `app.main` (which builds the app) in a fresh interpreter with
+`-X importtime`, then sums the self time of every imported module per
+top-level package (or per subpackage with --depth 2). Environment variables
+are passed through, so the effect of settings can be compared directly.
+
+Usage:
+    python -m benchmarks.startup_imports --top 15
+    ENABLE_TRACING=false python -m benchmarks.startup_imports --depth 2
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+
+def profile_imports(module: str) -> tuple[list[tuple[str, int, int]], float]:
+    """
+    Import `module` in a subprocess.
+    
+    Returns:
+        ([(module, self_us, cumulative_us)], wall-clock milliseconds)
+    """
+    code = (
+        "import time; start = time.perf_counter(); "
+        f"import {module}; "
+        "print((time.perf_counter() - start) * 1000)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, check=True, env=os.environ.copy(),
+    )
+    
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules.append((name.strip(), int(self_us), int(cumulative_us)))
+    return modules, float(result.stdout.strip().splitlines()[-1])
+
+
+def group_by_package(modules: list[tuple[str, int, int]], depth: int) -> dict[str, int]:
+    """Sum self time (us) per package prefix of `depth` components."""
+    totals = defaultdict(int)
+    for name, self_us, _ in modules:
+        totals[".".join(name.split(".")[:depth])] += self_us
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--depth", type=int, default=1)
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args()
+    
+    modules, wall_ms = profile_imports(args.module)
+    totals = group_by_package(modules, args.depth)
+    
+    print(f"import {args.module}: {wall_ms:.1f} ms wall, {len(modules)} modules")
+    print(f"{'package':<45} {'ms':>8} {'share':>7}")
+    total_us = sum(totals.values())
+    for package, self_us in sorted(totals.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"{package:<45} {self_us / 1000:>8.1f} {self_us / total_us:>7.1%}")
+
+
+if __name__ == "__main__":
+    main()
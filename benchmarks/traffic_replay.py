@@ -0,0 +1,183 @@
+"""
+Replay captured traffic and compare latency between builds.
+
+`replay` plays a capture file (TRAFFIC_CAPTURE_PATH, see
+app/api/traffic_capture.py) against a running instance, keeping the original
+inter-arrival times divided by --speed. Requests are sent open-loop: each
+one fires on schedule whether or not earlier ones have finished. With
+--unique, emails and idempotency keys are rewritten per run so signups hit
+the write path again instead of conflicting with a previous replay.
+
+`compare` reports p50/p95/p99 per route for two replay results (e.g. the
+same capture against the old and the new build) and can gate on p95.
+
+Usage:
+    python -m benchmarks.traffic_replay replay capture.jsonl --target http://localhost:8000 --speed 2 --unique --output old.json
+    python -m benchmarks.traffic_replay replay capture.jsonl --target http://localhost:8001 --speed 2 --unique --output new.json
+    python -m benchmarks.traffic_replay compare old.json new.json --max-regression 0.2
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+import uuid
+from collections import defaultdict
+from pathlib import Path
+
+import httpx
+
+
+def load_capture(path: Path) -> list[dict]:
+    entries = [json.loads(line) for line in path.read_text().splitlines() if line.strip()]
+    return sorted(entries, key=lambda entry: entry["t"])
+
+
+def make_unique(entry: dict, run_id: str) -> tuple[dict, str | None]:
+    """Rewrite the email and idempotency key of an entry for this run."""
+    headers = dict(entry["h"])
+    if "idempotency-key" in headers:
+        headers["idempotency-key"] = str(uuid.uuid5(uuid.NAMESPACE_URL, run_id + headers["idempotency-key"]))
+    body = entry["b"]
+    if body:
+        data = json.loads(body)
+        if isinstance(data.get("email"), str) and "@" in data["email"]:
+            data["email"] = f"r{run_id}-{data['email']}"
+        body = json.dumps(data)
+    return headers, body
+
+
+async def replay(entries: list[dict], target: str, speed: float, unique: bool, timeout: float) -> list[dict]:
+    """Send the captured requests on their original schedule (scaled by speed)."""
+    run_id = uuid.uuid4().hex[:8]
+    results = []
+    
+    async with httpx.AsyncClient(base_url=target, timeout=timeout) as client:
+        async def send(entry: dict, scheduled: float):
+            headers, body = make_unique(entry, run_id) if unique else (entry["h"], entry["b"])
+            lag = time.perf_counter() - scheduled
+            start = time.perf_counter()
+            try:
+                response = await client.request(
+                    entry["m"], entry["p"], params=entry["q"], headers=headers, content=body
+                )
+                status = response.status_code
+            except httpx.HTTPError:
+                status = 0
+            results.append({
+                "m": entry["m"],
+                "r": entry["r"],
+                "s": status,
+                "os": entry["s"],
+                "d": round((time.perf_counter() - start) * 1000, 3),
+                "od": entry["d"],
+                "lag": round(lag * 1000, 3),
+            })
+        
+        tasks = []
+        first = entries[0]["t"]
+        start = time.perf_counter()
+        for entry in entries:
+            scheduled = start + (entry["t"] - first) / speed
+            await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+            tasks.append(asyncio.create_task(send(entry, scheduled)))
+        await asyncio.gather(*tasks)
+    
+    return results
+
+
+def percentiles(latencies: list[float]) -> dict:
+    if len(latencies) < 2:
+        value = latencies[0] if latencies else 0.0
+        return {"p50_ms": value, "p95_ms": value, "p99_ms": value}
+    cuts = statistics.quantiles(latencies, n=100)
+    return {"p50_ms": round(cuts[49], 3), "p95_ms": round(cuts[94], 3), "p99_ms": round(cuts[98], 3)}
+
+
+def summarize(results: list[dict]) -> dict:
+    """Per "METHOD route" count, error count and latency percentiles."""
+    groups = defaultdict(list)
+    for result in results:
+        groups[f"{result['m']} {result['r']}"].append(result)
+    return {
+        name: {
+            "count": len(group),
+            "errors": sum(1 for result in group if result["s"] == 0 or result["s"] >= 500),
+            "status_changed": sum(1 for result in group if result["s"] != result["os"]),
+            **percentiles([result["d"] for result in group]),
+        }
+        for name, group in sorted(groups.items())
+    }
+
+
+def compare(before: dict, after: dict, max_regression: float | None) -> tuple[list[str], list[str]]:
+    """Return (report lines, p95 regressions beyond max_regression)."""
+    lines = [f"{'route':<32} {'count':>6} {'p50 a':>9} {'p50 b':>9} {'p95 a':>9} {'p95 b':>9} {'p95 Δ':>7} {'p99 a':>9} {'p99 b':>9}"]
+    regressions = []
+    for name in sorted(set(before) | set(after)):
+        a, b = before.get(name), after.get(name)
+        if a is None or b is None:
+            lines.append(f"{name:<32} only in {'b' if a is None else 'a'}")
+            continue
+        change = (b["p95_ms"] - a["p95_ms"]) / a["p95_ms"] if a["p95_ms"] else 0.0
+        lines.append(
+            f"{name:<32} {b['count']:>6} {a['p50_ms']:>9.2f} {b['p50_ms']:>9.2f} "
+            f"{a['p95_ms']:>9.2f} {b['p95_ms']:>9.2f} {change:>+7.0%} {a['p99_ms']:>9.2f} {b['p99_ms']:>9.2f}"
+        )
+        if max_regression is not None and change > max_regression:
+            regressions.append(f"{name}: p95 {a['p95_ms']} -> {b['p95_ms']} ms ({change:+.0%})")
+    return lines, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    replay_parser = commands.add_parser("replay", help="replay a capture file against a target")
+    replay_parser.add_argument("capture", type=Path)
+    replay_parser.add_argument("--target", default="http://localhost:8000")
+    replay_parser.add_argument("--speed", type=float, default=1.0, help="1 = original timing, 2 = twice as fast")
+    replay_parser.add_argument("--unique", action="store_true", help="rewrite emails and idempotency keys")
+    replay_parser.add_argument("--timeout", type=float, default=30.0)
+    replay_parser.add_argument("--output", type=Path, required=True)
+    
+    compare_parser = commands.add_parser("compare", help="compare two replay results")
+    compare_parser.add_argument("before", type=Path)
+    compare_parser.add_argument("after", type=Path)
+    compare_parser.add_argument("--max-regression", type=float, help="fail if a route's p95 grows more")
+    
+    args = parser.parse_args()
+    
+    if args.command == "replay":
+        entries = load_capture(args.capture)
+        if not entries:
+            print(f"No requests in {args.capture}")
+            sys.exit(2)
+        results = asyncio.run(replay(entries, args.target, args.speed, args.unique, args.timeout))
+        summary = summarize(results)
+        args.output.write_text(json.dumps({
+            "meta": {"capture": str(args.capture), "target": args.target, "speed": args.speed},
+            "summary": summary,
+            "max_lag_ms": max(result["lag"] for result in results),
+            "results": results,
+        }, indent=1) + "\n")
+        for name, stats in summary.items():
+            print(f"{name:<32} {stats['count']:>6} req  p95 {stats['p95_ms']:>8.2f} ms  "
+                  f"errors {stats['errors']}  status changed {stats['status_changed']}")
+        print(f"Results written to {args.output}")
+    else:
+        before = json.loads(args.before.read_text())["summary"]
+        after = json.loads(args.after.read_text())["summary"]
+        lines, regressions = compare(before, after, args.max_regression)
+        print("\n".join(lines))
+        if regressions:
+            print("p95 regressions:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,38 +1,185 @@
 """
 Load testing with Locust.
 
+Scenarios (pick user classes by name, all run with equal weight otherwise):
+- SignupUser: new signups with fresh idempotency keys, plus /health
+- ReadHeavyUser: mostly GET /users/{id} hits on seeded users, some misses and signups
+- RetryStormUser: clients retrying the same signup with the same Idempotency-Key
+- DuplicateEmailUser: bursts of signups for one email (409 duplicates / 429 rate limited)
+- OpenModelUser: constant arrival rate (ARRIVAL_RATE req/s) regardless of latency
+
+Run from a single machine, the rate limiter sees one IP: set ENABLE_RATE_LIMIT=false
+on the server, or RATE_LIMIT_TRUST_FORWARDED_FOR=true (each simulated user sends its
+own X-Forwarded-For).
+
 Usage:
     locust -f locustfile.py --host=http://localhost:8000 --users 50 --spawn-rate 10 --run-time 2m
+    locust -f locustfile.py --host=http://localhost:8000 ReadHeavyUser RetryStormUser
+    python -m benchmarks.load_slo --scenario read-heavy --users 50 --run-time 2m
 """
 
-from locust import HttpUser, task, between
+import os
+import random
+import time
 import uuid
 
+import gevent
+from gevent.lock import Semaphore
+from locust import HttpUser, between, constant, task
+
+
+PASSWORD = "S3guro!123"
+
+# total requests per second generated by OpenModelUser
+ARRIVAL_RATE = float(os.environ.get("ARRIVAL_RATE", "20"))
+
+
+def signup_payload(email: str | None = None) -> dict:
+    return {
+        "name": "Load Test User",
+        "email": email or f"load-{uuid.uuid4()}@example.com",
+        "password": PASSWORD,
+        "display_name": "Load Test",
+    }
+
+
+def random_ip() -> str:
+    return f"10.{random.randint(0, 255)}.{random.randint(0, 255)}.{random.randint(1, 254)}"
 
-class SignupUser(HttpUser):
+
+class LoadTestUser(HttpUser):
+    """Base user with its own client IP for the rate limiter."""
+    
+    abstract = True
+    
+    def on_start(self):
+        self.client.headers["X-Forwarded-For"] = random_ip()
+    
+    def signup(self, payload: dict, idempotency_key: str | None = None, name: str = "/signup"):
+        headers = {"Idempotency-Key": idempotency_key} if idempotency_key else {}
+        return self.client.post("/signup", json=payload, headers=headers, name=name)
+
+
+class SignupUser(LoadTestUser):
     """Simulated user performing signup operations."""
     
     wait_time = between(1, 3)
     
     @task(3)
-    def signup(self):
+    def new_signup(self):
         """Create a new user with unique email."""
-        email = f"load-{uuid.uuid4()}@example.com"
-        
-        self.client.post(
-            "/signup",
-            json={
-                "name": "Load Test User",
-                "email": email,
-                "password": "S3guro!123",
-                "display_name": "Load Test"
-            },
-            headers={
-                "Idempotency-Key": str(uuid.uuid4())
-            }
-        )
+        self.signup(signup_payload(), idempotency_key=str(uuid.uuid4()))
     
     @task(1)
     def health_check(self):
         """Check service health."""
         self.client.get("/health")
+
+
+class ReadHeavyUser(LoadTestUser):
+    """Read side: ~90% profile reads (mostly hits), the rest new signups."""
+    
+    wait_time = between(0.05, 0.2)
+    seed_users = 5
+    
+    # seeded once and shared by all ReadHeavyUsers
+    user_ids: list[str] = []
+    seed_lock = Semaphore()
+    
+    def on_start(self):
+        super().on_start()
+        with self.seed_lock:
+            while len(self.user_ids) < self.seed_users:
+                response = self.signup(signup_payload(), name="/signup [seed]")
+                if response.status_code != 201:
+                    break
+                self.user_ids.append(response.json()["id"])
+    
+    @task(16)
+    def get_user_hit(self):
+        if self.user_ids:
+            self.client.get(f"/users/{random.choice(self.user_ids)}", name="/users/{user_id}")
+    
+    @task(2)
+    def get_user_miss(self):
+        with self.client.get(
+            f"/users/{uuid.uuid4()}", name="/users/{user_id} [miss]", catch_response=True
+        ) as response:
+            if response.status_code == 404:
+                response.success()
+    
+    @task(2)
+    def new_signup(self):
+        response = self.signup(signup_payload())
+        if response.status_code == 201:
+            self.user_ids.append(response.json()["id"])
+
+
+class RetryStormUser(LoadTestUser):
+    """A client timing out and retrying the same signup with the same Idempotency-Key."""
+    
+    wait_time = between(0.5, 1)
+    retries = 5
+    
+    @task
+    def retry_storm(self):
+        payload = signup_payload()
+        key = str(uuid.uuid4())
+        self.signup(payload, idempotency_key=key)
+        for _ in range(self.retries):
+            with self.client.post(
+                "/signup", json=payload, headers={"Idempotency-Key": key},
+                name="/signup [retry]", catch_response=True,
+            ) as response:
+                if response.headers.get("X-Idempotency-Hit") != "true":
+                    response.failure(f"Retry not served from idempotency store ({response.status_code})")
+
+
+class DuplicateEmailUser(LoadTestUser):
+    """Bot-like bursts of signups for the same email without idempotency keys."""
+    
+    wait_time = between(1, 2)
+    burst = 10
+    
+    @task
+    def duplicate_burst(self):
+        payload = signup_payload()
+        for _ in range(self.burst):
+            with self.client.post(
+                "/signup", json=payload, name="/signup [duplicate]", catch_response=True
+            ) as response:
+                if response.status_code in (201, 409, 429):
+                    response.success()
+
+
+class OpenModelUser(LoadTestUser):
+    """
+    Open workload: requests arrive at ARRIVAL_RATE per second whether or not
+    earlier ones finished, so a slow server builds up concurrency (as real
+    traffic does) instead of slowing the load generator down.
+    """
+    
+    fixed_count = 1
+    wait_time = constant(0)
+    
+    @task
+    def arrivals(self):
+        interval = 1 / ARRIVAL_RATE
+        next_at = time.monotonic()
+        while True:
+            gevent.spawn(self.one_request)
+            next_at += interval
+            gevent.sleep(max(0.0, next_at - time.monotonic()))
+    
+    def one_request(self):
+        # every arrival is a different client
+        headers = {"X-Forwarded-For": random_ip()}
+        if random.random() < 0.8:
+            with self.client.get(
+                f"/users/{uuid.uuid4()}", name="/users/{user_id} [miss]",
+                headers=headers, catch_response=True,
+            ) as response:
+                if response.status_code == 404:
+                    response.success()
+        else:
+            self.client.post("/signup", json=signup_payload(), headers=headers)
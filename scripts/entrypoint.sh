@@ -14,5 +14,16 @@ else
     python -m aerich upgrade
 fi
 
+if [ -n "$PROMETHEUS_MULTIPROC_DIR" ]; then
+    echo "Resetting Prometheus multiprocess directory..."
+    rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+    mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+fi
+
+if [ -n "$SHARED_USER_CACHE_PATH" ]; then
+    echo "Resetting shared user cache..."
+    rm -f "$SHARED_USER_CACHE_PATH"
+fi
+
 echo "Starting application..."
-exec python -m uvicorn app.main:app --host 0.0.0.0 --port 8000
+exec python -m app.server
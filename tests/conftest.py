@@ -63,8 +63,8 @@ async def app(db):
     for exc_type, handler in original_app.exception_handlers.items():
         test_app.add_exception_handler(exc_type, handler)
     
-    # Include all middleware
-    for middleware in original_app.user_middleware:
+    # Include all middleware (user_middleware is outermost-first, add_middleware prepends)
+    for middleware in reversed(original_app.user_middleware):
         # Get the middleware class and its init parameters
         middleware_cls = middleware.cls
         
@@ -0,0 +1,33 @@
+import json
+
+from benchmarks.suite import compare, gate
+
+
+def report(**metrics):
+    return {"scenarios": {"ready": {"throughput_rps": 1000.0, "p50_ms": 1.0, "p95_ms": 2.0, **metrics}}}
+
+
+def test_compare_flags_regressions_beyond_threshold():
+    """Test that the gate fails on slower latency or lower throughput only past the limit."""
+    baseline = report()
+    
+    assert compare(baseline, report(p95_ms=2.3), max_regression=0.2) == []
+    assert compare(baseline, report(throughput_rps=1500.0), max_regression=0.2) == []
+    
+    regressions = compare(baseline, report(p95_ms=3.0, throughput_rps=700.0), max_regression=0.2)
+    assert [regression.split(":")[0] for regression in regressions] == [
+        "ready.throughput_rps",
+        "ready.p95_ms",
+    ]
+
+
+def test_gate_is_skipped_without_a_baseline(tmp_path, capsys):
+    """Test that a fresh checkout, without a saved baseline, doesn't fail the gate."""
+    baseline = tmp_path / "sqlite.json"
+    
+    assert gate(baseline, report(), max_regression=0.2)
+    assert "skipping the regression gate" in capsys.readouterr().out
+    
+    baseline.write_text(json.dumps(report()))
+    assert gate(baseline, report(p95_ms=2.1), max_regression=0.2)
+    assert not gate(baseline, report(p95_ms=3.0), max_regression=0.2)
@@ -0,0 +1,77 @@
+import asyncio
+import uuid
+from datetime import datetime, timezone
+
+from app.bp.domain import UserReadModel
+from app.di import container
+
+
+class FakeGetUserUseCase:
+    async def run(self, user_id):
+        return {
+            "id": user_id,
+            "name": "Fake User",
+            "email": "fake@example.com",
+            "display_name": "fake",
+            "created_at": datetime.now(timezone.utc),
+        }
+
+
+def test_use_cases_are_shared_across_requests():
+    """Test that the container builds the object graph once."""
+    assert container.signup_use_case.user_read_repository is container.user_read_repository
+    assert container.user_read_repository.data_source is container.user_create_repository.data_source
+
+
+def test_container_override(client):
+    """Test that container entries can be overridden and are restored afterwards."""
+    user_id = uuid.uuid4()
+    original = container.get_user_use_case
+    
+    with container.override(get_user_use_case=FakeGetUserUseCase()):
+        response = client.get(f"/users/{user_id}")
+    
+    assert response.status_code == 200
+    assert response.json()["email"] == "fake@example.com"
+    assert container.get_user_use_case is original
+    assert client.get(f"/users/{user_id}").status_code == 404
+
+
+class FakeUserReadRepository:
+    async def get_user_by_id(self, id):
+        return UserReadModel(
+            id=id, name="Repo User", email="repo@example.com",
+            display_name="repo", created_at=datetime.now(timezone.utc),
+        )
+    
+    async def project_to_read_model(self, **kwargs):
+        pass
+
+
+def test_overriding_a_repository_rebuilds_its_use_cases(client):
+    """Test that use cases are rebuilt over an overridden repository."""
+    repository = FakeUserReadRepository()
+    
+    with container.override(user_read_repository=repository):
+        assert container.get_user_use_case.user_read_repository is repository
+        assert container.signup_use_case.user_read_repository is repository
+        assert client.get(f"/users/{uuid.uuid4()}").json()["email"] == "repo@example.com"
+    
+    assert container.get_user_use_case.user_read_repository is container.user_read_repository
+
+
+async def test_override_is_scoped_to_its_context():
+    """Test that an override is not seen by concurrently running tasks."""
+    original = container.get_user_use_case
+    entered, done = asyncio.Event(), asyncio.Event()
+    
+    async def overriding():
+        with container.override(get_user_use_case=FakeGetUserUseCase()):
+            entered.set()
+            await done.wait()
+    
+    task = asyncio.create_task(overriding())
+    await entered.wait()
+    assert container.get_user_use_case is original
+    done.set()
+    await task
@@ -0,0 +1,98 @@
+import asyncio
+import time
+
+from app.core.config import settings
+from app.core.observability import request_id_var
+from app.infrastructure.diagnostics import (
+    LoopMonitor,
+    event_loop_blocked_total,
+    memory_module_bytes,
+)
+
+
+def blocking_password_hash():
+    time.sleep(0.3)
+
+
+async def test_loop_monitor_reports_blocking_call():
+    """Test that a callback blocking the loop is reported with its stack and request id."""
+    monitor = LoopMonitor(interval=0.02, block_threshold=0.1)
+    blocked_before = event_loop_blocked_total._value.get()
+    
+    await monitor.start()
+    try:
+        await asyncio.sleep(0.05)
+        
+        async def handle_request():
+            request_id_var.set("blocking-request")
+            blocking_password_hash()
+        
+        await asyncio.create_task(handle_request())
+        await asyncio.sleep(0.05)
+    finally:
+        await monitor.stop()
+    
+    assert event_loop_blocked_total._value.get() == blocked_before + 1
+    assert monitor.last_block["request_id"] == "blocking-request"
+    assert "blocking_password_hash" in monitor.last_block["stack"]
+    assert not monitor.running
+
+
+def test_profile_endpoint_requires_token(client, monkeypatch):
+    """Test that /debug/profile is hidden without a token and rejects a wrong one."""
+    monkeypatch.setattr(settings, "debug_token", None)
+    assert client.get("/debug/profile?seconds=0.1").status_code == 404
+    
+    monkeypatch.setattr(settings, "debug_token", "s3cret")
+    response = client.get("/debug/profile?seconds=0.1", headers={"X-Debug-Token": "wrong"})
+    assert response.status_code == 403
+
+
+def test_profile_endpoint_returns_flame_graph(client, monkeypatch):
+    """Test collapsed and speedscope profiles, with the profiler overhead reported."""
+    monkeypatch.setattr(settings, "debug_token", "s3cret")
+    headers = {"X-Debug-Token": "s3cret"}
+    
+    collapsed = client.get("/debug/profile?seconds=0.2&hz=100", headers=headers)
+    assert collapsed.status_code == 200
+    assert float(collapsed.headers["X-Profiler-Overhead-Percent"]) >= 0
+    assert int(collapsed.headers["X-Profiler-Samples"]) > 0
+    stack, count = collapsed.text.splitlines()[0].rsplit(" ", 1)
+    assert stack.startswith(("thread:", "task:")) and int(count) > 0
+    
+    speedscope = client.get(
+        "/debug/profile?seconds=0.2&hz=100&format=speedscope", headers=headers
+    ).json()
+    profile = speedscope["profiles"][0]
+    assert profile["type"] == "sampled"
+    assert len(profile["samples"]) == len(profile["weights"]) > 0
+    assert "overhead" in profile["name"]
+
+
+def test_memory_snapshots_and_diff(client, monkeypatch):
+    """Test taking heap snapshots and diffing them by module."""
+    monkeypatch.setattr(settings, "debug_token", "s3cret")
+    headers = {"X-Debug-Token": "s3cret"}
+    
+    assert client.post("/debug/memory/snapshots", headers=headers).status_code == 409
+    
+    assert client.post("/debug/memory/start", headers=headers).json()["tracing"] is True
+    try:
+        base = client.post("/debug/memory/snapshots", headers=headers).json()
+        retained = [bytearray(1024) for _ in range(2000)]
+        target = client.post(
+            "/debug/memory/snapshots?group_by=module", headers=headers
+        ).json()
+        assert target["top"] and "module" in target["top"][0]
+        
+        diff = client.get(
+            f"/debug/memory/diff?base={base['id']}&target={target['id']}", headers=headers
+        ).json()
+        growth = {entry["module"]: entry["size_diff_kb"] for entry in diff["modules"]}
+        assert growth["tests"] >= 1900
+        assert memory_module_bytes.labels(module="tests")._value.get() >= 2000 * 1024
+        del retained
+        
+        assert client.get("/debug/memory/diff?base=999&target=1", headers=headers).status_code == 404
+    finally:
+        assert client.post("/debug/memory/stop", headers=headers).json()["tracing"] is False
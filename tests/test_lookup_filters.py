@@ -0,0 +1,160 @@
+import time
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+
+from app.bp import GetUserUseCase, SignupUseCase
+from app.bp.domain import UserReadModel
+from app.data import (
+    DataSource,
+    EncryptRepositoryImp,
+    StatsRepositoryImp,
+    UserCreateRepositoryImp,
+    UserReadRepositoryImp,
+)
+from app.core.ids import uuid7
+from app.di import container
+from app.infrastructure.lookup_filter import BloomFilter, EmailFilter, ReadModelFilter, UserIdFilter
+
+
+async def create_read_models(count: int) -> list[UserReadModel]:
+    return [
+        await UserReadModel.create(
+            id=uuid7(),
+            name=f"User {i}",
+            email=f"user{i}@example.com",
+            display_name=f"user{i}",
+            created_at=datetime.now(timezone.utc),
+        )
+        for i in range(count)
+    ]
+
+
+def old_id() -> uuid.UUID:
+    """A uuid7 from an hour ago, older than any filter watermark."""
+    return uuid7(int((time.time() - 3600) * 1000))
+
+
+class CountingDataSource(DataSource):
+    def __init__(self):
+        super().__init__()
+        self.lookups = 0
+    
+    async def get_user_by_id(self, id):
+        self.lookups += 1
+        return await super().get_user_by_id(id)
+    
+    async def get_user_by_email(self, email):
+        self.lookups += 1
+        return await super().get_user_by_email(email)
+
+
+def test_bloom_filter_has_no_false_negatives():
+    """Test that added keys are always found and absent ones rarely are."""
+    bloom = BloomFilter(capacity=5000, error_rate=0.01)
+    keys = [uuid.uuid4().bytes for _ in range(5000)]
+    for key in keys:
+        bloom.add(key)
+    
+    assert all(key in bloom for key in keys)
+    false_positives = sum(uuid.uuid4().bytes in bloom for _ in range(20000))
+    assert false_positives / 20000 < 0.02
+    assert 0.005 < bloom.false_positive_rate < 0.015
+    assert abs(bloom.approximate_count - 5000) < 250
+
+
+def test_read_model_filter_needs_a_key():
+    """Test that a filter without a key encoding can't be built."""
+    class NoKeyFilter(ReadModelFilter):
+        name = "no_key"
+        field = "id"
+    
+    with pytest.raises(TypeError):
+        NoKeyFilter(DataSource())
+
+
+async def test_filter_builds_syncs_and_goes_stale(db):
+    """Test that the filter learns ids from the build, projection and sync, and trusts no negative when stale."""
+    users = await create_read_models(25)
+    user_id_filter = UserIdFilter(DataSource(), capacity=1000, chunk_size=7, sync_overlap_seconds=60)
+    unknown = old_id()
+    
+    assert user_id_filter.might_contain(unknown)
+    assert await user_id_filter.build() == 25
+    assert all(user_id_filter.might_contain(user.id) for user in users)
+    assert not user_id_filter.might_contain(unknown)
+    
+    projected = old_id()
+    user_id_filter.add(projected)
+    assert user_id_filter.might_contain(projected)
+    
+    # ids without a timestamp are never provably absent
+    assert user_id_filter.might_contain(uuid.uuid4())
+    
+    user_id_filter.max_staleness_seconds = 0
+    assert user_id_filter.might_contain(unknown)
+
+
+async def test_unknown_user_is_404_without_a_query(client):
+    """Test that GET /users/{id} of an id the filter never saw skips the database."""
+    user, = await create_read_models(1)
+    data_source = CountingDataSource()
+    user_id_filter = UserIdFilter(data_source)
+    await user_id_filter.build()
+    use_case = GetUserUseCase(UserReadRepositoryImp(data_source, user_id_filter))
+    
+    with container.override(get_user_use_case=use_case):
+        assert client.get(f"/users/{old_id()}").status_code == 404
+        assert data_source.lookups == 0
+        assert client.get(f"/users/{user.id}").status_code == 200
+        assert data_source.lookups == 1
+
+
+async def test_user_from_another_data_source_is_found_before_the_sync(client):
+    """Test that users the filter can't have seen yet are read from the database, not a 404."""
+    data_source = CountingDataSource()
+    user_id_filter = UserIdFilter(data_source, sync_overlap_seconds=0)
+    await user_id_filter.build()
+    use_case = GetUserUseCase(UserReadRepositoryImp(data_source, user_id_filter))
+    
+    # written through another data source (another worker), after the build, no sync since
+    other, = await create_read_models(1)
+    legacy = await UserReadModel.create(
+        id=uuid.uuid4(),
+        name="Legacy",
+        email="legacy@example.com",
+        display_name="legacy",
+        created_at=datetime.now(timezone.utc),
+    )
+    
+    with container.override(get_user_use_case=use_case):
+        assert client.get(f"/users/{other.id}").status_code == 200
+        assert client.get(f"/users/{legacy.id}").status_code == 200
+        assert data_source.lookups == 2
+
+
+async def test_new_emails_skip_the_duplicate_lookup(client):
+    """Test that signups with unseen emails skip the lookup and duplicates still get a 409."""
+    data_source = CountingDataSource()
+    email_filter = EmailFilter(data_source)
+    await email_filter.build()
+    use_case = SignupUseCase(
+        UserCreateRepositoryImp(data_source, email_filter),
+        UserReadRepositoryImp(data_source),
+        EncryptRepositoryImp(),
+        StatsRepositoryImp(data_source),
+    )
+    payload = {"name": "Ana", "email": "Ana@Example.com", "password": "S3cure!123", "display_name": "Ana G"}
+    
+    with container.override(signup_use_case=use_case):
+        assert client.post("/signup", json=payload).status_code == 201
+        assert data_source.lookups == 0
+        # known to the filter (added on create, normalized): looked up
+        assert client.post("/signup", json=payload).status_code == 409
+        assert data_source.lookups == 1
+        
+        # taken on another worker, not synced yet: the unique index catches it
+        email_filter._filter = BloomFilter(1000)
+        assert client.post("/signup", json=payload).status_code == 409
+        assert data_source.lookups == 1
@@ -0,0 +1,209 @@
+import os
+import subprocess
+import sys
+import threading
+import uuid
+from pathlib import Path
+
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+from opentelemetry.sdk.trace import TracerProvider
+from tortoise import Tortoise
+
+from app.api.middleware.request_context import RequestContextMiddleware
+from app.api.routing import StageTimingRoute
+from app.core.config import settings
+from app.infrastructure.metrics import (
+    build_multiprocess_registry,
+    cleanup_dead_workers,
+    db_query_budget_exceeded_total,
+    fingerprint_query,
+    instrument_connection,
+)
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+WORKER_SCRIPT = """
+from app.infrastructure.metrics import signup_requests_total, http_request_duration_seconds
+
+for _ in range({requests}):
+    signup_requests_total.labels(status="success").inc()
+    http_request_duration_seconds.labels(method="POST", endpoint="/signup").observe(0.02)
+"""
+
+
+def test_multiprocess_metrics_are_aggregated_across_workers(tmp_path):
+    """Test that /metrics totals include the samples of every worker process."""
+    workers = 3
+    requests_per_worker = 25
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path), "ENABLE_LOGGING": "False"}
+    
+    processes = [
+        subprocess.Popen(
+            [sys.executable, "-c", WORKER_SCRIPT.format(requests=requests_per_worker)],
+            cwd=PROJECT_ROOT,
+            env=env,
+        )
+        for _ in range(workers)
+    ]
+    for process in processes:
+        assert process.wait(timeout=60) == 0
+    
+    registry = build_multiprocess_registry(str(tmp_path))
+    expected = workers * requests_per_worker
+    
+    assert registry.get_sample_value(
+        "signup_requests_total", {"status": "success"}
+    ) == expected
+    assert registry.get_sample_value(
+        "http_request_duration_seconds_count", {"method": "POST", "endpoint": "/signup"}
+    ) == expected
+    
+    # all workers have exited, their files are reported as dead
+    assert len(cleanup_dead_workers(str(tmp_path))) == workers
+
+
+def test_metrics_negotiates_openmetrics_and_gzip(client):
+    """Test that /metrics honours Accept and Accept-Encoding."""
+    response = client.get(
+        "/metrics",
+        headers={
+            "Accept": "application/openmetrics-text; version=1.0.0",
+            "Accept-Encoding": "gzip",
+        },
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/openmetrics-text")
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept, Accept-Encoding"
+    # httpx transparently decompresses the payload
+    assert response.text.rstrip().endswith("# EOF")
+    
+    plain = client.get("/metrics", headers={"Accept-Encoding": "identity"})
+    assert plain.headers["content-type"].startswith("text/plain")
+    assert "content-encoding" not in plain.headers
+    assert plain.headers["vary"] == "Accept, Accept-Encoding"
+
+
+def test_request_duration_carries_trace_exemplar(client, monkeypatch):
+    """Test that OpenMetrics output links request duration buckets to the trace."""
+    monkeypatch.setattr(settings, "enable_tracing", True)
+    tracer = TracerProvider().get_tracer(__name__)
+    
+    with tracer.start_as_current_span("GET /health") as span:
+        assert client.get("/health").status_code == 200
+        trace_id = format(span.get_span_context().trace_id, "032x")
+    
+    response = client.get("/metrics", headers={"Accept": "application/openmetrics-text; version=1.0.0"})
+    buckets = [
+        line for line in response.text.splitlines()
+        if line.startswith("http_request_duration_seconds_bucket{") and 'endpoint="/health"' in line
+    ]
+    # e.g. http_request_duration_seconds_bucket{...,le="0.005"} 1.0 # {trace_id="..."} 0.0012 1.7e+09
+    assert any(f' # {{trace_id="{trace_id}"}} ' in line for line in buckets)
+
+
+def test_server_timing_header_breaks_down_signup_stages(client, monkeypatch):
+    """Test that signup stages are reported in Server-Timing when debug is on."""
+    monkeypatch.setattr(settings, "debug", True)
+    payload = {
+        "name": "Ana",
+        "email": "timing@example.com",
+        "password": "S3cure!123",
+        "display_name": "Ana G",
+    }
+    
+    response = client.post("/signup", json=payload, headers={"Idempotency-Key": str(uuid.uuid4())})
+    assert response.status_code == 201
+    
+    stages = {entry.split(";")[0].strip() for entry in response.headers["Server-Timing"].split(",")}
+    assert stages >= {
+        "idempotency_lookup",
+        "validation",
+        "duplicate_check",
+        "password_hash",
+        "write_insert",
+        "projection_insert",
+        "serialization",
+        "idempotency_store",
+        "total",
+    }
+    
+    monkeypatch.setattr(settings, "debug", False)
+    assert "Server-Timing" not in client.get("/health").headers
+
+
+def test_stage_timing_route_runs_sync_endpoints_in_threadpool(monkeypatch):
+    """Test that plain def endpoints work with the stage timing route class."""
+    monkeypatch.setattr(settings, "debug", True)
+    router = APIRouter(route_class=StageTimingRoute)
+    
+    @router.get("/sync")
+    def sync_endpoint(name: str = "Ana"):
+        return {"name": name, "thread": threading.get_ident()}
+    
+    @router.get("/async")
+    async def async_endpoint():
+        return {"thread": threading.get_ident()}
+    
+    app = FastAPI()
+    app.add_middleware(RequestContextMiddleware)
+    app.include_router(router)
+    
+    with TestClient(app) as client:
+        response = client.get("/sync", params={"name": "Bo"})
+        loop_thread = client.get("/async").json()["thread"]
+    assert response.status_code == 200
+    assert response.json()["name"] == "Bo"
+    # off the event loop
+    assert response.json()["thread"] != loop_thread
+    stages = {entry.split(";")[0].strip() for entry in response.headers["Server-Timing"].split(",")}
+    assert {"validation", "serialization"} <= stages
+
+
+def test_db_queries_are_counted_per_request(client, monkeypatch):
+    """Test that per-request statements are counted and checked against the budget."""
+    instrument_connection(Tortoise.get_connection("default"))
+    monkeypatch.setattr(settings, "debug", True)
+    monkeypatch.setattr(settings, "db_query_budget", 2)
+    exceeded = db_query_budget_exceeded_total.labels(endpoint="/signup")
+    exceeded_before = exceeded._value.get()
+    payload = {
+        "name": "Ana",
+        "email": "queries@example.com",
+        "password": "S3cure!123",
+        "display_name": "Ana G",
+    }
+    
+    response = client.post("/signup", json=payload)
+    assert response.status_code == 201
+    
+    # duplicate check + write insert + projection insert + stats update
+    assert 'desc="4 queries"' in response.headers["Server-Timing"]
+    assert exceeded._value.get() == exceeded_before + 1
+
+
+def test_metrics_are_labelled_by_route_template(client):
+    """Test that path parameters don't create a series per value."""
+    from prometheus_client import REGISTRY
+    
+    http_labels = {"method": "GET", "endpoint": "/users/{user_id}", "status": "404"}
+    query_labels = {"endpoint": "/users/{user_id}"}
+    http_before = REGISTRY.get_sample_value("http_requests_total", http_labels) or 0.0
+    queries_before = REGISTRY.get_sample_value("db_queries_per_request_count", query_labels) or 0.0
+    
+    for _ in range(2):
+        assert client.get(f"/users/{uuid.uuid4()}").status_code == 404
+    
+    assert REGISTRY.get_sample_value("http_requests_total", http_labels) == http_before + 2
+    assert REGISTRY.get_sample_value("db_queries_per_request_count", query_labels) == queries_before + 2
+
+
+def test_fingerprint_query_strips_values():
+    """Test that statements differing only in values share a fingerprint."""
+    assert fingerprint_query(
+        "SELECT * FROM users WHERE email='a@b.c' AND id IN (?, ?,?) LIMIT 2"
+    ) == fingerprint_query(
+        "SELECT *  FROM users\n WHERE email='x@y.z' AND id IN (?,?) LIMIT 10"
+    )
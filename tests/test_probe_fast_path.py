@@ -0,0 +1,34 @@
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from app.main import app as original_app
+
+
+def probe_count(path: str, status: str) -> float:
+    return REGISTRY.get_sample_value(
+        "probe_requests_total", {"path": path, "status": status}
+    ) or 0.0
+
+
+def test_probes_bypass_middleware_stack():
+    """Test that GET probes are served by the fast path, outside the middlewares."""
+    client = TestClient(original_app)
+    before = probe_count("/health", "200")
+    
+    response = client.get("/health")
+    
+    assert response.status_code == 200
+    assert response.json()["status"] == "healthy"
+    # RequestContextMiddleware would have set it
+    assert "X-Request-Id" not in response.headers
+    assert probe_count("/health", "200") == before + 1
+
+
+def test_other_methods_use_regular_stack():
+    """Test that non-GET requests to probe paths still go through the middlewares."""
+    client = TestClient(original_app)
+    
+    response = client.post("/health")
+    
+    assert response.status_code == 405
+    assert "X-Request-Id" in response.headers
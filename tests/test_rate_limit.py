@@ -0,0 +1,162 @@
+import asyncio
+import math
+import uuid
+
+from prometheus_client import REGISTRY
+
+from app.core.config import settings
+from app.infrastructure.rate_limit import (
+    InMemoryTokenBucketBackend,
+    RateLimiter,
+    RedisTokenBucketBackend,
+    normalize_email,
+)
+from app.infrastructure.rate_limit.backends import TOKEN_BUCKET_SCRIPT
+
+
+def rejections(key_type: str) -> float:
+    return REGISTRY.get_sample_value(
+        "rate_limit_rejections_total", {"endpoint": "/signup", "key_type": key_type}
+    ) or 0.0
+
+
+def test_signup_rate_limited_by_email(client):
+    """Test that signup bursts for one email get a 429 with Retry-After."""
+    payload = {
+        "name": "Ana",
+        "email": "Limited+1@Example.com",
+        "password": "S3cure!123",
+        "display_name": "Ana G",
+    }
+    before = rejections("email")
+    
+    assert client.post("/signup", json=payload).status_code == 201
+    for _ in range(settings.rate_limit_email_burst - 1):
+        assert client.post("/signup", json={**payload, "email": "limited@example.com"}).status_code != 429
+    
+    response = client.post("/signup", json={**payload, "email": "LIMITED+2@example.com"})
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+    assert rejections("email") == before + 1
+
+
+def test_idempotent_replays_are_not_rate_limited(client):
+    """Test that retries replayed from the idempotency store don't spend tokens."""
+    payload = {
+        "name": "Ana",
+        "email": "replayed@example.com",
+        "password": "S3cure!123",
+        "display_name": "Ana G",
+    }
+    headers = {"Idempotency-Key": str(uuid.uuid4())}
+    before = rejections("email")
+    
+    for _ in range(settings.rate_limit_email_burst + 2):
+        assert client.post("/signup", json=payload, headers=headers).status_code == 201
+    assert rejections("email") == before
+
+
+def test_normalize_email():
+    assert normalize_email(" John.Doe+news@Example.COM ") == "john.doe@example.com"
+    assert normalize_email("not-an-email") == "not-an-email"
+
+
+async def test_memory_backend_refills_and_evicts():
+    """Test token refill and the per-shard bucket limit."""
+    backend = InMemoryTokenBucketBackend(shards=1, max_keys=2)
+    
+    assert await backend.acquire("a", rate=100, capacity=1) == 0
+    assert await backend.acquire("a", rate=100, capacity=1) > 0
+    await asyncio.sleep(0.02)
+    assert await backend.acquire("a", rate=100, capacity=1) == 0
+    
+    await backend.acquire("b", rate=1, capacity=1)
+    await backend.acquire("c", rate=1, capacity=1)
+    assert len(backend) == 2
+
+
+class FakeRedis:
+    """
+    In-process Redis running TOKEN_BUCKET_SCRIPT: hashes with expiry and a
+    server clock (`now`) the test moves forward.
+    """
+    
+    def __init__(self):
+        self.now = 1_000.0
+        self.hashes: dict[str, dict[str, float]] = {}
+        self.expires_at: dict[str, float] = {}
+    
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+    
+    async def eval(self, script, numkeys, *args):
+        assert script == TOKEN_BUCKET_SCRIPT and numkeys == 1
+        key, rate, capacity, cost = args[0], float(args[1]), float(args[2]), float(args[3])
+        if self.expires_at.get(key, self.now + 1) <= self.now:
+            del self.hashes[key], self.expires_at[key]
+        state = self.hashes.get(key, {})
+        tokens = state.get("tokens", capacity)
+        ts = state.get("ts", self.now)
+        tokens = min(capacity, tokens + max(0.0, self.now - ts) * rate)
+        retry_after = 0
+        if tokens >= cost:
+            tokens -= cost
+        else:
+            retry_after = (cost - tokens) / rate
+        self.hashes[key] = {"tokens": tokens, "ts": self.now}
+        self.expires_at[key] = self.now + math.ceil(capacity / rate) + 1
+        return str(retry_after).encode()
+
+
+async def test_redis_backend_refills_up_to_capacity():
+    """Test the script's refill, burst capacity, retry-after and key expiry."""
+    client = FakeRedis()
+    backend = RedisTokenBucketBackend(client)
+    key = "/signup:ip:10.0.0.1"
+    
+    for _ in range(3):
+        assert await backend.acquire(key, rate=0.5, capacity=3) == 0
+    assert await backend.acquire(key, rate=0.5, capacity=3) == 2.0
+    assert list(client.hashes) == ["ratelimit:" + key]
+    
+    client.advance(1)
+    assert await backend.acquire(key, rate=0.5, capacity=3) == 1.0
+    client.advance(2)
+    assert await backend.acquire(key, rate=0.5, capacity=3) == 0
+    
+    # refill stops at capacity (0.5 + 3 tokens > 3)
+    client.advance(6)
+    for _ in range(3):
+        assert await backend.acquire(key, rate=0.5, capacity=3) == 0
+    assert await backend.acquire(key, rate=0.5, capacity=3) > 0
+    
+    # idle past its expiry: a fresh, full bucket
+    client.advance(60)
+    assert await backend.acquire(key, rate=0.5, capacity=3) == 0
+    assert client.hashes["ratelimit:" + key]["tokens"] == 2
+
+
+async def test_redis_backend_limit_is_shared_between_pods():
+    """Test that limiters of two pods on one store share the buckets."""
+    client = FakeRedis()
+    pods = [RateLimiter(RedisTokenBucketBackend(client), rules={"ip": (1.0, 4)}) for _ in range(2)]
+    keys = {"ip": "10.0.0.1"}
+    
+    for i in range(4):
+        assert await pods[i % 2].check("/signup", keys) == 0
+    assert await pods[0].check("/signup", keys) == 1.0
+    assert await pods[1].check("/signup", keys) == 1.0
+    assert await pods[1].check("/signup", {"ip": "10.0.0.2"}) == 0
+    
+    client.advance(1)
+    assert await pods[1].check("/signup", keys) == 0
+    assert await pods[0].check("/signup", keys) > 0
+
+
+async def test_limiter_fails_open_on_backend_error():
+    class BrokenBackend(InMemoryTokenBucketBackend):
+        async def acquire(self, *args, **kwargs):
+            raise ConnectionError("store down")
+    
+    limiter = RateLimiter(BrokenBackend(), rules={"ip": (1.0, 1)})
+    assert await limiter.check("/signup", {"ip": "10.0.0.1"}) == 0
@@ -0,0 +1,219 @@
+import asyncio
+import json
+import uuid
+
+import pytest
+
+from app.bp.domain import User, UserReadModel
+from app.data import DataSource
+from app.infrastructure.database import AdvisoryLock
+from app.infrastructure.read_model import (
+    ReadModelDriftChecker,
+    ReadModelRebuilder,
+    RebuildAlreadyRunningError,
+    read_model_divergent_rows,
+)
+from app.core.ids import uuid7
+
+
+async def create_users(count: int) -> list[User]:
+    return [
+        await User.create(
+            id=uuid.uuid4(),
+            name=f"User {i}",
+            email=f"user{i}@example.com",
+            password_hash="hash",
+            display_name=f"user{i}",
+        )
+        for i in range(count)
+    ]
+
+
+async def test_rebuild_projects_every_user(db, tmp_path):
+    """Test that the rebuild upserts all users, fixing stale rows, and removes its checkpoint."""
+    users = await create_users(25)
+    await UserReadModel.create(
+        id=users[0].id, name="stale", email="stale@example.com",
+        display_name="stale", created_at=users[0].created_at,
+    )
+    checkpoint = tmp_path / "checkpoint.json"
+    rebuilder = ReadModelRebuilder(DataSource(), checkpoint_path=str(checkpoint))
+    
+    status = await rebuilder.run(chunk_size=4, workers=3)
+    
+    assert status["state"] == "completed"
+    assert status["rows"] == 25
+    assert await UserReadModel.all().count() == 25
+    assert (await UserReadModel.get(id=users[0].id)).name == "User 0"
+    assert not checkpoint.exists()
+
+
+class FailingDataSource(DataSource):
+    def __init__(self, fail_after: int):
+        super().__init__()
+        self.fail_after = fail_after
+    
+    async def upsert_user_read_models(self, users):
+        if self.fail_after <= 0:
+            raise RuntimeError("database unavailable")
+        self.fail_after -= 1
+        await super().upsert_user_read_models(users)
+
+
+async def test_rebuild_resumes_from_checkpoint(db, tmp_path):
+    """Test that a failed rebuild keeps its checkpoint and the next run continues after it."""
+    await create_users(10)
+    checkpoint = tmp_path / "checkpoint.json"
+    
+    failing = ReadModelRebuilder(FailingDataSource(fail_after=2), checkpoint_path=str(checkpoint))
+    with pytest.raises(RuntimeError):
+        await failing.run(chunk_size=3, workers=1)
+    
+    assert failing.status()["state"] == "failed"
+    saved = json.loads(checkpoint.read_text())
+    assert saved["rows"] == 6
+    
+    status = await ReadModelRebuilder(DataSource(), checkpoint_path=str(checkpoint)).run(chunk_size=3, workers=2)
+    
+    assert status["resumed_from"] == saved["last_id"]
+    assert status["rows"] == 4
+    assert status["total_rows"] == 10
+    assert await UserReadModel.all().count() == 10
+
+
+class DigestCountingDataSource(DataSource):
+    def __init__(self):
+        super().__init__()
+        self.digest_queries = 0
+    
+    async def get_id_bucket_digests(self, model, suffix, length, connection=None):
+        self.digest_queries += 1
+        return await super().get_id_bucket_digests(model, suffix, length, connection)
+
+
+async def test_drift_check_stays_shallow_with_time_ordered_ids(db):
+    """Test that uuid7 ids, sharing their leading digits, still split into balanced buckets."""
+    await User.bulk_create([
+        User(
+            id=uuid7(1_760_000_000_000 + i), name=f"User {i}", email=f"user{i}@example.com",
+            password_hash="hash", display_name=f"user{i}",
+        )
+        for i in range(300)
+    ])
+    await ReadModelRebuilder(DataSource()).run(chunk_size=500, workers=1)
+    stale = await UserReadModel.first()
+    await UserReadModel.filter(id=stale.id).update(display_name="stale")
+    data_source = DigestCountingDataSource()
+    
+    report = await ReadModelDriftChecker(data_source, leaf_size=64, grace_seconds=0).check(repair=False)
+    
+    assert report["stale"] == 1
+    # the root split already leaves about 300 / 16 rows per bucket: one level per table
+    assert data_source.digest_queries == 2
+    assert report["buckets_compared"] <= 16
+
+
+async def test_drift_check_finds_and_repairs_divergent_rows(db):
+    """Test that missing, stale and orphaned read model rows are found and repaired."""
+    users = await create_users(40)
+    await ReadModelRebuilder(DataSource()).run(chunk_size=100, workers=1)
+    checker = ReadModelDriftChecker(DataSource(), leaf_size=4, grace_seconds=0)
+    
+    clean = await checker.check()
+    assert clean["divergent_rows"] == 0
+    assert clean["leaves"] == 0
+    
+    await UserReadModel.filter(id=users[0].id).delete()
+    await UserReadModel.filter(id=users[1].id).update(display_name="stale")
+    await UserReadModel.create(
+        id=uuid.uuid4(), name="orphan", email="orphan@example.com",
+        display_name="orphan", created_at=users[2].created_at,
+    )
+    
+    report = await checker.check(repair=False)
+    assert (report["missing"], report["stale"], report["orphaned"]) == (1, 1, 1)
+    assert read_model_divergent_rows._value.get() == 3
+    
+    repaired = await checker.check()
+    assert repaired["repaired"] == 3
+    assert (await checker.check())["divergent_rows"] == 0
+    assert await UserReadModel.all().count() == 40
+    assert (await UserReadModel.get(id=users[1].id)).display_name == "user1"
+
+
+async def test_drift_check_skips_signups_in_flight(db):
+    """Test that users younger than the grace period are not reported missing."""
+    await create_users(3)
+    checker = ReadModelDriftChecker(DataSource(), grace_seconds=60)
+    
+    report = await checker.check()
+    
+    assert report["divergent_rows"] == 0
+    assert await UserReadModel.all().count() == 0
+
+
+class SingleHolderLock:
+    """Grants the lock to the first checker asking, like pg_try_advisory_lock across workers."""
+    
+    holder = None
+    
+    def __init__(self, owner: str):
+        self.owner = owner
+    
+    async def try_acquire(self) -> bool:
+        if SingleHolderLock.holder is None:
+            SingleHolderLock.holder = self.owner
+        return SingleHolderLock.holder == self.owner
+    
+    async def release(self) -> None:
+        if SingleHolderLock.holder == self.owner:
+            SingleHolderLock.holder = None
+
+
+async def test_periodic_drift_check_runs_in_one_worker(db):
+    """Test that only the lock holder runs the periodic check and another worker takes over."""
+    checkers = [
+        ReadModelDriftChecker(DataSource(), grace_seconds=0, lock=SingleHolderLock(worker))
+        for worker in ("a", "b")
+    ]
+    for checker in checkers:
+        checker.start(interval_seconds=0.01)
+    await asyncio.sleep(0.1)
+    assert checkers[0].last_report is not None
+    assert checkers[1].last_report is None
+    
+    await checkers[0].stop()
+    await asyncio.sleep(0.1)
+    await checkers[1].stop()
+    assert checkers[1].last_report is not None
+
+
+async def test_advisory_lock_is_always_granted_without_postgres(db):
+    """Test that backends without advisory locks (SQLite) grant the lock to every worker."""
+    locks = [AdvisoryLock("read-model-drift-check") for _ in range(2)]
+    
+    assert [await lock.try_acquire() for lock in locks] == [True, True]
+    for lock in locks:
+        await lock.release()
+        assert not lock.held
+
+
+async def test_rebuild_runs_once_per_process_and_across_workers(db, tmp_path):
+    """Test that a second rebuild is refused in the same worker and in another one."""
+    await create_users(5)
+    checkpoint = str(tmp_path / "checkpoint.json")
+    SingleHolderLock.holder = None
+    worker_a, worker_b = (
+        ReadModelRebuilder(DataSource(), checkpoint_path=checkpoint, lock=SingleHolderLock(worker))
+        for worker in ("a", "b")
+    )
+    
+    started = await asyncio.gather(worker_a.start(), worker_a.start(), return_exceptions=True)
+    
+    assert sorted(type(result).__name__ for result in started) == ["RebuildAlreadyRunningError", "dict"]
+    with pytest.raises(RebuildAlreadyRunningError):
+        await worker_b.run()
+    await worker_a._task
+    assert worker_a.status()["state"] == "completed"
+    assert not worker_a.running
+    assert (await worker_b.run())["rows"] == 5
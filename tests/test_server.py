@@ -0,0 +1,29 @@
+import signal
+import time
+
+from app.core.config import settings
+from app.infrastructure.health import health_checker
+from app.server import DrainingServer, build_config, worker_count
+
+
+def test_worker_count_from_settings(monkeypatch):
+    """Test that SERVER_WORKERS overrides the CPU-based worker count."""
+    monkeypatch.setattr(settings, "server_workers", 3)
+    assert worker_count() == 3
+    assert build_config().workers == 3
+    
+    monkeypatch.setattr(settings, "server_workers", None)
+    assert worker_count() >= 1
+
+
+async def test_sigterm_drains_before_exit(monkeypatch):
+    """Test that SIGTERM flips readiness first and stops the server after the delay."""
+    monkeypatch.setattr(health_checker, "draining", False)
+    server = DrainingServer(build_config(), unready_delay=0.05)
+    
+    server.handle_exit(signal.SIGTERM, None)
+    assert health_checker.draining
+    assert not await server.on_tick(1)
+    
+    time.sleep(0.06)
+    assert await server.on_tick(2)
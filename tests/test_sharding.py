@@ -0,0 +1,158 @@
+import uuid
+
+import pytest
+from tortoise import Tortoise
+from tortoise.exceptions import IntegrityError
+
+from app.bp.domain import User, UserEmailIndex, UserReadModel
+from app.core.database import TORTOISE_ORM, generate_shard_schemas, shard_connection_name
+from app.data import ShardedDataSource
+from app.infrastructure.read_model import ReadModelDriftChecker
+from app.infrastructure.sharding import HashRing
+
+
+SHARDS = ["s0", "s1", "s2"]
+
+
+@pytest.fixture
+async def sharded_db(tmp_path):
+    """A default database plus one SQLite file per shard."""
+    config = {
+        "connections": {
+            "default": "sqlite://:memory:",
+            **{
+                shard_connection_name(shard): f"sqlite://{tmp_path}/{shard}.db"
+                for shard in SHARDS + ["s3"]
+            },
+        },
+        "apps": TORTOISE_ORM["apps"],
+    }
+    await Tortoise.init(config=config)
+    await Tortoise.generate_schemas()
+    await generate_shard_schemas(SHARDS + ["s3"])
+    
+    yield
+    
+    await Tortoise.close_connections()
+
+
+async def signup(data_source: ShardedDataSource, i: int) -> User:
+    user = await data_source.create_user(
+        id=uuid.uuid4(),
+        name=f"User {i}",
+        email=f"user{i}@example.com",
+        password_hash="hash",
+        display_name=f"user{i}",
+    )
+    await data_source.project_user_read_model(
+        id=user.id, name=user.name, email=user.email,
+        display_name=user.display_name, created_at=user.created_at,
+    )
+    return user
+
+
+async def shard_ids(data_source: ShardedDataSource, model, shard: str) -> set:
+    return set(await model.all().using_db(data_source.connection(shard)).values_list("id", flat=True))
+
+
+def test_ring_moves_only_keys_taken_by_a_new_shard():
+    """Test that adding a shard moves about 1/N of the keys, all to the new shard."""
+    keys = [uuid.uuid4() for _ in range(4000)]
+    before, after = HashRing(SHARDS), HashRing(SHARDS + ["s3"])
+    
+    moved = [key for key in keys if before.shard_for(key) != after.shard_for(key)]
+    
+    assert {after.shard_for(key) for key in moved} == {"s3"}
+    assert 0.15 < len(moved) / len(keys) < 0.35
+    assert set(before.group(keys)) == set(SHARDS)
+
+
+async def test_users_are_routed_to_their_shard(sharded_db):
+    """Test that writes land on the owner shard and reads by id, email and ids find them."""
+    data_source = ShardedDataSource(SHARDS)
+    users = [await signup(data_source, i) for i in range(30)]
+    
+    for shard in SHARDS:
+        owned = {user.id for user in users if data_source.ring.shard_for(user.id) == shard}
+        assert await shard_ids(data_source, User, shard) == owned
+        assert await shard_ids(data_source, UserReadModel, shard) == owned
+    
+    assert (await data_source.get_user_by_id(users[3].id)).email == "user3@example.com"
+    assert (await data_source.get_user_by_email("user7@example.com")).id == users[7].id
+    assert await data_source.get_user_by_email("nobody@example.com") is None
+    found = await data_source.get_users_by_ids([user.id for user in users[:10]])
+    assert {user.id for user in found} == {user.id for user in users[:10]}
+    
+    page = await data_source.get_users_page(None, 12)
+    assert [user["id"] for user in page] == sorted(user.id for user in users)[:12]
+    
+    with pytest.raises(IntegrityError):
+        await signup(data_source, 5)
+
+
+async def test_drift_check_spans_shards(sharded_db):
+    """Test that the drift checker sums bucket digests over the shards."""
+    data_source = ShardedDataSource(SHARDS)
+    users = [await signup(data_source, i) for i in range(20)]
+    await data_source.delete_user_read_models([users[0].id, users[1].id])
+    
+    report = await ReadModelDriftChecker(data_source, leaf_size=4, grace_seconds=0).check()
+    
+    assert report["missing"] == 2
+    assert await data_source.get_user_by_id(users[0].id) is not None
+
+
+async def test_drift_check_deletes_orphaned_email_index_entries(sharded_db):
+    """Test that index entries of signups that died before the user insert are removed."""
+    data_source = ShardedDataSource(SHARDS)
+    user = await signup(data_source, 0)
+    # the process died between the index insert and the user insert
+    await UserEmailIndex.create(email="user1@example.com", user_id=uuid.uuid4())
+    checker = ReadModelDriftChecker(data_source, grace_seconds=0)
+    
+    report = await checker.check(repair=False)
+    assert report["orphaned_email_index"] == 1
+    with pytest.raises(IntegrityError):
+        await signup(data_source, 1)
+    
+    report = await checker.check()
+    assert report["orphaned_email_index"] == 1
+    assert await UserEmailIndex.filter(email="user1@example.com").count() == 0
+    assert (await data_source.get_user_by_email("user0@example.com")).id == user.id
+    await signup(data_source, 1)
+    
+    # later checks only read the entries created since
+    assert (await checker.check())["orphaned_email_index"] == 0
+
+
+async def test_drift_check_keeps_index_entries_of_users_not_copied_yet(sharded_db):
+    """Test that users still only on their previous shard during a reshard are not orphans."""
+    old, new = ShardedDataSource(SHARDS), ShardedDataSource(SHARDS + ["s3"])
+    await old.copy_to(new)
+    # signed up on the old layout between copy --to and the restart on the new one
+    i = 0
+    while new.ring.shard_for((user := await signup(old, i)).id) == old.ring.shard_for(user.id):
+        i += 1
+    
+    report = await ReadModelDriftChecker(new, grace_seconds=0).check()
+    
+    assert report["orphaned_email_index"] == 0
+    assert await UserEmailIndex.filter(user_id=user.id).exists()
+
+
+async def test_reshard_copy_then_cleanup(sharded_db):
+    """Test that an added shard takes over its keys and the other shards drop them."""
+    old = ShardedDataSource(SHARDS)
+    users = [await signup(old, i) for i in range(40)]
+    new = ShardedDataSource(SHARDS + ["s3"])
+    
+    copied = await old.copy_to(new, chunk_size=7)
+    deleted = await new.delete_foreign_rows(chunk_size=7)
+    
+    moved = [user for user in users if new.ring.shard_for(user.id) == "s3"]
+    assert copied == len(moved) > 0
+    assert deleted == 2 * len(moved)
+    for user in users:
+        assert (await new.get_user_by_id(user.id)).email == user.email
+        assert (await new.get_user_by_email(user.email)).id == user.id
+    assert await shard_ids(new, User, "s3") == {user.id for user in moved}
@@ -0,0 +1,117 @@
+import subprocess
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+
+from app.bp.domain import UserReadModel
+from app.core.ids import uuid7
+from app.data import DataSource, UserReadRepositoryImp
+from app.infrastructure.lookup_filter import UserIdFilter
+from app.infrastructure.shared_cache import SharedMemoryTable, SharedUserCache
+
+
+WRITER = """
+import sys, uuid
+from app.infrastructure.shared_cache import SharedMemoryTable
+table = SharedMemoryTable(sys.argv[1], slots=1024)
+for i in range(200):
+    table.put(uuid.UUID(int=i).bytes, b"from another process %d" % i)
+"""
+
+
+class CountingDataSource(DataSource):
+    def __init__(self):
+        super().__init__()
+        self.lookups = 0
+    
+    async def get_user_by_id(self, id):
+        self.lookups += 1
+        return await super().get_user_by_id(id)
+
+
+def test_table_stores_evicts_and_expires(tmp_path):
+    """Test put/get, oldest-first eviction in a full bucket, torn slots and the TTL."""
+    table = SharedMemoryTable(str(tmp_path / "cache"), slots=2, slot_size=64, ways=2)
+    a, b, c = (uuid.uuid4().bytes for _ in range(3))
+    
+    table.put(a, b"a")
+    table.put(b, b"b")
+    table.put(a, b"a2")
+    assert table.get(a) == b"a2"
+    assert table.get(c) is None
+    assert not table.put(c, b"x" * 64)
+    
+    table.put(c, b"c")
+    assert table.get(c) == b"c"
+    assert [table.get(a), table.get(b)].count(None) == 1
+    
+    # a payload byte changed without a sequence bump reads as a miss
+    table._mm[-64 + 32] ^= 0xFF
+    assert None in (table.get(a), table.get(b), table.get(c))
+    
+    table.ttl_seconds = -1
+    assert table.get(c) is None
+
+
+def test_table_is_shared_between_processes(tmp_path):
+    """Test that entries written by another process are hits here, and layouts must match."""
+    path = str(tmp_path / "cache")
+    table = SharedMemoryTable(path, slots=1024)
+    
+    subprocess.run([sys.executable, "-c", WRITER, path], check=True)
+    
+    hits = sum(table.get(uuid.UUID(int=i).bytes) is not None for i in range(200))
+    assert hits > 150  # a few evicted by bucket collisions
+    with pytest.raises(ValueError):
+        SharedMemoryTable(path, slots=2048)
+    with pytest.raises(ValueError):
+        SharedMemoryTable(path, slots=1024, ways=8)
+
+
+async def test_repository_serves_projected_users_from_the_cache(db, tmp_path):
+    """Test that projected and read users are served from the shared cache without a query."""
+    data_source = CountingDataSource()
+    cache = SharedUserCache(SharedMemoryTable(str(tmp_path / "cache"), slots=64))
+    repository = UserReadRepositoryImp(data_source, user_cache=cache)
+    other_worker = UserReadRepositoryImp(
+        data_source, user_cache=SharedUserCache(SharedMemoryTable(str(tmp_path / "cache"), slots=64))
+    )
+    created_at = datetime.now(timezone.utc)
+    id = uuid.uuid4()
+    
+    await repository.project_to_read_model(
+        id=id, name="Ana", email="ana@example.com", display_name="Ana G", created_at=created_at
+    )
+    user = await other_worker.get_user_by_id(id)
+    
+    assert (user.id, user.email, user.created_at) == (id, "ana@example.com", created_at)
+    assert data_source.lookups == 0
+    
+    # read-through for users projected before the cache existed
+    stored = await UserReadModel.create(
+        id=uuid.uuid4(), name="Bo", email="bo@example.com", display_name="Bo", created_at=created_at
+    )
+    await repository.get_user_by_id(stored.id)
+    assert (await other_worker.get_user_by_id(stored.id)).name == "Bo"
+    assert data_source.lookups == 1
+
+
+async def test_cache_hit_wins_over_a_filter_miss(db, tmp_path):
+    """Test that a user cached by another worker is served even if this worker's filter never saw it."""
+    data_source = CountingDataSource()
+    user_id_filter = UserIdFilter(data_source)
+    await user_id_filter.build()
+    cache = SharedUserCache(SharedMemoryTable(str(tmp_path / "cache"), slots=64))
+    repository = UserReadRepositoryImp(data_source, user_id_filter, cache)
+    # repaired on another worker with its original (old) id, not in this filter until the rebuild
+    id = uuid7(int((time.time() - 3600) * 1000))
+    assert not user_id_filter.might_contain(id)
+    cache.put(UserReadModel(
+        id=id, name="Cy", email="cy@example.com", display_name="Cy", created_at=datetime.now(timezone.utc)
+    ))
+    
+    assert (await repository.get_user_by_id(id)).name == "Cy"
+    assert data_source.lookups == 0
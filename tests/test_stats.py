@@ -0,0 +1,102 @@
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+from app.bp.domain import User
+from app.bp.get_signup_stats_usecase import BUCKET_SIZES, bucket_start
+from app.data import DataSource
+
+
+def signup(client, email: str) -> datetime:
+    payload = {
+        "name": "Ana",
+        "email": email,
+        "password": "S3cure!123",
+        "display_name": "Ana G",
+    }
+    response = client.post("/signup", json=payload)
+    assert response.status_code == 201
+    return datetime.fromisoformat(response.json()["created_at"])
+
+
+def test_signups_update_stats_incrementally(client):
+    """Test that every signup bumps the hour, day and total counters."""
+    created = [signup(client, "stats1@example.com"), signup(client, "stats2@example.com")]
+    
+    for granularity, buckets in (("day", 30), ("hour", 48)):
+        # ranges end after the last signup, so an hour or day rollover between them can't shift them
+        end = bucket_start(max(created), granularity) + BUCKET_SIZES[granularity]
+        stats = client.get(
+            "/stats/signups", params={"granularity": granularity, "end": end.isoformat()}
+        ).json()
+        assert stats["total_users"] == 2
+        assert len(stats["buckets"]) == buckets
+        assert stats["signups"] == 2
+        counts = {
+            datetime.fromisoformat(bucket["start"]): bucket["count"]
+            for bucket in stats["buckets"] if bucket["count"]
+        }
+        assert counts == Counter(bucket_start(created_at, granularity) for created_at in created)
+
+
+def test_signup_stats_range_is_bounded(client):
+    """Test that ranges over the bucket limit are rejected."""
+    response = client.get(
+        "/stats/signups",
+        params={"granularity": "hour", "start": "2020-01-01T00:00:00", "end": "2021-01-01T00:00:00"},
+    )
+    assert response.status_code == 400
+
+
+async def test_rebuild_signup_stats_backfills_counters(db):
+    """Test that the backfill recounts users per day and in total."""
+    day = datetime(2024, 3, 1, 10, 30, tzinfo=timezone.utc)
+    for i, created_at in enumerate([day, day + timedelta(hours=1), day + timedelta(days=1)]):
+        user = await User.create(
+            id=uuid.uuid4(), name="Ana", email=f"backfill{i}@example.com",
+            password_hash="hash", display_name="Ana G",
+        )
+        await User.filter(id=user.id).update(created_at=created_at)
+    data_source = DataSource()
+    
+    total = await data_source.rebuild_signup_stats(chunk_size=2)
+    
+    assert total == 3
+    assert await data_source.get_total_signups() == 3
+    days = await data_source.get_signup_stats("day", day - timedelta(days=1), day + timedelta(days=2))
+    assert [stat.count for stat in days] == [2, 1]
+    hours = await data_source.get_signup_stats("hour", day - timedelta(hours=1), day + timedelta(hours=3))
+    assert [stat.count for stat in hours] == [1, 1]
+
+
+async def test_rebuild_signup_stats_keeps_concurrent_increments(db):
+    """Test that signups made while the backfill reads users are not lost."""
+    data_source = DataSource()
+    await data_source.increment_signup_stats(datetime(2024, 3, 1, 10, 30, tzinfo=timezone.utc))
+    await User.create(
+        id=uuid.uuid4(), name="Ana", email="before@example.com",
+        password_hash="hash", display_name="Ana G",
+    )
+    read_users = data_source.get_users_page
+    
+    async def get_users_page(after_id, limit, connection=None):
+        users = await read_users(after_id, limit, connection)
+        if after_id is None:
+            # a signup lands between the counter snapshot and the final write
+            user = await User.create(
+                id=uuid.uuid4(), name="Ana", email="during@example.com",
+                password_hash="hash", display_name="Ana G",
+            )
+            await data_source.increment_signup_stats(user.created_at)
+        return users
+    
+    data_source.get_users_page = get_users_page
+    
+    assert await data_source.rebuild_signup_stats() == 1
+    
+    assert await data_source.get_total_signups() == 2
+    stale = datetime(2024, 3, 1, tzinfo=timezone.utc)
+    assert await data_source.get_signup_stats("day", stale, stale + timedelta(days=1)) == []
+    now = datetime.now(timezone.utc)
+    days = await data_source.get_signup_stats("day", now - timedelta(days=2), now + timedelta(days=1))
+    assert sum(stat.count for stat in days) == 2
@@ -0,0 +1,90 @@
+import threading
+import time
+
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor, SpanExportResult
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from opentelemetry.trace import Status, StatusCode
+
+from app.infrastructure.tracing import (
+    CountingBatchSpanProcessor,
+    TailSamplingSpanProcessor,
+    build_sampler,
+    trace_spans_dropped_total,
+)
+
+
+def test_sampler_rate_limits_routes():
+    """Test that routes are capped by their rate limit and 0 never traces."""
+    sampler = build_sampler(ratio=1.0, route_limits={"/ready": 0, "/signup": 2})
+    tracer = TracerProvider(sampler=sampler).get_tracer(__name__)
+    
+    def sampled(route):
+        with tracer.start_as_current_span(f"GET {route}", attributes={"http.route": route}) as span:
+            return span.get_span_context().trace_flags.sampled
+    
+    assert not any(sampled("/ready") for _ in range(5))
+    assert sum(sampled("/signup") for _ in range(10)) == 2
+    assert all(sampled("/users/{user_id}") for _ in range(10))
+
+
+def test_tail_sampling_keeps_error_and_slow_traces():
+    """Test that error and slow traces are always exported and the rest are sampled out."""
+    exporter = InMemorySpanExporter()
+    processor = TailSamplingSpanProcessor(
+        SimpleSpanProcessor(exporter), sample_ratio=0.0, slow_threshold_seconds=0.05
+    )
+    provider = TracerProvider()
+    provider.add_span_processor(processor)
+    tracer = provider.get_tracer(__name__)
+    
+    with tracer.start_as_current_span("fast"):
+        with tracer.start_as_current_span("db"):
+            pass
+    
+    with tracer.start_as_current_span("failing"):
+        with tracer.start_as_current_span("db") as child:
+            child.set_status(Status(StatusCode.ERROR))
+    
+    with tracer.start_as_current_span("slow"):
+        time.sleep(0.06)
+    
+    exported = [span.name for span in exporter.get_finished_spans()]
+    assert sorted(exported) == ["db", "failing", "slow"]
+
+
+def test_batch_processor_counts_spans_dropped_from_a_full_queue():
+    """Test that spans discarded by the full export queue are counted as dropped."""
+    exporting, release = threading.Event(), threading.Event()
+    exported = []
+    
+    class BlockingExporter(InMemorySpanExporter):
+        def export(self, spans):
+            exporting.set()
+            release.wait(timeout=5)
+            exported.extend(span.name for span in spans)
+            return SpanExportResult.SUCCESS
+    
+    processor = CountingBatchSpanProcessor(
+        BlockingExporter(), max_queue_size=2, max_export_batch_size=2, schedule_delay_millis=60000
+    )
+    provider = TracerProvider()
+    provider.add_span_processor(processor)
+    tracer = provider.get_tracer(__name__)
+    dropped = trace_spans_dropped_total.labels(reason="queue_full")
+    dropped_before = dropped._value.get()
+    
+    for name in ("1", "2"):
+        tracer.start_span(name).end()
+    # the worker took both and is stuck exporting them
+    assert exporting.wait(timeout=5)
+    assert processor.queue_depth == 0
+    for name in ("3", "4", "5"):
+        tracer.start_span(name).end()
+    
+    assert processor.queue_depth == 2
+    assert dropped._value.get() == dropped_before + 1
+    release.set()
+    processor.shutdown()
+    # the oldest queued span was the one discarded
+    assert exported == ["1", "2", "4", "5"]
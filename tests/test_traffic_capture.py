@@ -0,0 +1,41 @@
+import json
+
+from app.api import traffic_capture
+from app.api.traffic_capture import (
+    INVALID_PASSWORD_PLACEHOLDER,
+    VALID_PASSWORD_PLACEHOLDER,
+    TrafficRecorder,
+    redact_body,
+)
+
+
+def test_redact_body_keeps_password_validity():
+    """Test that passwords are redacted without changing the validation outcome."""
+    valid = json.loads(redact_body(b'{"email": "a@example.com", "password": "S3cure!123"}', 1024))
+    invalid = json.loads(redact_body(b'{"password": "short"}', 1024))
+    
+    assert valid == {"email": "a@example.com", "password": VALID_PASSWORD_PLACEHOLDER}
+    assert invalid["password"] == INVALID_PASSWORD_PLACEHOLDER
+    assert redact_body(b"password=S3cure!123", 1024) is None
+    assert redact_body(b'{"password": "S3cure!123"}', 10) is None
+
+
+def test_sampled_requests_are_captured(client, tmp_path, monkeypatch):
+    """Test that the request context middleware appends sampled requests."""
+    path = tmp_path / "capture.jsonl"
+    monkeypatch.setattr(traffic_capture, "traffic_recorder", TrafficRecorder(str(path), sample_ratio=1.0))
+    payload = {
+        "name": "Ana",
+        "email": "captured@example.com",
+        "password": "S3cure!123",
+        "display_name": "Ana G",
+    }
+    
+    client.post("/signup", json=payload, headers={"Idempotency-Key": "capture-1", "Authorization": "Bearer x"})
+    
+    entry = json.loads(path.read_text().splitlines()[0])
+    assert (entry["m"], entry["p"], entry["r"], entry["s"]) == ("POST", "/signup", "/signup", 201)
+    assert entry["h"]["idempotency-key"] == "capture-1"
+    assert "authorization" not in entry["h"]
+    assert "S3cure!123" not in entry["b"]
+    assert entry["d"] > 0